@@ -1,16 +1,230 @@
-from .arguments import *  # noqa
-from .commands import *  # noqa
-from .completion import *  # noqa
-from .constants import *  # noqa
-from .context import *  # noqa
-from .core import *  # noqa
-from .errors import *  # noqa
-from .hooks import *  # noqa
-from .io import *  # noqa
-from .pages import * # noqa
-from .parsing import * # noqa
-from .shortcuts import * # noqa
-from .style import *  # noqa
-from .types import *  # noqa
-from .utils import *  # noqa
-from .version import *  # noqa
+"""A framework for building interactive, page-based applications.
+
+The public names of every subpackage are exported from this top-level package, but
+each subpackage is only imported when one of its names is first accessed (per PEP 562).
+This keeps ``import almanac`` cheap for uses that never touch the interactive prompt.
+
+"""
+
+from importlib import import_module
+from typing import Any, Dict, List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .arguments import *  # noqa
+    from .commands import *  # noqa
+    from .completion import *  # noqa
+    from .constants import *  # noqa
+    from .context import *  # noqa
+    from .core import *  # noqa
+    from .errors import *  # noqa
+    from .hooks import *  # noqa
+    from .io import *  # noqa
+    from .pages import *  # noqa
+    from .parsing import *  # noqa
+    from .shortcuts import *  # noqa
+    from .style import *  # noqa
+    from .types import *  # noqa
+    from .utils import *  # noqa
+
+# The names exported from each subpackage. Keep in sync with their __init__ modules.
+_SUBPACKAGE_EXPORTS: Dict[str, Tuple[str, ...]] = {
+    'arguments': (
+        'ArgumentBase',
+        'FrozenArgument',
+        'MutableArgument',
+    ),
+    'commands': (
+        'CachePolicy',
+        'CommandBase',
+        'CommandLimits',
+        'FrozenCommand',
+        'LimitPolicy',
+        'MutableCommand',
+        'RateLimit',
+    ),
+    'completion': (
+        'PagePathCompleter',
+        'rewrite_completion_stream',
+        'WordCompleter',
+    ),
+    'constants': (
+        'CommandLineDefaults',
+        'ExitCodes',
+    ),
+    'context': (
+        'current_app',
+        'set_current_app',
+    ),
+    'core': (
+        'Application',
+        'ArgumentDecoratorProxy',
+        'CachedResult',
+        'CommandCompleter',
+        'CommandDecoratorProxy',
+        'CommandEngine',
+        'CommandFreezingDecorator',
+        'CommandLimiter',
+        'CommandLimiterInfo',
+        'CommandMutatingDecorator',
+        'current_job',
+        'exit_code_for_exception',
+        'exit_code_for_return_value',
+        'Job',
+        'JobStatus',
+        'JobTable',
+        'result_cache_key',
+        'ResultCache',
+        'ResultCacheInfo',
+        'ScriptLineError',
+        'ScriptLineResult',
+        'ScriptResult',
+    ),
+    'errors': (
+        'AlmanacError',
+        'AlmanacKeyError',
+        'ArgumentNameCollisionError',
+        'BaseArgumentError',
+        'BaseCommandError',
+        'BaseConfigurationError',
+        'BaseJobError',
+        'BasePageError',
+        'BaseParseError',
+        'BlockedPageOverwriteError',
+        'CommandLimitError',
+        'CommandNameCollisionError',
+        'CommandRegistrationError',
+        'CommandTimeoutError',
+        'ConflictingExceptionCallbacksError',
+        'ConflictingPromoterTypesError',
+        'FrozenAccessError',
+        'InvalidArgumentNameError',
+        'InvalidCallbackTypeError',
+        'MissingArgumentsError',
+        'MissingRequiredParameterError',
+        'NoActiveApplicationError',
+        'NoSuchArgumentError',
+        'NoSuchCommandError',
+        'NoSuchJobError',
+        'NoSuchPageError',
+        'OutOfBoundsPageError',
+        'PartialParseError',
+        'PathSyntaxError',
+        'PositionalValueError',
+        'TooManyPositionalArgumentsError',
+        'TotalParseError',
+        'UnknownArgumentBindingError',
+    ),
+    'hooks': (
+        'assert_async_callback',
+        'assert_sync_callback',
+        'AsyncExceptionHookCallback',
+        'AsyncHookCallback',
+        'AsyncNoArgsCallback',
+        'CommandHook',
+        'compile_hook_chain',
+        'ExceptionHookDispatchTable',
+        'HookChain',
+        'HookMode',
+        'HookProxy',
+        'PromoterFunction',
+        'PromptCallback',
+        'SyncNoArgsCallback',
+    ),
+    'io': (
+        'AbstractIoContext',
+        'BufferedIoContext',
+        'BufferedMessage',
+        'is_interactive_stream',
+        'NullIoContext',
+        'StandardConsoleIoContext',
+    ),
+    'pages': (
+        'AbstractPage',
+        'DirectoryPage',
+        'PageNavigator',
+        'PagePath',
+        'PagePathLike',
+    ),
+    'parsing': (
+        'CommandLineLexer',
+        'fast_parse_cmd_line',
+        'get_lexer_cls_for_app',
+        'get_parse_func_for_engine',
+        'get_session_parse_func_for_engine',
+        'incomplete_token_at_cursor',
+        'IncompleteToken',
+        'IncrementalParser',
+        'is_ignored_script_line',
+        'KwargSpans',
+        'last_incomplete_token',
+        'last_incomplete_token_from_document',
+        'make_parsed_command_line',
+        'parse_argv',
+        'parse_cmd_line',
+        'parse_lines',
+        'ParseCache',
+        'ParseCacheInfo',
+        'ParsedCommandLine',
+        'ParsedLine',
+        'ParseFunction',
+        'ParserEngine',
+        'ParseState',
+        'ParseStatus',
+        'Patterns',
+        'results_or_raise',
+        'Span',
+        'split_background_marker',
+        'tab_expansion_offsets',
+        'Token',
+        'TokenKind',
+    ),
+    'shortcuts': (
+        'make_standard_app',
+    ),
+    'style': (
+        'DARK_MODE_STYLE',
+        'highlight_for_mimetype',
+        'LIGHT_MODE_STYLE',
+    ),
+    'types': (
+        'CommandCoroutine',
+        'is_matching_type',
+    ),
+    'utils': (
+        'abbreviated',
+        'capitalized',
+        'FuzzyMatcher',
+        'pairwise',
+        'PrefixIndex',
+        'SuggestionIndex',
+    ),
+}
+
+_EXPORTED_SUBPACKAGES: Dict[str, str] = {
+    name: subpackage
+    for subpackage, names in _SUBPACKAGE_EXPORTS.items()
+    for name in names
+}
+
+__all__ = sorted(_EXPORTED_SUBPACKAGES, key=str.lower)
+
+
+def __getattr__(
+    name: str
+) -> Any:
+    subpackage = _EXPORTED_SUBPACKAGES.get(name)
+    if subpackage is None:
+        if name in _SUBPACKAGE_EXPORTS or name == 'version':
+            return import_module(f'.{name}', __name__)
+
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value = getattr(import_module(f'.{subpackage}', __name__), name)
+
+    # Cache the value, so that later accesses do not go through this function.
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__) | set(_SUBPACKAGE_EXPORTS))
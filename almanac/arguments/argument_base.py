@@ -1,11 +1,14 @@
+from __future__ import annotations
+
 from abc import ABC, abstractmethod, abstractproperty
 from inspect import Parameter
-from typing import Any, Iterable, Optional, Union
-
-from prompt_toolkit.completion import Completer
+from typing import Any, Iterable, Optional, TYPE_CHECKING, Union
 
 from ..constants import CommandLineDefaults
 
+if TYPE_CHECKING:
+    from prompt_toolkit.completion import Completer
+
 
 class ArgumentBase(ABC):
     """An abstract class for encapsulating a command argument.
@@ -41,11 +44,15 @@ class ArgumentBase(ABC):
 
         if completers is None:
             self._completers = []
-        elif isinstance(completers, Completer):
-            self._completers = [completers]
         else:
-            # Assume we have iterable of completers.
-            self._completers = [x for x in completers]
+            # Imported here, so that importing almanac does not load prompt_toolkit.
+            from prompt_toolkit.completion import Completer
+
+            if isinstance(completers, Completer):
+                self._completers = [completers]
+            else:
+                # Assume we have iterable of completers.
+                self._completers = [x for x in completers]
 
         self._hidden = hidden
 
@@ -1,12 +1,15 @@
-from functools import cached_property
-from typing import Tuple
+from __future__ import annotations
 
-from prompt_toolkit.completion import Completer
+from functools import cached_property
+from typing import Tuple, TYPE_CHECKING
 
 from .argument_base import ArgumentBase
 from ..errors import FrozenAccessError
 from ..utils import abbreviated
 
+if TYPE_CHECKING:
+    from prompt_toolkit.completion import Completer
+
 
 class FrozenArgument(ArgumentBase):
     """An encapsulation of an argument which can no longer be mutated.
@@ -1,10 +1,13 @@
-from typing import List
+from __future__ import annotations
 
-from prompt_toolkit.completion import Completer
+from typing import List, TYPE_CHECKING
 
 from .argument_base import ArgumentBase
 from .frozen_argument import FrozenArgument
 
+if TYPE_CHECKING:
+    from prompt_toolkit.completion import Completer
+
 
 class MutableArgument(ArgumentBase):
     """An encapsulation of an argument which can be mutated."""
@@ -1,3 +1,5 @@
+from .cache_policy import CachePolicy  # noqa
 from .command_base import CommandBase  # noqa
 from .frozen_command import FrozenCommand  # noqa
+from .limits import CommandLimits, LimitPolicy, RateLimit  # noqa
 from .mutable_command import MutableCommand  # noqa
@@ -0,0 +1,14 @@
+from typing import NamedTuple, Optional
+
+
+class CachePolicy(NamedTuple):
+    """How the results of a command are memoized.
+
+    Results are kept for at most ``ttl`` seconds (or indefinitely, if it is ``None``),
+    and at most ``max_entries`` of them are kept per command, with the least recently
+    used result evicted first.
+
+    """
+
+    ttl: Optional[float] = None
+    max_entries: int = 128
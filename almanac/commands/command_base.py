@@ -6,6 +6,8 @@ import itertools
 from abc import ABC, abstractmethod
 from typing import Iterable, List, Optional, Tuple, Union
 
+from .cache_policy import CachePolicy
+from .limits import CommandLimits
 from ..constants import CommandLineDefaults
 from ..types import CommandCoroutine
 
@@ -30,7 +32,11 @@ class CommandBase(ABC):
         *,
         name: Optional[str] = None,
         description: Optional[str] = None,
-        aliases: Optional[Union[str, Iterable[str]]] = None
+        aliases: Optional[Union[str, Iterable[str]]] = None,
+        requires: Optional[Union[str, Iterable[str]]] = None,
+        timeout: Optional[float] = None,
+        cache: Optional[CachePolicy] = None,
+        limits: Optional[CommandLimits] = None
     ) -> None:
         self._name = name if name is not None else coroutine.__name__
 
@@ -47,6 +53,16 @@ class CommandBase(ABC):
         elif aliases is not None:
             self._aliases.extend(aliases)
 
+        self._requires: List[str] = []
+        if isinstance(requires, str):
+            self._requires.append(requires)
+        elif requires is not None:
+            self._requires.extend(requires)
+
+        self._timeout = timeout
+        self._cache = cache
+        self._limits = limits
+
         self._impl_signature = inspect.signature(coroutine)
         self._impl_coroutine = coroutine
 
@@ -129,6 +145,87 @@ class CommandBase(ABC):
     ) -> None:
         """Abstract alias appender to allow for access control."""
 
+    @property
+    def requires(
+        self
+    ) -> Tuple[str, ...]:
+        """The names of the resources that this command needs to be initialized."""
+        return tuple(self._requires)
+
+    @abstractmethod
+    def add_requirement(
+        self,
+        *resources: str
+    ) -> None:
+        """Abstract requirement appender to allow for access control."""
+
+    @property
+    def timeout(
+        self
+    ) -> Optional[float]:
+        """The number of seconds after which this command is cancelled, if any.
+
+        When this is ``None``, the application's default command timeout applies.
+
+        """
+        return self._timeout
+
+    @timeout.setter
+    def timeout(
+        self,
+        new_timeout: Optional[float]
+    ) -> None:
+        self._abstract_timeout_setter(new_timeout)
+
+    @abstractmethod
+    def _abstract_timeout_setter(
+        self,
+        new_timeout: Optional[float]
+    ) -> None:
+        """Abstract timeout setter to allow for access control."""
+
+    @property
+    def cache(
+        self
+    ) -> Optional[CachePolicy]:
+        """How the results of this command are memoized, if they are at all."""
+        return self._cache
+
+    @cache.setter
+    def cache(
+        self,
+        new_cache: Optional[CachePolicy]
+    ) -> None:
+        self._abstract_cache_setter(new_cache)
+
+    @abstractmethod
+    def _abstract_cache_setter(
+        self,
+        new_cache: Optional[CachePolicy]
+    ) -> None:
+        """Abstract cache policy setter to allow for access control."""
+
+    @property
+    def limits(
+        self
+    ) -> Optional[CommandLimits]:
+        """The concurrency and rate limits on calls of this command, if any."""
+        return self._limits
+
+    @limits.setter
+    def limits(
+        self,
+        new_limits: Optional[CommandLimits]
+    ) -> None:
+        self._abstract_limits_setter(new_limits)
+
+    @abstractmethod
+    def _abstract_limits_setter(
+        self,
+        new_limits: Optional[CommandLimits]
+    ) -> None:
+        """Abstract limits setter to allow for access control."""
+
     @property
     def identifiers(
         self
@@ -1,13 +1,25 @@
 from __future__ import annotations
 
 from functools import cached_property
-from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Tuple, Union
+from typing import (
+    AbstractSet,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Tuple,
+    Union
+)
 
+from .cache_policy import CachePolicy
 from .command_base import CommandBase
+from .limits import CommandLimits
 from ..arguments import FrozenArgument
 from ..errors import FrozenAccessError, NoSuchArgumentError
 from ..types import CommandCoroutine
-from ..utils import abbreviated
+from ..utils import abbreviated, SuggestionIndex
 
 
 class FrozenCommand(CommandBase, Mapping[str, FrozenArgument]):
@@ -20,13 +32,21 @@ class FrozenCommand(CommandBase, Mapping[str, FrozenArgument]):
         name: Optional[str] = None,
         description: Optional[str] = None,
         aliases: Optional[Union[str, Iterable[str]]] = None,
+        requires: Optional[Union[str, Iterable[str]]] = None,
+        timeout: Optional[float] = None,
+        cache: Optional[CachePolicy] = None,
+        limits: Optional[CommandLimits] = None,
         argument_map: Optional[Mapping[str, FrozenArgument]] = None
     ) -> None:
         super().__init__(
             coroutine,
             name=name,
             description=description,
-            aliases=aliases
+            aliases=aliases,
+            requires=requires,
+            timeout=timeout,
+            cache=cache,
+            limits=limits
         )
 
         self._argument_map: Mapping[str, FrozenArgument]
@@ -35,6 +55,16 @@ class FrozenCommand(CommandBase, Mapping[str, FrozenArgument]):
         else:
             self._argument_map = {k: v for k, v in argument_map.items()}
 
+        self._arguments_by_real_name = {
+            arg.real_name: arg for arg in self._argument_map.values()
+        }
+
+        # Unbound arguments, keyed on the number of positional values and the names of
+        # the keyword values that were bound.
+        self._unbound_arguments_cache: Dict[
+            Tuple[int, AbstractSet[str]], Tuple[FrozenArgument, ...]
+        ] = {}
+
     @cached_property
     def abbreviated_description(
         self
@@ -42,9 +72,39 @@ class FrozenCommand(CommandBase, Mapping[str, FrozenArgument]):
         """A shortened version of this command's description."""
         return abbreviated(self._description)
 
+    @cached_property
+    def argument_suggestion_index(
+        self
+    ) -> SuggestionIndex:
+        """A fuzzy suggestion index of this command's argument display names.
+
+        Like completion, suggestions are limited to :attr:`completable_kw_args`, so
+        that hidden arguments are never revealed.
+
+        """
+        return SuggestionIndex(arg.display_name for arg in self.completable_kw_args)
+
+    @cached_property
+    def completable_kw_args(
+        self
+    ) -> Tuple[FrozenArgument, ...]:
+        """The arguments whose names may be completed, sorted by display name.
+
+        These are the visible arguments that can be specified by keyword, excluding any
+        ``*args`` or ``**kwargs`` parameters.
+
+        """
+        return tuple(sorted(
+            (
+                arg for arg in self._argument_map.values()
+                if not (arg.hidden or arg.is_pos_only or arg.is_var_pos or arg.is_var_kw)
+            ),
+            key=lambda arg: arg.display_name
+        ))
+
     def resolved_kwarg_names(
         self,
-        kwarg_dict: Dict[str, Any]
+        kwarg_dict: Mapping[str, Any]
     ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """Transform keyword argument names from their display to real values.
 
@@ -81,12 +141,36 @@ class FrozenCommand(CommandBase, Mapping[str, FrozenArgument]):
     ) -> None:
         raise FrozenAccessError('Cannot change the name of a FrozenCommand')
 
+    def _abstract_cache_setter(
+        self,
+        new_cache: Optional[CachePolicy]
+    ) -> None:
+        raise FrozenAccessError('Cannot change the cache policy of a FrozenCommand')
+
+    def _abstract_limits_setter(
+        self,
+        new_limits: Optional[CommandLimits]
+    ) -> None:
+        raise FrozenAccessError('Cannot change the limits of a FrozenCommand')
+
+    def _abstract_timeout_setter(
+        self,
+        new_timeout: Optional[float]
+    ) -> None:
+        raise FrozenAccessError('Cannot change the timeout of a FrozenCommand')
+
     def add_alias(
         self,
         *aliases: str
     ) -> None:
         raise FrozenAccessError('Cannot add an alias to a FrozenCommand')
 
+    def add_requirement(
+        self,
+        *resources: str
+    ) -> None:
+        raise FrozenAccessError('Cannot add a requirement to a FrozenCommand')
+
     def get_unbound_arguments(
         self,
         *args,
@@ -97,19 +181,29 @@ class FrozenCommand(CommandBase, Mapping[str, FrozenArgument]):
         In the event of an error where the set of provided arguments cannot even be
         partially applied to the function signature, an empty tuple is returned.
 
+        Only the number of positional values and the names of the keyword values
+        determine the result, so it is computed once for each such combination.
+
         """
+        key = (len(args), frozenset(kwargs))
+        try:
+            return self._unbound_arguments_cache[key]
+        except KeyError:
+            pass
+
         try:
             bound_arguments = self._impl_signature.bind_partial(*args, **kwargs)
         except TypeError:
-            return tuple()
-
-        bound_param_names = set(bound_arguments.arguments.keys())
-        unbound_arguments = tuple(
-            self._argument_map[param_name]
-            for param_name in self._impl_signature.parameters.keys()
-            if param_name not in bound_param_names
-        )
+            unbound_arguments: Tuple[FrozenArgument, ...] = tuple()
+        else:
+            bound_param_names = set(bound_arguments.arguments.keys())
+            unbound_arguments = tuple(
+                self._arguments_by_real_name[param_name]
+                for param_name in self._impl_signature.parameters.keys()
+                if param_name not in bound_param_names
+            )
 
+        self._unbound_arguments_cache[key] = unbound_arguments
         return unbound_arguments
 
     async def run(
@@ -157,7 +251,7 @@ class FrozenCommand(CommandBase, Mapping[str, FrozenArgument]):
         try:
             return self._argument_map[argument_display_name]
         except KeyError:
-            raise NoSuchArgumentError(argument_display_name)
+            raise NoSuchArgumentError(argument_display_name, command_name=self.name)
 
     def __len__(
         self
@@ -0,0 +1,38 @@
+from enum import auto, Enum
+from typing import NamedTuple, Optional
+
+
+class LimitPolicy(Enum):
+    """What happens to a call of a command that is over one of its limits."""
+
+    QUEUE = auto()
+    """The call waits until it is within the command's limits."""
+
+    REJECT = auto()
+    """The call fails immediately, with a :class:`CommandLimitError`."""
+
+
+class RateLimit(NamedTuple):
+    """A token bucket rate limit on the calls of a command.
+
+    Calls are admitted at ``per_second`` calls per second on average, with bursts of up
+    to ``burst`` calls admitted at once.
+
+    """
+
+    per_second: float
+    burst: int = 1
+
+
+class CommandLimits(NamedTuple):
+    """The limits on how a command may be called.
+
+    At most ``max_concurrency`` calls of the command run at once, and calls are
+    admitted no faster than the ``rate`` limit. Calls over a limit are handled per the
+    ``policy``.
+
+    """
+
+    max_concurrency: Optional[int] = None
+    rate: Optional[RateLimit] = None
+    policy: LimitPolicy = LimitPolicy.QUEUE
@@ -5,8 +5,10 @@ import asyncio
 from collections import Counter
 from typing import Iterable, Iterator, Mapping, MutableMapping, Optional, Union
 
+from .cache_policy import CachePolicy
 from .command_base import CommandBase
 from .frozen_command import FrozenCommand
+from .limits import CommandLimits
 from ..arguments import MutableArgument
 from ..errors import (
     ArgumentNameCollisionError,
@@ -34,13 +36,21 @@ class MutableCommand(CommandBase, MutableMapping[str, MutableArgument]):
         name: Optional[str] = None,
         description: Optional[str] = None,
         aliases: Optional[Union[str, Iterable[str]]] = None,
+        requires: Optional[Union[str, Iterable[str]]] = None,
+        timeout: Optional[float] = None,
+        cache: Optional[CachePolicy] = None,
+        limits: Optional[CommandLimits] = None,
         argument_map: Optional[Mapping[str, MutableArgument]] = None
     ) -> None:
         super().__init__(
             coroutine,
             name=name,
             description=description,
-            aliases=aliases
+            aliases=aliases,
+            requires=requires,
+            timeout=timeout,
+            cache=cache,
+            limits=limits
         )
 
         self._argument_map: MutableMapping[str, MutableArgument] = {}
@@ -79,6 +89,24 @@ class MutableCommand(CommandBase, MutableMapping[str, MutableArgument]):
     ) -> None:
         self._name = new_name
 
+    def _abstract_cache_setter(
+        self,
+        new_cache: Optional[CachePolicy]
+    ) -> None:
+        self._cache = new_cache
+
+    def _abstract_limits_setter(
+        self,
+        new_limits: Optional[CommandLimits]
+    ) -> None:
+        self._limits = new_limits
+
+    def _abstract_timeout_setter(
+        self,
+        new_timeout: Optional[float]
+    ) -> None:
+        self._timeout = new_timeout
+
     def add_alias(
         self,
         *aliases: str
@@ -86,6 +114,14 @@ class MutableCommand(CommandBase, MutableMapping[str, MutableArgument]):
         for alias in aliases:
             self._aliases.append(alias)
 
+    def add_requirement(
+        self,
+        *resources: str
+    ) -> None:
+        for resource in resources:
+            if resource not in self._requires:
+                self._requires.append(resource)
+
     def freeze(
         self
     ) -> FrozenCommand:
@@ -108,6 +144,10 @@ class MutableCommand(CommandBase, MutableMapping[str, MutableArgument]):
             name=self.name,
             description=self.description,
             aliases=self.aliases,
+            requires=self.requires,
+            timeout=self.timeout,
+            cache=self.cache,
+            limits=self.limits,
             argument_map=frozen_argument_map
         )
 
@@ -1,9 +1,14 @@
-from typing import Callable, Iterable, List, Union
+import threading
+import time
+
+from itertools import islice
+from typing import Callable, Iterable, List, Optional, Union
 
 from prompt_toolkit.completion import CompleteEvent, Completion, Completer
 from prompt_toolkit.document import Document
 
 from ..parsing import last_incomplete_token_from_document
+from ..utils import PrefixIndex
 
 
 class WordCompleter(Completer):
@@ -14,26 +19,150 @@ class WordCompleter(Completer):
     scenarios in the almanac grammar when trying to yield completion values for
     a key=val input (since the word under the cursor is "key=val").
 
+    Words are indexed in a sorted :class:`~almanac.utils.PrefixIndex` once, so that
+    completing a prefix takes time proportional to the number of matches rather than
+    the number of words. Matching words are completed in sorted order, without
+    duplicates, and at most ``max_completions`` of them are yielded.
+
+    When ``words`` is a callable, it is called for each completion by default. With a
+    ``ttl``, the words it returns are instead reused for up to ``ttl`` seconds. Once
+    they have expired, the stale words keep being used while they are fetched again in
+    a background thread (unless ``refresh_in_background`` is disabled, in which case
+    they are fetched again before completing). :meth:`invalidate` discards the cached
+    words early, such as when the source of the words is known to have changed.
+
     """
 
     def __init__(
         self,
-        words: Union[List[str], Callable[[], List[str]]]
+        words: Union[List[str], Callable[[], List[str]]],
+        *,
+        ttl: Optional[float] = None,
+        refresh_in_background: bool = True,
+        max_completions: Optional[int] = None
     ) -> None:
+        if ttl is not None:
+            if not callable(words):
+                raise ValueError('A ttl only applies to a callable source of words')
+            elif ttl <= 0:
+                raise ValueError('ttl must be positive')
+        if max_completions is not None and max_completions < 0:
+            raise ValueError('max_completions must not be negative')
+
         self._words = words
+        self._ttl = ttl
+        self._refresh_in_background = refresh_in_background
+        self._max_completions = max_completions
+
+        self._index: Optional[PrefixIndex] = None
+        if not callable(words):
+            self._index = PrefixIndex(words)
+
+        self._lock = threading.Lock()
+        self._cached_index: Optional[PrefixIndex] = None
+        self._expires_at = 0.0
+        self._refreshing = False
+        # Incremented by each invalidation, so that fetches started before it are not
+        # cached.
+        self._generation = 0
+
+    @property
+    def max_completions(
+        self
+    ) -> Optional[int]:
+        """The maximum number of completions yielded at once, if bounded."""
+        return self._max_completions
+
+    @property
+    def ttl(
+        self
+    ) -> Optional[float]:
+        """The number of seconds for which fetched words are reused, if cached."""
+        return self._ttl
+
+    def invalidate(
+        self
+    ) -> None:
+        """Discard any cached words, so that the next completion fetches them again."""
+        with self._lock:
+            self._cached_index = None
+            self._generation += 1
+
+    def _fetch(
+        self,
+        generation: int
+    ) -> PrefixIndex:
+        assert callable(self._words)
+        index = PrefixIndex(self._words())
+
+        with self._lock:
+            if generation == self._generation:
+                assert self._ttl is not None
+                self._cached_index = index
+                self._expires_at = time.monotonic() + self._ttl
+
+        return index
+
+    def _refresh(
+        self,
+        generation: int
+    ) -> None:
+        try:
+            self._fetch(generation)
+        except Exception:
+            # Keep serving the stale words, and wait another ttl before trying again, so
+            # that a failing source is not retried on every keystroke.
+            with self._lock:
+                if generation == self._generation:
+                    assert self._ttl is not None
+                    self._expires_at = time.monotonic() + self._ttl
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _get_index(
+        self
+    ) -> Optional[PrefixIndex]:
+        # Uncached dynamic words are not worth indexing, since they are only searched
+        # once.
+        if self._index is not None or self._ttl is None:
+            return self._index
+
+        with self._lock:
+            cached_index = self._cached_index
+            generation = self._generation
+            if cached_index is not None and time.monotonic() < self._expires_at:
+                return cached_index
+
+            serve_stale = cached_index is not None and self._refresh_in_background
+            start_refresh = serve_stale and not self._refreshing
+            if start_refresh:
+                self._refreshing = True
+
+        if not serve_stale:
+            return self._fetch(generation)
+
+        if start_refresh:
+            threading.Thread(target=self._refresh, args=(generation,), daemon=True).start()
+
+        return cached_index
 
     def get_completions(
         self,
         document: Document,
         complete_event: CompleteEvent
     ) -> Iterable[Completion]:
-        words = self._words
-        if callable(words):
-            words = words()
+        index = self._get_index()
 
         last_token = last_incomplete_token_from_document(document)
         needle = last_token.value
 
-        for word in words:
-            if word.startswith(needle):
-                yield Completion(word, start_position=-len(needle))
+        matches: Iterable[str]
+        if index is not None:
+            matches = index.iter_prefix(needle)
+        else:
+            assert callable(self._words)
+            matches = sorted({word for word in self._words() if word.startswith(needle)})
+
+        for word in islice(matches, self._max_completions):
+            yield Completion(word, start_position=-len(needle))
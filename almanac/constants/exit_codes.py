@@ -13,3 +13,6 @@ class ExitCodes(IntEnum):
     ERR_COMMAND_NONEXISTENT = auto()
 
     ERR_RUNTIME_EXC = auto()
+    ERR_COMMAND_CANCELLED = auto()
+    ERR_COMMAND_TIMEOUT = auto()
+    ERR_COMMAND_REJECTED = auto()
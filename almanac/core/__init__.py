@@ -1,5 +1,7 @@
+from importlib import import_module
+from typing import Any, Dict, TYPE_CHECKING
+
 from .application import Application  # noqa
-from .command_completer import CommandCompleter  # noqa
 from .command_engine import CommandEngine  # noqa
 from .decorators import (  # noqa
     ArgumentDecoratorProxy,
@@ -7,3 +9,39 @@ from .decorators import (  # noqa
     CommandFreezingDecorator,
     CommandMutatingDecorator
 )
+from .jobs import current_job, Job, JobStatus, JobTable  # noqa
+from .limiter import CommandLimiter, CommandLimiterInfo  # noqa
+from .result_cache import (  # noqa
+    CachedResult,
+    result_cache_key,
+    ResultCache,
+    ResultCacheInfo
+)
+from .scripts import (  # noqa
+    exit_code_for_exception,
+    exit_code_for_return_value,
+    ScriptLineError,
+    ScriptLineResult,
+    ScriptResult
+)
+
+if TYPE_CHECKING:
+    from .command_completer import CommandCompleter  # noqa
+
+# The completer is built on prompt_toolkit, so it is only imported when it is first
+# accessed (per PEP 562).
+_LAZY_EXPORTS: Dict[str, str] = {
+    'CommandCompleter': '.command_completer',
+}
+
+
+def __getattr__(
+    name: str
+) -> Any:
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
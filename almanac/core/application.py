@@ -1,7 +1,15 @@
+from __future__ import annotations
+
 import asyncio
+import os
+import signal
+import sys
+import threading
 import traceback
 
-from contextlib import asynccontextmanager, contextmanager
+from contextlib import asynccontextmanager, contextmanager, ExitStack
+from contextvars import ContextVar
+from functools import cached_property
 from typing import (
     Any,
     AsyncIterator,
@@ -11,26 +19,36 @@ from typing import (
     Iterable,
     Iterator,
     List,
+    Optional,
+    Sequence,
+    Tuple,
     Type,
-    TypeVar
+    TYPE_CHECKING,
+    TypeVar,
+    Union
 )
 
-from munch import Munch
-from prompt_toolkit import PromptSession
-from prompt_toolkit.completion import Completer
-from prompt_toolkit.lexers import PygmentsLexer
-from prompt_toolkit.patch_stdout import patch_stdout
-from prompt_toolkit.styles import Style
-from pygments import highlight
-from pygments.formatters import TerminalFormatter
-from pygments.lexers.python import Python3TracebackLexer
-
-from .command_completer import CommandCompleter
 from .command_engine import CommandEngine
 from .decorators import ArgumentDecoratorProxy, CommandDecoratorProxy
+from .jobs import current_job, Job, JobTable
+from .scripts import (
+    exit_code_for_exception,
+    exit_code_for_return_value,
+    ParseAheadReader,
+    ScriptLineError,
+    ScriptLineResult,
+    ScriptResult
+)
 from ..constants import ExitCodes
 from ..context import set_current_app
-from ..errors import ConflictingPromoterTypesError, InvalidCallbackTypeError
+from ..errors import (
+    BaseArgumentError,
+    BaseCommandError,
+    BaseParseError,
+    ConflictingPromoterTypesError,
+    InvalidCallbackTypeError,
+    NoSuchCommandError
+)
 from ..hooks import (
     AsyncNoArgsCallback,
     assert_async_callback,
@@ -39,14 +57,34 @@ from ..hooks import (
     PromoterFunction,
     PromptCallback
 )
-from ..io import AbstractIoContext, StandardConsoleIoContext
+from ..io import AbstractIoContext, is_interactive_stream, StandardConsoleIoContext
 from ..pages import PageNavigator, PagePath
-from ..parsing import get_lexer_cls_for_app, parse_cmd_line, ParseState
-from ..style import DARK_MODE_STYLE
+from ..parsing import (
+    get_session_parse_func_for_engine,
+    parse_argv,
+    parse_lines,
+    ParseCache,
+    ParsedCommandLine,
+    ParserEngine,
+    ParseState,
+    ParseStatus,
+    results_or_raise,
+    split_background_marker
+)
+
+if TYPE_CHECKING:
+    from munch import Munch
+    from prompt_toolkit.completion import Completer
+    from prompt_toolkit.styles import Style
 
 
 _T = TypeVar('_T')
 
+# An input/output context that overrides the app's, within the current task only.
+_redirected_io: ContextVar[Optional[AbstractIoContext]] = ContextVar(
+    '_redirected_io', default=None
+)
+
 
 class Application:
     """The core class of ``almanac``, wrapping everything together.
@@ -62,24 +100,53 @@ class Application:
         *,
         with_completion: bool = True,
         with_style: bool = True,
-        style: Style = DARK_MODE_STYLE,
+        style: Optional[Style] = None,
         io_context_cls: Type[AbstractIoContext] = StandardConsoleIoContext,
+        parser_engine: ParserEngine = ParserEngine.FAST,
+        parse_cache_max_entries: int = 128,
+        parse_cache_max_input_bytes: int = 1 << 20,
         propagate_runtime_exceptions: bool = False,
         print_all_exception_tracebacks: bool = False,
-        print_unknown_exception_tracebacks: bool = True
+        print_unknown_exception_tracebacks: bool = True,
+        max_job_output_messages: Optional[int] = 1000,
+        command_timeout: Optional[float] = None,
+        completion_debounce: float = 0.05,
+        max_completions: Optional[int] = 1000
     ) -> None:
+        if command_timeout is not None and command_timeout <= 0:
+            raise ValueError('command_timeout must be positive')
+        if completion_debounce < 0:
+            raise ValueError('completion_debounce must not be negative')
+        if max_completions is not None and max_completions <= 0:
+            raise ValueError('max_completions must be positive')
+
         self._io_stack: List[AbstractIoContext] = [io_context_cls()]
 
+        self._parser_engine = parser_engine
+        self._parse_cache = ParseCache(
+            get_session_parse_func_for_engine(parser_engine),
+            max_entries=parse_cache_max_entries,
+            max_input_bytes=parse_cache_max_input_bytes
+        )
+
         self._do_quit = False
 
+        self._jobs = JobTable()
+        self._max_job_output_messages = max_job_output_messages
+
+        self._command_timeout = command_timeout
+        self._completion_debounce = completion_debounce
+        self._max_completions = max_completions
+
         self._propagate_runtime_exceptions = propagate_runtime_exceptions
         self._print_all_exception_tracebacks = print_all_exception_tracebacks
         self._print_unknown_exception_tracebacks = print_unknown_exception_tracebacks
 
         self._on_exit_callbacks: List[AsyncNoArgsCallback[Any]] = []
         self._on_init_callbacks: List[AsyncNoArgsCallback[Any]] = []
+        # Maps on-init and on-exit callbacks to the resource that they manage, if any.
+        self._callback_resources: Dict[AsyncNoArgsCallback[Any], str] = {}
 
-        self._bag = Munch()
         self._command_engine = CommandEngine(self)
         self._page_navigator = PageNavigator()
 
@@ -91,18 +158,36 @@ class Application:
 
         self._prompt_callback: PromptCallback = self._default_prompt_callback
 
-        self._session_opts: Dict[str, Any] = {}
-        self._session_opts['message'] = self._prompt_callback_wrapper
+        self._with_completion = with_completion
+        self._with_style = with_style
+        # When None, DARK_MODE_STYLE is used (and only imported with the prompt session).
+        self._style = style
 
-        if with_completion:
-            self._session_opts['completer'] = CommandCompleter(self)
-            self._session_opts['complete_while_typing'] = True
-            self._session_opts['complete_in_thread'] = True
+    @cached_property
+    def _session_opts(
+        self
+    ) -> Dict[str, Any]:
+        # Only built when a prompt session is, so that non-interactive use of the
+        # application never sets up completion or highlighting (nor imports
+        # prompt_toolkit and pygments for them).
+        from .command_completer import CommandCompleter
+        from ..parsing.lexer import CommandLineLexer
+        from ..style import DARK_MODE_STYLE
+
+        session_opts: Dict[str, Any] = {}
+        session_opts['message'] = self._prompt_callback_wrapper
+
+        if self._with_completion:
+            session_opts['completer'] = CommandCompleter(self)
+            session_opts['complete_while_typing'] = True
+
+        if self._with_style:
+            session_opts['lexer'] = CommandLineLexer(self)
+            session_opts['style'] = (
+                self._style if self._style is not None else DARK_MODE_STYLE
+            )
 
-        if with_style:
-            lexer_cls = get_lexer_cls_for_app(self)
-            self._session_opts['lexer'] = PygmentsLexer(lexer_cls)
-            self._session_opts['style'] = style
+        return session_opts
 
     @property
     def cmd(
@@ -125,12 +210,14 @@ class Application:
         """The top-level interface for registering hooks on different events."""
         return self._hook_proxy
 
-    @property
+    @cached_property
     def bag(
         self
-    ) -> Munch:
+    ) -> 'Munch':
         """A mutable container for storing data for global access."""
-        return self._bag
+        # Only imported when the bag is first used, as munch is slow to import.
+        from munch import Munch
+        return Munch()
 
     @property
     def current_prompt_str(
@@ -164,7 +251,12 @@ class Application:
     def type_completer_mapping(
         self
     ) -> Dict[Type, List[Completer]]:
-        """A mapping of types to registered global completers."""
+        """A mapping of types to registered global completers.
+
+        Register completers with :meth:`add_completers_for_type`, rather than by
+        modifying this mapping, so that the completion plans of commands are updated.
+
+        """
         return self._type_completer_mapping
 
     @property
@@ -174,6 +266,58 @@ class Application:
         """A mapping of types to callables that convert raw arguments to those types."""
         return self._command_engine.type_promoter_mapping
 
+    @property
+    def parser_engine(
+        self
+    ) -> ParserEngine:
+        """The :class:`ParserEngine` used to parse this app's command lines."""
+        return self._parser_engine
+
+    @property
+    def command_timeout(
+        self
+    ) -> Optional[float]:
+        """The default number of seconds after which a running command is cancelled.
+
+        Commands registered with their own ``timeout`` override this. When it is
+        ``None``, commands without a timeout of their own may run indefinitely.
+
+        """
+        return self._command_timeout
+
+    @property
+    def completion_debounce(
+        self
+    ) -> float:
+        """The number of seconds that prompt completion waits for typing to pause.
+
+        Completion of the prompt's text starts only after this delay, and is abandoned
+        if the text changes in the meantime, so that a burst of keystrokes is
+        completed once.
+
+        """
+        return self._completion_debounce
+
+    @property
+    def max_completions(
+        self
+    ) -> Optional[int]:
+        """The maximum number of completions offered for the prompt's text at once.
+
+        Beyond it, completers are not consulted further, and a marker completion
+        indicates that some completions were left out. When it is ``None``, every
+        completion is offered.
+
+        """
+        return self._max_completions
+
+    @property
+    def parse_cache(
+        self
+    ) -> ParseCache:
+        """The cache of this app's recently parsed command lines."""
+        return self._parse_cache
+
     @property
     def page_navigator(
         self
@@ -188,11 +332,31 @@ class Application:
         """The :class:`CommandEngine` powering this app's command lookup."""
         return self._command_engine
 
+    @property
+    def jobs(
+        self
+    ) -> JobTable:
+        """The table of this app's background jobs."""
+        return self._jobs
+
     @property
     def io(
         self
     ) -> AbstractIoContext:
-        """The application's top-level input/output context."""
+        """The application's top-level input/output context.
+
+        Within a background job, this is the job's output buffer instead, and within
+        :meth:`redirected_io`, the context that it was given.
+
+        """
+        redirected_io = _redirected_io.get()
+        if redirected_io is not None:
+            return redirected_io
+
+        job = current_job()
+        if job is not None:
+            return job.output
+
         return self._io_stack[-1]
 
     @contextmanager
@@ -205,12 +369,141 @@ class Application:
         yield new_io_context
         self._io_stack.pop()
 
+    @contextmanager
+    def redirected_io(
+        self,
+        new_io_context: AbstractIoContext
+    ) -> Iterator[AbstractIoContext]:
+        """Change the app's input/output context, for the current task only.
+
+        Unlike :meth:`io_context`, this does not affect concurrently running commands,
+        such as background jobs.
+
+        """
+        token = _redirected_io.set(new_io_context)
+        try:
+            yield new_io_context
+        finally:
+            _redirected_io.reset(token)
+
+    def parse_cmd_line(
+        self,
+        text: str
+    ) -> ParseStatus:
+        """Parse a command line with this app's configured :class:`ParserEngine`.
+
+        Results are memoized in this app's :attr:`parse_cache`.
+
+        """
+        return self._parse_cache.parse(text)
+
     async def eval_line(
+        self,
+        line: str,
+        *,
+        cancel_on_interrupt: bool = False
+    ) -> int:
+        """Evaluate a line passed to the application by the user.
+
+        A line ending with ``&`` is started as a background job (see :meth:`start_job`)
+        rather than awaited, unless it cannot be parsed.
+
+        Args:
+            line: The command line to evaluate.
+            cancel_on_interrupt: Whether an interrupt (``^C``, or ``SIGINT``) received
+                while the line is evaluated cancels only its command, rather than
+                raising :class:`KeyboardInterrupt`. This is what the interactive prompt
+                does. It has no effect outside of the main thread.
+
+        Returns:
+            The return value of the executed command, or the exit code of the error
+            that prevented it from being executed or that it raised. For a background
+            job, this is the exit code of starting it. For a cancelled command, this is
+            ``ExitCodes.ERR_COMMAND_CANCELLED``.
+
+        """
+        if cancel_on_interrupt:
+            return await self._eval_line_cancellable(line)
+
+        line, in_background = split_background_marker(line)
+        parse_status = self.parse_cmd_line(line)
+
+        return await self._eval_parse_status(
+            line, parse_status, in_background=in_background
+        )
+
+    async def _eval_line_cancellable(
         self,
         line: str
     ) -> int:
-        """Evaluate a line passed to the application by the user."""
-        parse_status = parse_cmd_line(line)
+        if threading.current_thread() is not threading.main_thread():
+            return await self.eval_line(line)
+
+        loop = asyncio.get_running_loop()
+        task = asyncio.ensure_future(self.eval_line(line))
+        interrupted = False
+
+        def on_interrupt(signum: int, frame: Any) -> None:
+            nonlocal interrupted
+            interrupted = True
+            loop.call_soon_threadsafe(task.cancel)
+
+        previous_handler = signal.signal(signal.SIGINT, on_interrupt)
+        try:
+            return await task
+        except asyncio.CancelledError:
+            # Only the interrupted command is cancelled, not whatever is awaiting it.
+            if not interrupted:
+                raise
+        finally:
+            signal.signal(signal.SIGINT, previous_handler)
+
+        self.io.warn('Command cancelled.')
+        return ExitCodes.ERR_COMMAND_CANCELLED
+
+    def start_job(
+        self,
+        line: str
+    ) -> Job:
+        """Start executing a command line as a background job.
+
+        The command runs as an :mod:`asyncio` task, so the prompt stays usable while it
+        is in flight. The job is added to :attr:`jobs`, and anything the command prints
+        (including the output of exception hooks) is buffered in its
+        :attr:`~almanac.core.jobs.Job.output`.
+
+        Raises:
+            :class:`BaseParseError`: If the command line cannot be fully parsed.
+
+        """
+        return self._start_job(line, results_or_raise(self.parse_cmd_line(line)))
+
+    def _start_job(
+        self,
+        line: str,
+        parsed_args: ParsedCommandLine
+    ) -> Job:
+        return self._jobs.start(
+            line,
+            self._eval_parsed_command_line(parsed_args),
+            max_output_messages=self._max_job_output_messages
+        )
+
+    async def _eval_parse_status(
+        self,
+        line: str,
+        parse_status: ParseStatus,
+        *,
+        in_background: bool = False
+    ) -> int:
+        if (
+            in_background and
+            parse_status.state == ParseState.FULL and
+            parse_status.results is not None
+        ):
+            job = self._start_job(line, parse_status.results)
+            self.io.info(f'[{job.id}] {line}')
+            return ExitCodes.OK
 
         if parse_status.state == ParseState.PARTIAL:
             self.io.error(
@@ -225,33 +518,211 @@ class Application:
             return ExitCodes.ERR_COMMAND_PARSING
 
         parsed_args = parse_status.results
-        if not parsed_args:
+        if parsed_args is None:
             return ExitCodes.OK
 
-        name_or_alias = parsed_args.command
+        return await self._eval_parsed_command_line(parsed_args)
 
-        async with self.dispatch_exception_hooks():
+    async def _eval_parsed_command_line(
+        self,
+        parsed_args: ParsedCommandLine
+    ) -> int:
+        try:
             return await self.call_as_current_app_async(
-                self._command_engine.run, name_or_alias, parsed_args
+                self._command_engine.run, parsed_args.command, parsed_args
+            )
+        except Exception as e:
+            await self._dispatch_exception_hook(e)
+            return exit_code_for_exception(e)
+
+    def validate_script(
+        self,
+        lines: Iterable[str]
+    ) -> Tuple[ScriptLineError, ...]:
+        """Check every line of a script for errors, without executing any of them.
+
+        Each line is parsed, its command name is resolved, and its arguments are bound
+        to the command's signature. Argument values are not promoted, so errors that
+        only a promoter can detect are not found until the script is run. Blank lines
+        and ``#`` comments are ignored.
+
+        Returns:
+            A tuple of all errors found in the script, in line order. It is empty if the
+            script is valid.
+
+        """
+        line_errors = []
+
+        for parsed_line in parse_lines(lines, parser_engine=self._parser_engine):
+            try:
+                parsed_args = results_or_raise(parsed_line.status)
+                command = self._command_engine[parsed_args.command]
+                self._command_engine.bind(command, parsed_args)
+            except (BaseArgumentError, BaseCommandError, BaseParseError) as e:
+                line_errors.append(
+                    ScriptLineError(parsed_line.line_number, parsed_line.text, e)
+                )
+
+        return tuple(line_errors)
+
+    async def run_script(
+        self,
+        script: Union[str, os.PathLike, Iterable[str]],
+        *,
+        stop_on_error: bool = True,
+        max_parse_ahead: int = 64,
+        read_in_thread: bool = False
+    ) -> ScriptResult:
+        """Execute each line of a script, in order, outside of the interactive prompt.
+
+        Lines are parsed ahead of the command that is currently executing (whenever it
+        awaits), into a buffer holding at most ``max_parse_ahead`` lines (see
+        :class:`ParseAheadReader`), so that even very large scripts are streamed rather
+        than read into memory at once. Blank lines and ``#`` comments are skipped, and a
+        line ending with ``&`` is started as a background job, as by :meth:`eval_line`.
+        Execution also stops if a command quits the application.
+
+        Args:
+            script: The path of a script file, or an iterable of its lines (such as an
+                open text file).
+            stop_on_error: Whether to stop at the first line that exits with a non-zero
+                code, rather than continuing with the rest of the script.
+            max_parse_ahead: The maximum number of parsed lines waiting to be executed.
+            read_in_thread: Whether to read the lines in a background thread, so that
+                a slow stream (such as a pipe) does not block the event loop, and each
+                line is executed as soon as it is read.
+
+        Returns:
+            The exit code of each executed line.
+
+        """
+        with ExitStack() as stack:
+            if isinstance(script, (str, os.PathLike)):
+                lines: Iterable[str] = stack.enter_context(
+                    open(script, encoding='utf-8')
+                )
+            else:
+                lines = script
+
+            reader = ParseAheadReader(
+                lines,
+                parser_engine=self._parser_engine,
+                max_parse_ahead=max_parse_ahead,
+                read_in_thread=read_in_thread
             )
+            line_results: List[ScriptLineResult] = []
+            stopped_early = False
+
+            async with reader:
+                async for parsed_line in reader:
+                    exit_code = exit_code_for_return_value(
+                        await self._eval_parse_status(
+                            parsed_line.text,
+                            parsed_line.status,
+                            in_background=parsed_line.in_background
+                        )
+                    )
+                    line_results.append(ScriptLineResult(
+                        parsed_line.line_number, parsed_line.text, exit_code
+                    ))
+
+                    if self._do_quit or (stop_on_error and exit_code != ExitCodes.OK):
+                        stopped_early = await reader.has_more_lines()
+                        break
+
+            return ScriptResult(tuple(line_results), stopped_early)
+
+    async def run_argv(
+        self,
+        argv: Sequence[str]
+    ) -> int:
+        """Run a single command from command-line arguments, without a prompt.
+
+        This is meant for one-shot invocations of an application, such as from cron::
+
+            sys.exit(asyncio.run(app.run_argv(sys.argv[1:])))
+
+        The arguments are mapped onto the command line grammar with
+        :func:`~almanac.parsing.argv.parse_argv`. Only the on-init and on-exit callbacks
+        that manage no particular resource, or a resource that the command requires,
+        are run around the command.
+
+        Returns:
+            The exit code of the command, or of the error that prevented it from being
+            executed or that it raised.
+
+        """
+        if not argv:
+            self.io.error('No command specified.')
+            return ExitCodes.ERR_COMMAND_NONEXISTENT
+
+        parsed_args = parse_argv(argv, parser_engine=self._parser_engine)
+
+        try:
+            command = self._command_engine[parsed_args.command]
+        except NoSuchCommandError as e:
+            await self._dispatch_exception_hook(e)
+            return exit_code_for_exception(e)
+
+        def is_needed(callback: AsyncNoArgsCallback[Any]) -> bool:
+            resource = self._callback_resources.get(callback)
+            return resource is None or resource in command.requires
+
+        try:
+            await self.run_async_callbacks(filter(is_needed, self._on_init_callbacks))
+            return exit_code_for_return_value(
+                await self._eval_parsed_command_line(parsed_args)
+            )
+        finally:
+            await self.run_async_callbacks(filter(is_needed, self._on_exit_callbacks))
 
     async def prompt(
-        self
+        self,
+        *,
+        interactive: Optional[bool] = None
     ) -> int:
         """Run the application's interactive prompt.
 
         This method will fire all registered on-init callbacks when it first begins,
-        and fire all registered on-exit callbacks when it completes execution.
+        and fire all registered on-exit callbacks when it completes execution. Any
+        background jobs still running at that point are cancelled first.
+
+        When standard input is not an interactive terminal (such as when commands are
+        piped into the application), no prompt session is started. Instead, lines are
+        read from standard input and evaluated back to back with :meth:`run_script`,
+        continuing past errors, until the input is exhausted or the application quits.
+
+        Args:
+            interactive: Whether to start an interactive prompt session. By default,
+                this is determined by whether standard input is a terminal.
 
         Returns:
-            The exit code of the application's execution.
+            The exit code of the application's execution. For non-interactive input,
+            this is the exit code of the first line that failed.
 
         """
+        if interactive is None:
+            interactive = is_interactive_stream(sys.stdin)
+
+        if not interactive:
+            return await self._run_non_interactive_prompt()
+
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.patch_stdout import patch_stdout
+
+        from .command_completer import CommandCompleter
+
         with patch_stdout():
             try:
                 await self.run_on_init_callbacks()
 
-                session = PromptSession(**self._session_opts)
+                session: PromptSession[str] = PromptSession(**self._session_opts)
+
+                completer = self._session_opts.get('completer')
+                if isinstance(completer, CommandCompleter):
+                    session.default_buffer.on_text_changed += (
+                        lambda _: completer.invalidate()
+                    )
 
                 while True:
                     try:
@@ -262,10 +733,12 @@ class Application:
                         if not line:
                             continue
 
-                        await self.eval_line(line)
+                        await self.eval_line(line, cancel_on_interrupt=True)
                     except KeyboardInterrupt:
                         # KeyboardInterrupt is a special exception case, since it is not
-                        # a descendant of the Exception base class.
+                        # a descendant of the Exception base class. It is raised by
+                        # prompt-toolkit for ^C at the prompt itself, while ^C during a
+                        # command only cancels that command.
                         continue
                     except EOFError:
                         # EOFError is also a special case, since it will be raised by
@@ -273,10 +746,29 @@ class Application:
                         # command implementations, we have to handle it out here.
                         break
             finally:
+                await self._jobs.cancel_all()
                 await self.run_on_exit_callbacks()
 
             return ExitCodes.OK
 
+    async def _run_non_interactive_prompt(
+        self
+    ) -> int:
+        try:
+            await self.run_on_init_callbacks()
+
+            if self._do_quit:
+                return ExitCodes.OK
+
+            # Piped input may arrive slowly, so it is read off the event loop.
+            result = await self.run_script(
+                sys.stdin, stop_on_error=False, read_in_thread=True
+            )
+            return result.exit_code
+        finally:
+            await self._jobs.cancel_all()
+            await self.run_on_exit_callbacks()
+
     def add_completers_for_type(
         self,
         _type: Type,
@@ -289,6 +781,8 @@ class Application:
         for completer in completers:
             self._type_completer_mapping[_type].append(completer)
 
+        self._command_engine.recompile_completion_plans()
+
     def add_promoter_for_type(
         self,
         _type: Type[_T],
@@ -334,13 +828,18 @@ class Application:
         return decorator
 
     def on_exit(
-        self
+        self,
+        *,
+        resource: Optional[str] = None
     ) -> Callable[[AsyncNoArgsCallback[Any]], AsyncNoArgsCallback[Any]]:
         """A decorator for specifying a callback to be executed when the app exits.
 
-        These callbacks will only be implicitly executed at the end of :meth:`prompt`
-        execution. Otherwise, the programmer must manually call
-        :meth:`run_on_init_callbacks`.
+        These callbacks will only be implicitly executed at the end of :meth:`prompt`,
+        :meth:`run_argv`, and non-interactive execution. Otherwise, the programmer must
+        manually call :meth:`run_on_exit_callbacks`.
+
+        A callback that tears down a ``resource`` is only run by :meth:`run_argv` if
+        the executed command requires that resource; see :meth:`on_init`.
 
         """
 
@@ -353,18 +852,29 @@ class Application:
                 raise e
 
             self._on_exit_callbacks.append(callback_coro)
+            if resource is not None:
+                self._callback_resources[callback_coro] = resource
+
             return callback_coro
 
         return decorator
 
     def on_init(
-        self
+        self,
+        *,
+        resource: Optional[str] = None
     ) -> Callable[[AsyncNoArgsCallback[Any]], AsyncNoArgsCallback[Any]]:
         """A decorator for specifying a callback to be executed when the prompt begins.
 
         These callbacks will only be implicitly executed at the beginning of
-        :meth:`prompt` execution. Otherwise, the programmer must manually call
-        :meth:`run_on_init_callbacks`.
+        :meth:`prompt`, :meth:`run_argv`, and non-interactive execution. Otherwise, the
+        programmer must manually call :meth:`run_on_init_callbacks`.
+
+        A callback may name the ``resource`` (such as a database connection) that it
+        sets up. :meth:`run_argv` only runs such a callback if the executed command
+        lists that resource in its ``requires`` option, so that one-shot commands do
+        not pay for resources that they do not use. Callbacks without a resource are
+        always run.
 
         """
 
@@ -377,6 +887,9 @@ class Application:
                 raise e
 
             self._on_init_callbacks.append(callback_coro)
+            if resource is not None:
+                self._callback_resources[callback_coro] = resource
+
             return callback_coro
 
         return decorator
@@ -389,15 +902,21 @@ class Application:
         try:
             yield
         except Exception as e:
-            exc_hook_table = self._hook_proxy.exception
-            exc_hook_coro = exc_hook_table.get_hook_for_exc_type(type(e))
+            await self._dispatch_exception_hook(e)
 
-            if exc_hook_coro is None:
-                self.print_exception_info(e, unknown=True)
-            else:
-                await self.call_as_current_app_async(exc_hook_coro, e)
+    async def _dispatch_exception_hook(
+        self,
+        exc: Exception
+    ) -> None:
+        exc_hook_table = self._hook_proxy.exception
+        exc_hook_coro = exc_hook_table.get_hook_for_exc_type(type(exc))
+
+        if exc_hook_coro is None:
+            self.print_exception_info(exc, unknown=True)
+        else:
+            await self.call_as_current_app_async(exc_hook_coro, exc)
 
-            self._maybe_propagate_runtime_exc(e)
+        self._maybe_propagate_runtime_exc(exc)
 
     async def run_async_callbacks(
         self,
@@ -479,10 +998,13 @@ class Application:
             else:
                 self.io.error('Exception occurred:\n')
 
+            # Only imported when a traceback is printed, as the lexers are slow to import.
+            from pygments import highlight
+            from pygments.formatters import TerminalFormatter
+            from pygments.lexers.python import Python3TracebackLexer
+
             tb = ''.join(traceback.format_exception(
-                etype=type(exc),
-                value=exc,
-                tb=exc.__traceback__
+                type(exc), exc, exc.__traceback__
             ))
             highlighted_tb = highlight(
                 tb, Python3TracebackLexer(), TerminalFormatter()
@@ -509,6 +1031,30 @@ class Application:
         for suggestion in suggestions:
             self.io.raw('    ', suggestion, sep='')
 
+    def print_argument_suggestions(
+        self,
+        name_or_alias: str,
+        argument_name: str
+    ) -> None:
+        """Print argument name recommendations for a misspelled keyword argument.
+
+        It is assumed that lookup of the argument on the command has already been
+        attempted and that no matching argument exists.
+
+        """
+        if name_or_alias not in self._command_engine:
+            return
+
+        suggestions = self._command_engine.get_argument_suggestions(
+            name_or_alias, argument_name
+        )
+        if not suggestions:
+            return
+
+        self.io.info(f'Perhaps you meant one of these instead of {argument_name}:')
+        for suggestion in suggestions:
+            self.io.raw('    ', suggestion, sep='')
+
     def _prompt_callback_wrapper(
         self
     ) -> str:
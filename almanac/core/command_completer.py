@@ -1,29 +1,43 @@
 from __future__ import annotations
 
+import asyncio
 import re
 
-from typing import Any, Iterable, TYPE_CHECKING
+from itertools import islice
+from typing import (
+    AbstractSet,
+    AsyncGenerator,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    TYPE_CHECKING,
+    Union
+)
 
 from prompt_toolkit.document import Document
 from prompt_toolkit.completion import (
     CompleteEvent,
     Completion,
     Completer,
-    merge_completers
+    DynamicCompleter
 )
+from prompt_toolkit.eventloop import run_in_executor_with_context
 
 from ..arguments import FrozenArgument
 from ..commands import FrozenCommand
 from ..completion import rewrite_completion_stream
 from ..errors import NoSuchArgumentError
 from ..parsing import (
+    incomplete_token_at_cursor,
     IncompleteToken,
-    last_incomplete_token,
-    parse_cmd_line,
     ParseState,
     Patterns
 )
-from ..types import is_matching_type
 
 if TYPE_CHECKING:
     from .application import Application
@@ -32,8 +46,81 @@ if TYPE_CHECKING:
 _compiled_word_re = re.compile(Patterns.UNQUOTED_STRING)
 
 
+class _CompleterSource(NamedTuple):
+    """A user-provided completer to be consulted, and the meta for its completions."""
+
+    completer: Completer
+    display_meta: str
+
+
+# Completions are gathered from a sequence of sources, each of which is either a stream
+# of completions computed by the CommandCompleter itself or a user-provided completer.
+_CompletionSource = Union[Iterable[Completion], _CompleterSource]
+
+
+def _more_completions_marker(
+    num_shown: int
+) -> Completion:
+    # Selecting the marker inserts nothing.
+    return Completion(
+        '',
+        start_position=0,
+        display='more\u2026',
+        display_meta=f'Only the first {num_shown} completions are shown.'
+    )
+
+
+async def _as_async_generator(
+    completions: Iterable[Completion]
+) -> AsyncGenerator[Completion, None]:
+    for completion in completions:
+        yield completion
+
+
+def _wrapped_completers(
+    completer: Completer
+) -> Tuple[Completer, ...]:
+    if isinstance(completer, DynamicCompleter):
+        dynamic_completer = completer.get_completer()
+        return () if dynamic_completer is None else (dynamic_completer,)
+
+    wrapped = getattr(completer, 'completers', None)
+    if wrapped is None:
+        wrapped = [getattr(completer, 'completer', None)]
+
+    return tuple(x for x in wrapped if isinstance(x, Completer))
+
+
+def _is_async_completer(
+    completer: Completer
+) -> bool:
+    get_completions_async = type(completer).get_completions_async
+    if get_completions_async is Completer.get_completions_async:
+        return False
+    elif not get_completions_async.__module__.startswith('prompt_toolkit.'):
+        return True
+
+    # The wrappers provided by prompt_toolkit (such as merged completers) implement
+    # asynchronous completion by delegating to the completers they wrap, which is only
+    # asynchronous if one of those is.
+    return any(_is_async_completer(x) for x in _wrapped_completers(completer))
+
+
 class CommandCompleter(Completer):
-    """A completer that provides command argument completion for an application."""
+    """A completer that provides command argument completion for an application.
+
+    When used asynchronously (as it is by the application's prompt), completers that
+    implement :meth:`~prompt_toolkit.completion.Completer.get_completions_async` are
+    awaited on the event loop, while those that only implement synchronous completion
+    are run in a thread. Completion begins once the application's
+    :attr:`~almanac.core.application.Application.completion_debounce` has passed, and
+    in-flight completion is abandoned when :meth:`invalidate` is called.
+
+    At most :attr:`~almanac.core.application.Application.max_completions` completions
+    are yielded, followed by a marker if any were left out. Completers are not asked
+    for any completions beyond that.
+
+    """
 
     def __init__(
         self,
@@ -42,72 +129,62 @@ class CommandCompleter(Completer):
         self._app = app
         self._command_engine = app.command_engine
 
-    def _maybe_complete_for_type(
-        self,
-        annotation: Any,
-        document: Document,
-        complete_event: CompleteEvent
-    ) -> Iterable[Completion]:
-        for _type, completers in self._app.type_completer_mapping.items():
-            if is_matching_type(_type, annotation):
-                yield from merge_completers(completers).get_completions(
-                    document, complete_event
-                )
+        self._in_flight: Set[asyncio.Future] = set()
+
+    def invalidate(
+        self
+    ) -> None:
+        """Cancel any in-flight asynchronous completion.
+
+        The application calls this whenever the text of its prompt changes, since any
+        completions still being computed are stale.
+
+        """
+        for task in self._in_flight:
+            task.cancel()
 
     def _get_command_completions(
         self,
         start_of_command: str
     ) -> Iterable[Completion]:
-        for name_or_alias in sorted(self._command_engine.keys()):
-            if name_or_alias.startswith(start_of_command):
-                command = self._command_engine[name_or_alias]
-
-                if name_or_alias == command.name:
-                    display_meta = command.abbreviated_description
-                else:
-                    display_meta = f'(alias for {command.name})'
-
-                yield Completion(
-                    name_or_alias,
-                    start_position=-len(start_of_command),
-                    display_meta=display_meta
-                )
+        for name_or_alias in self._command_engine.name_index.iter_prefix(start_of_command):
+            command = self._command_engine[name_or_alias]
+
+            if name_or_alias == command.name:
+                display_meta = command.abbreviated_description
+            else:
+                display_meta = f'(alias for {command.name})'
+
+            yield Completion(
+                name_or_alias,
+                start_position=-len(start_of_command),
+                display_meta=display_meta
+            )
 
-    def _get_completions_for_arg(
+    def _get_completion_sources_for_arg(
         self,
         frozen_arg: FrozenArgument,
-        document: Document,
-        complete_event: CompleteEvent
-    ) -> Iterable[Completion]:
+        type_completers: Iterable[Completer]
+    ) -> Iterator[_CompletionSource]:
         # Completions from any per-argument registered completer.
         for completer in frozen_arg.completers:
-            yield from rewrite_completion_stream(
-                self._app.call_as_current_app_sync(
-                    completer.get_completions,
-                    document, complete_event
-                ),
-                display_meta='From per-argument completer.'
-            )
+            yield _CompleterSource(completer, 'From per-argument completer.')
 
         # Completions from any matching application-global type completers.
-        yield from rewrite_completion_stream(
-            self._app.call_as_current_app_sync(
-                self._maybe_complete_for_type,
-                frozen_arg.annotation, document, complete_event
-            ),
-            display_meta='From global per-type completer.'
-        )
+        for completer in type_completers:
+            yield _CompleterSource(completer, 'From global per-type completer.')
 
     def _get_kw_arg_name_completions(
         self,
         start_of_kw_arg: str,
-        unbound_kw_args: Iterable[FrozenArgument]
+        kw_args: Iterable[FrozenArgument],
+        unbound_real_names: AbstractSet[str]
     ) -> Iterable[Completion]:
-        candidate_args = [
-            x for x in unbound_kw_args if not x.hidden and not x.is_var_kw
-        ]
-        for candidate_arg in sorted(candidate_args, key=lambda x: x.display_name):
-            if candidate_arg.display_name.startswith(start_of_kw_arg):
+        for candidate_arg in kw_args:
+            if (
+                candidate_arg.real_name in unbound_real_names and
+                candidate_arg.display_name.startswith(start_of_kw_arg)
+            ):
                 text = f'{candidate_arg.display_name}='
                 meta = candidate_arg.abbreviated_description
 
@@ -117,26 +194,33 @@ class CommandCompleter(Completer):
                     display_meta=meta
                 )
 
-    def get_completions(
+    def _get_completion_sources(
         self,
-        document: Document,
-        complete_event: CompleteEvent
-    ) -> Iterable[Completion]:
+        document: Document
+    ) -> Iterator[_CompletionSource]:
         cmd_line = document.text
         word_before_cursor = document.get_word_before_cursor()
         token_before_cursor = document.get_word_before_cursor(pattern=_compiled_word_re)
 
-        parse_results, unparsed_text, _, parse_status = parse_cmd_line(cmd_line)
+        parse_status = self._app.parse_cmd_line(cmd_line)
+        parse_results = parse_status.results
 
         # Determine if we are in the command name, in which case we can fall back on
         # the CommandEngine for finding potential command names or aliases.
         stripped_cmd_line = cmd_line.strip()
-        if parse_status == ParseState.NONE and stripped_cmd_line:
+        if parse_status.state == ParseState.NONE and stripped_cmd_line:
             # There is non-whitespace, and the parser still fails. The line is
             # inherently malformed, so any further completions would just build on that.
             return
-        elif not stripped_cmd_line or word_before_cursor == parse_results.command:
-            yield from self._get_command_completions(token_before_cursor)
+        elif parse_results is None:
+            yield self._get_command_completions(token_before_cursor)
+            return
+
+        cursor_pos = document.cursor_position
+        cursor_token_idx = parse_results.token_index_at(cursor_pos)
+        if cursor_token_idx == 0:
+            command_start = parse_results.command_span.start
+            yield self._get_command_completions(cmd_line[command_start:cursor_pos])
             return
 
         # Figure out what command we are working with.
@@ -147,22 +231,22 @@ class CommandCompleter(Completer):
             return
 
         # Determine the last incomplete token.
-        last_token: IncompleteToken = last_incomplete_token(document, unparsed_text)
+        last_token: IncompleteToken = incomplete_token_at_cursor(document, parse_status)
 
-        args = [x for x in parse_results.positionals]
-        kwargs, _ = command.resolved_kwarg_names(parse_results.kv.asDict())
+        args = list(parse_results.positionals)
+        kwargs, _ = command.resolved_kwarg_names(parse_results.kwargs)
 
         # Check if we want to avoid binding this argument, since we might not know if
-        # really a positional argument or actually an incomplete keyword argument.
-        if args and last_token.is_ambiguous_arg and last_token.value == args[-1]:
+        # really a positional argument or actually an incomplete keyword argument. The
+        # last positional argument is the token right after the command and the others.
+        if args and last_token.is_ambiguous_arg and cursor_token_idx == len(args):
             args.pop()
 
         # Determine what would be the unbound arguments if we attempted to bind the
         # current state of the arguments to the command's underlying coroutine. These
         # are our options for future argument-based completions.
         unbound_arguments = command.get_unbound_arguments(*args, **kwargs)
-        unbound_kw_args = [x for x in unbound_arguments if not x.is_pos_only]
-        unbound_pos_args = [x for x in unbound_arguments if not x.is_kw_only]
+        plan = self._command_engine.completion_plan_for(command)
 
         could_be_key_or_pos_value = (
             last_token.is_ambiguous_arg and (
@@ -173,15 +257,21 @@ class CommandCompleter(Completer):
 
         # Yield keyword argument name completions.
         if could_be_key_or_pos_value:
-            yield from self._get_kw_arg_name_completions(
-                last_token.key, unbound_kw_args
+            yield self._get_kw_arg_name_completions(
+                last_token.key,
+                plan.kw_args,
+                {x.real_name for x in unbound_arguments}
             )
 
         # Yield possible values for the next positional argument.
-        if unbound_pos_args and (could_be_key_or_pos_value or last_token.is_pos_arg):
-            next_pos_arg = unbound_pos_args[0]
-            yield from self._get_completions_for_arg(
-                next_pos_arg, document, complete_event
+        next_pos_arg = next((x for x in unbound_arguments if not x.is_kw_only), None)
+        if (
+            next_pos_arg is not None and
+            (could_be_key_or_pos_value or last_token.is_pos_arg)
+        ):
+            yield from self._get_completion_sources_for_arg(
+                next_pos_arg,
+                plan.type_completers.get(next_pos_arg.real_name, ())
             )
 
         # Yield possible values for the current keyword argument.
@@ -189,8 +279,9 @@ class CommandCompleter(Completer):
         if last_token.is_kw_arg:
             try:
                 matching_kw_arg = command[kwarg_name]
-                yield from self._get_completions_for_arg(
-                    matching_kw_arg, document, complete_event
+                yield from self._get_completion_sources_for_arg(
+                    matching_kw_arg,
+                    plan.type_completers.get(matching_kw_arg.real_name, ())
                 )
             except NoSuchArgumentError:
                 pass
@@ -201,3 +292,154 @@ class CommandCompleter(Completer):
         # TODO: if we want to inject global styles into the completions generated here,
         #       I think we will need some kind of Completion.replace function, and
         #       re-write properties of each Completion as we yield them
+
+    def _iter_completions(
+        self,
+        document: Document,
+        complete_event: CompleteEvent
+    ) -> Generator[Completion, None, None]:
+        for source in self._get_completion_sources(document):
+            if not isinstance(source, _CompleterSource):
+                yield from source
+                continue
+
+            yield from rewrite_completion_stream(
+                self._app.call_as_current_app_sync(
+                    source.completer.get_completions,
+                    document, complete_event
+                ),
+                display_meta=source.display_meta
+            )
+
+    def get_completions(
+        self,
+        document: Document,
+        complete_event: CompleteEvent
+    ) -> Iterable[Completion]:
+        completions = self._iter_completions(document, complete_event)
+        max_completions = self._app.max_completions
+        if max_completions is None:
+            yield from completions
+            return
+
+        try:
+            yield from islice(completions, max_completions)
+            if next(completions, None) is not None:
+                yield _more_completions_marker(max_completions)
+        finally:
+            completions.close()
+
+    def _pull_completions(
+        self,
+        completer: Completer,
+        document: Document,
+        complete_event: CompleteEvent,
+        limit: Optional[int]
+    ) -> List[Completion]:
+        return list(islice(completer.get_completions(document, complete_event), limit))
+
+    async def _iter_completions_async(
+        self,
+        document: Document,
+        complete_event: CompleteEvent,
+        limit: Optional[int]
+    ) -> AsyncGenerator[Completion, None]:
+        num_yielded = 0
+
+        for source in self._get_completion_sources(document):
+            remaining = None if limit is None else limit - num_yielded
+            if remaining == 0:
+                return
+
+            if not isinstance(source, _CompleterSource):
+                for completion in islice(source, remaining):
+                    yield completion
+                    num_yielded += 1
+                continue
+
+            completer = source.completer
+            if _is_async_completer(completer):
+                completions = completer.get_completions_async(document, complete_event)
+            else:
+                # Synchronous completers are run in a thread, so that slow ones do not
+                # block the event loop, and are only pulled from as far as needed.
+                completions = _as_async_generator(await run_in_executor_with_context(
+                    self._pull_completions,
+                    completer, document, complete_event, remaining
+                ))
+
+            try:
+                async for completion in completions:
+                    if num_yielded == limit:
+                        break
+
+                    for rewritten in rewrite_completion_stream(
+                        [completion], display_meta=source.display_meta
+                    ):
+                        yield rewritten
+                        num_yielded += 1
+            finally:
+                await completions.aclose()
+
+    async def _produce_completions(
+        self,
+        document: Document,
+        complete_event: CompleteEvent,
+        queue: asyncio.Queue
+    ) -> None:
+        debounce = self._app.completion_debounce
+        if debounce > 0:
+            await asyncio.sleep(debounce)
+
+        # One completion beyond the maximum is enough to know that some are left out.
+        max_completions = self._app.max_completions
+        limit = None if max_completions is None else max_completions + 1
+
+        completions = self._iter_completions_async(document, complete_event, limit)
+        try:
+            async for completion in completions:
+                queue.put_nowait(completion)
+        finally:
+            await completions.aclose()
+
+    async def get_completions_async(
+        self,
+        document: Document,
+        complete_event: CompleteEvent
+    ) -> AsyncGenerator[Completion, None]:
+        # Completions are produced by a separate task, so that invalidating them does
+        # not cancel the prompt's own completion task, which then retries on the latest
+        # document.
+        queue: asyncio.Queue = asyncio.Queue()
+        producer = asyncio.ensure_future(
+            self._app.call_as_current_app_async(
+                self._produce_completions, document, complete_event, queue
+            )
+        )
+        producer.add_done_callback(lambda _: queue.put_nowait(None))
+        self._in_flight.add(producer)
+
+        max_completions = self._app.max_completions
+        num_yielded = 0
+
+        try:
+            while True:
+                completion = await queue.get()
+                if completion is None:
+                    break
+                elif max_completions is not None and num_yielded == max_completions:
+                    yield _more_completions_marker(max_completions)
+                    break
+
+                yield completion
+                num_yielded += 1
+        finally:
+            self._in_flight.discard(producer)
+            producer.cancel()
+
+        # Invalidated or truncated completion ends quietly, but a completer's error is
+        # propagated.
+        if producer.done() and not producer.cancelled():
+            exc = producer.exception()
+            if exc is not None:
+                raise exc
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 import inspect
-
-import pyparsing as pp
+import math
 
 from typing import (
     Any,
     Callable,
     Dict,
     List,
+    Mapping,
     MutableMapping,
+    NamedTuple,
+    Optional,
     Tuple,
     Type,
     TYPE_CHECKING,
@@ -17,9 +20,15 @@ from typing import (
     Union
 )
 
+from .limiter import CommandLimiter
+from .result_cache import result_cache_key, ResultCache
+from .scripts import exit_code_for_return_value
+from ..arguments import FrozenArgument
 from ..commands import FrozenCommand
+from ..constants import ExitCodes
 from ..errors import (
     CommandNameCollisionError,
+    CommandTimeoutError,
     ConflictingPromoterTypesError,
     MissingArgumentsError,
     NoSuchArgumentError,
@@ -27,17 +36,77 @@ from ..errors import (
     TooManyPositionalArgumentsError,
     UnknownArgumentBindingError
 )
-from ..hooks import AsyncHookCallback, PromoterFunction
+from ..hooks import (
+    AsyncHookCallback,
+    CommandHook,
+    compile_hook_chain,
+    HookChain,
+    HookMode,
+    PromoterFunction
+)
+from ..io import BufferedIoContext
+from ..parsing import ParsedCommandLine
 from ..types import is_matching_type
-from ..utils import FuzzyMatcher
+from ..utils import PrefixIndex, SuggestionIndex
 
 if TYPE_CHECKING:
+    from prompt_toolkit.completion import Completer
+
     from .application import Application
 
-HookCallbackMapping = MutableMapping[FrozenCommand, List[AsyncHookCallback]]
+HookCallbackMapping = MutableMapping[FrozenCommand, List[CommandHook]]
+
+
+class PromotionStep(NamedTuple):
+    """The promoters to apply to the value bound to a single parameter.
+
+    The promoters are applied in order of their registration, each to the bound value,
+    and the result of the last one is kept. For ``*args`` and ``**kwargs`` parameters,
+    they are applied to each of the variant's values.
+
+    """
+
+    arg_name: str
+    kind: inspect._ParameterKind
+    promoters: Tuple[PromoterFunction, ...]
+
+
+# The promotion steps for each of a command's parameters that have promoters.
+PromotionPlan = Tuple[PromotionStep, ...]
+
+
+class CompletionPlan(NamedTuple):
+    """The precomputed state used to complete the arguments of a single command.
+
+    ``type_completers`` maps the real name of each argument whose annotation matches
+    one or more types with application-global completers to those completers, in order.
+    They are kept separate, so that each can be run according to whether it is
+    synchronous or asynchronous.
+
+    """
+
+    kw_args: Tuple[FrozenArgument, ...]
+    type_completers: Mapping[str, Tuple[Completer, ...]]
+
 
 _T = TypeVar('_T')
 
+_VAR_POSITIONAL = inspect.Parameter.VAR_POSITIONAL
+_VAR_KEYWORD = inspect.Parameter.VAR_KEYWORD
+
+
+def _fresh_value(
+    value: Any
+) -> Any:
+    # Parsed lists and dicts are shared by every parse of the same line (through the
+    # parse cache), so each binding gets its own copies for the command to mutate.
+    if isinstance(value, list):
+        return [_fresh_value(x) for x in value]
+    elif isinstance(value, dict):
+        return {k: _fresh_value(v) for k, v in value.items()}
+
+    return value
+
 
 class CommandEngine:
     """A command lookup and management engine."""
@@ -51,15 +120,24 @@ class CommandEngine:
 
         self._registered_commands: List[FrozenCommand] = []
         self._command_lookup_table: Dict[str, FrozenCommand] = {}
+        self._name_index = PrefixIndex()
+        self._suggestion_index = SuggestionIndex()
 
         self._after_command_callbacks: HookCallbackMapping = {}
         self._before_command_callbacks: HookCallbackMapping = {}
+        # The compiled hooks of each command that has any.
+        self._after_hook_chains: Dict[FrozenCommand, HookChain] = {}
+        self._before_hook_chains: Dict[FrozenCommand, HookChain] = {}
+
+        self._type_promoter_mapping: Dict[Type, Callable] = {}
+        self._promotion_plans: Dict[FrozenCommand, PromotionPlan] = {}
+        self._completion_plans: Dict[FrozenCommand, CompletionPlan] = {}
+        self._result_caches: Dict[FrozenCommand, ResultCache] = {}
+        self._limiters: Dict[FrozenCommand, CommandLimiter] = {}
 
         for command in commands_to_register:
             self.register(command)
 
-        self._type_promoter_mapping: Dict[Type, Callable] = {}
-
     @property
     def app(
         self
@@ -67,6 +145,20 @@ class CommandEngine:
         """The application that this engine manages."""
         return self._app
 
+    @property
+    def name_index(
+        self
+    ) -> PrefixIndex:
+        """A sorted index of all registered command names and aliases."""
+        return self._name_index
+
+    @property
+    def suggestion_index(
+        self
+    ) -> SuggestionIndex:
+        """A fuzzy suggestion index of all registered command names and aliases."""
+        return self._suggestion_index
+
     @property
     def type_promoter_mapping(
         self
@@ -88,6 +180,81 @@ class CommandEngine:
 
         self._type_promoter_mapping[_type] = promoter_callable
 
+        for command in self._registered_commands:
+            self._promotion_plans[command] = self._compile_promotion_plan(command)
+
+    def _compile_promotion_plan(
+        self,
+        command: FrozenCommand
+    ) -> PromotionPlan:
+        steps = []
+
+        for arg_name, param in command.signature.parameters.items():
+            promoters = tuple(
+                promoter_callable
+                for _type, promoter_callable in self._type_promoter_mapping.items()
+                if is_matching_type(_type, param.annotation)
+            )
+            if promoters:
+                steps.append(PromotionStep(arg_name, param.kind, promoters))
+
+        return tuple(steps)
+
+    def promotion_plan_for(
+        self,
+        command: FrozenCommand
+    ) -> PromotionPlan:
+        """Get the compiled promotion plan of a registered command.
+
+        Plans are compiled when a command is registered, and re-compiled whenever a
+        promoter is added with :meth:`add_promoter_for_type`.
+
+        """
+        return self._promotion_plans[command]
+
+    def _compile_completion_plan(
+        self,
+        command: FrozenCommand
+    ) -> CompletionPlan:
+        type_completers: Dict[str, Tuple[Completer, ...]] = {}
+
+        for arg in command.values():
+            completers = tuple(
+                completer
+                for _type, type_completers_for_type
+                in self._app.type_completer_mapping.items()
+                if is_matching_type(_type, arg.annotation)
+                for completer in type_completers_for_type
+            )
+            if completers:
+                type_completers[arg.real_name] = completers
+
+        return CompletionPlan(command.completable_kw_args, type_completers)
+
+    def completion_plan_for(
+        self,
+        command: FrozenCommand
+    ) -> CompletionPlan:
+        """Get the compiled completion plan of a registered command.
+
+        Plans are compiled when a command is registered, and re-compiled whenever a
+        global type completer is added with
+        :meth:`~almanac.core.application.Application.add_completers_for_type`.
+
+        """
+        return self._completion_plans[command]
+
+    def recompile_completion_plans(
+        self
+    ) -> None:
+        """Re-compile the completion plan of every registered command.
+
+        This must be called after the application's global type completers change.
+
+        """
+        for command in self._registered_commands:
+            self._completion_plans[command] = self._compile_completion_plan(command)
+
     def register(
         self,
         command: FrozenCommand
@@ -109,43 +276,127 @@ class CommandEngine:
 
         for identifier in command.identifiers:
             self._command_lookup_table[identifier] = command
+            self._name_index.add(identifier)
+            self._suggestion_index.add(identifier)
 
         self._after_command_callbacks[command] = []
         self._before_command_callbacks[command] = []
+        self._promotion_plans[command] = self._compile_promotion_plan(command)
+        self._completion_plans[command] = self._compile_completion_plan(command)
+        if command.cache is not None:
+            self._result_caches[command] = ResultCache(command.cache)
+        if command.limits is not None:
+            self._limiters[command] = CommandLimiter(command.name, command.limits)
 
         self._registered_commands.append(command)
 
+    def result_cache_for(
+        self,
+        name_or_command: Union[str, FrozenCommand]
+    ) -> Optional[ResultCache]:
+        """Get the cache of a command's results, if the command has a cache policy."""
+        if isinstance(name_or_command, str):
+            name_or_command = self[name_or_command]
+
+        return self._result_caches.get(name_or_command)
+
+    @property
+    def result_caches(
+        self
+    ) -> Dict[str, ResultCache]:
+        """The result caches of all commands with a cache policy, by command name."""
+        return {command.name: cache for command, cache in self._result_caches.items()}
+
+    def clear_result_caches(
+        self
+    ) -> None:
+        """Remove every cached result of every command."""
+        for cache in self._result_caches.values():
+            cache.clear()
+
+    def limiter_for(
+        self,
+        name_or_command: Union[str, FrozenCommand]
+    ) -> Optional[CommandLimiter]:
+        """Get the limiter of a command's calls, if the command has limits."""
+        if isinstance(name_or_command, str):
+            name_or_command = self[name_or_command]
+
+        return self._limiters.get(name_or_command)
+
+    @property
+    def limiters(
+        self
+    ) -> Dict[str, CommandLimiter]:
+        """The limiters of all commands with limits, by command name."""
+        return {command.name: limiter for command, limiter in self._limiters.items()}
+
     def add_before_command_callback(
         self,
         name_or_command: Union[str, FrozenCommand],
-        callback: AsyncHookCallback
+        callback: AsyncHookCallback,
+        *,
+        mode: HookMode = HookMode.CONCURRENT
     ) -> None:
-        """Register a callback for execution before a command."""
-        if isinstance(name_or_command, str):
-            try:
-                command = self[name_or_command]
-            except KeyError:
-                raise NoSuchCommandError(name_or_command)
-        else:
-            command = name_or_command
+        """Register a callback for execution before a command.
 
-        self._before_command_callbacks[command].append(callback)
+        See :class:`HookMode` for how the callback is run relative to the command's
+        other before callbacks.
+
+        """
+        command = self._resolve_hooked_command(name_or_command)
+        self._before_command_callbacks[command].append(CommandHook(callback, mode))
+        self._before_hook_chains[command] = self._compile_hook_chain(
+            command, self._before_command_callbacks
+        )
 
     def add_after_command_callback(
         self,
         name_or_command: Union[str, FrozenCommand],
-        callback: AsyncHookCallback
+        callback: AsyncHookCallback,
+        *,
+        mode: HookMode = HookMode.CONCURRENT
     ) -> None:
-        """Register a callback for execution after a command."""
+        """Register a callback for execution after a command.
+
+        See :class:`HookMode` for how the callback is run relative to the command's
+        other after callbacks.
+
+        """
+        command = self._resolve_hooked_command(name_or_command)
+        self._after_command_callbacks[command].append(CommandHook(callback, mode))
+        self._after_hook_chains[command] = self._compile_hook_chain(
+            command, self._after_command_callbacks
+        )
+
+    def _resolve_hooked_command(
+        self,
+        name_or_command: Union[str, FrozenCommand]
+    ) -> FrozenCommand:
         if isinstance(name_or_command, str):
             try:
-                command = self[name_or_command]
+                return self[name_or_command]
             except KeyError:
                 raise NoSuchCommandError(name_or_command)
-        else:
-            command = name_or_command
 
-        self._after_command_callbacks[command].append(callback)
+        return name_or_command
+
+    def _compile_hook_chain(
+        self,
+        command: FrozenCommand,
+        hook_mapping: HookCallbackMapping
+    ) -> HookChain:
+        hook_chain = compile_hook_chain(hook_mapping[command], command_name=command.name)
+        assert hook_chain is not None
+        return hook_chain
+
+    async def _run_hook_chain(
+        self,
+        hook_chain: HookChain,
+        bound_args: inspect.BoundArguments
+    ) -> None:
+        async with self._app.dispatch_exception_hooks():
+            await self._app.call_as_current_app_async(hook_chain, bound_args)
 
     def get(
         self,
@@ -171,29 +422,175 @@ class CommandEngine:
     async def run(
         self,
         name_or_alias: str,
-        parsed_args: pp.ParseResults
+        parsed_args: ParsedCommandLine
     ) -> int:
         """Run a command, validating the specified arguments.
 
+        Arguments are bound with :meth:`bind` and then promoted to their annotated
+        types before the command's coroutine is called.
+
+        The results of a command with a cache policy are memoized by its promoted
+        arguments and the current page path. A cached result is returned, and the
+        output printed when it was computed is reprinted, without calling the command's
+        coroutine. Only results that correspond to a successful exit code are cached.
+
+        Before and after hooks are run as compiled by :func:`compile_hook_chain`.
+        Exceptions raised by hooks are dispatched to the exception hooks, rather than
+        stopping the command.
+
+        Calls of a command with limits are admitted by its :class:`CommandLimiter`
+        before the coroutine is called (and its timeout starts).
+
+        Raises:
+            :class:`CommandTimeoutError`: If the command's coroutine runs for longer
+                than the command's timeout (or else the application's default timeout),
+                in which case it is cancelled.
+            :class:`CommandLimitError`: If the call is over one of the command's limits,
+                and they are configured to reject such calls.
+
+        """
+        command: FrozenCommand = self[name_or_alias]
+        bound_args = self.bind(command, parsed_args)
+
+        # Promote all eligible arguments and execute the coroutine call.
+        arguments = bound_args.arguments
+        for arg_name, kind, promoters in self._promotion_plans[command]:
+            if arg_name not in arguments:
+                continue
+
+            # Each promoter is applied to the bound value (not to the output of the
+            # promoter before it), and the last one wins.
+            value: Any = arguments[arg_name]
+            new_value: Any = value
+            for promoter_callable in promoters:
+                if kind == _VAR_POSITIONAL:
+                    # Promote over all entries in a *args variant.
+                    new_value = tuple(promoter_callable(x) for x in value)
+                elif kind == _VAR_KEYWORD:
+                    # Promote over all values in a **kwargs variant.
+                    new_value = {k: promoter_callable(v) for k, v in value.items()}
+                else:
+                    # Promote a single value.
+                    new_value = promoter_callable(value)
+
+            arguments[arg_name] = new_value
+
+        # Commands without hooks skip hook dispatch entirely.
+        before_hook_chain = self._before_hook_chains.get(command)
+        if before_hook_chain is not None:
+            await self._run_hook_chain(before_hook_chain, bound_args)
+
+        result_cache = self._result_caches.get(command)
+        if result_cache is None:
+            ret = await self._run_with_limits(command, bound_args)
+        else:
+            ret = await self._run_with_cache(command, bound_args, result_cache)
+
+        after_hook_chain = self._after_hook_chains.get(command)
+        if after_hook_chain is not None:
+            await self._run_hook_chain(after_hook_chain, bound_args)
+
+        return ret
+
+    async def _run_with_cache(
+        self,
+        command: FrozenCommand,
+        bound_args: inspect.BoundArguments,
+        result_cache: ResultCache
+    ) -> int:
+        key = result_cache_key(str(self._app.current_path), bound_args.arguments.items())
+        if key is None:
+            return await self._run_with_limits(command, bound_args)
+
+        cached_result = result_cache.get(key)
+        if cached_result is not None:
+            cached_result.output.replay(self._app.io)
+            ret: int = cached_result.value
+            return ret
+
+        output = BufferedIoContext(forward_to=self._app.io)
+        with self._app.redirected_io(output):
+            ret = await self._run_with_limits(command, bound_args)
+
+        if exit_code_for_return_value(ret) == ExitCodes.OK:
+            result_cache.store(key, ret, output)
+
+        return ret
+
+    async def _run_with_limits(
+        self,
+        command: FrozenCommand,
+        bound_args: inspect.BoundArguments
+    ) -> int:
+        limiter = self._limiters.get(command)
+        if limiter is None:
+            return await self._run_with_timeout(command, bound_args)
+
+        async with limiter:
+            return await self._run_with_timeout(command, bound_args)
+
+    async def _run_with_timeout(
+        self,
+        command: FrozenCommand,
+        bound_args: inspect.BoundArguments
+    ) -> int:
+        timeout = command.timeout
+        if timeout is None:
+            timeout = self._app.command_timeout
+
+        if timeout is None or math.isinf(timeout):
+            return await command.run(*bound_args.args, **bound_args.kwargs)
+
+        # The command runs in its own task, rather than under asyncio.wait_for, so that
+        # a TimeoutError raised by the command itself is not mistaken for a timeout.
+        task = asyncio.ensure_future(command.run(*bound_args.args, **bound_args.kwargs))
+        try:
+            done, _ = await asyncio.wait((task,), timeout=timeout)
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+
+        if not done:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+            raise CommandTimeoutError(command.name, timeout)
+
+        ret: int = task.result()
+        return ret
+
+    def bind(
+        self,
+        command: FrozenCommand,
+        parsed_args: ParsedCommandLine
+    ) -> inspect.BoundArguments:
+        """Bind parsed arguments to a command's signature, without promoting them.
+
         In the event of coroutine-binding failure, this method will do quite a bit of
         signature introspection to determine why a binding of user-specified arguments
         to the coroutine signature might fail.
 
-        """
-        try:
-            command: FrozenCommand = self[name_or_alias]
-            coro_signature: inspect.Signature = command.signature
-        except NoSuchCommandError as e:
-            raise e
+        Raises:
+            :class:`NoSuchArgumentError`: If an unknown keyword argument is specified.
+            :class:`TooManyPositionalArgumentsError`: If too many positional values
+                are specified.
+            :class:`MissingArgumentsError`: If required arguments are not specified.
+            :class:`UnknownArgumentBindingError`: If binding fails for any other
+                reason.
 
-        pos_arg_values = [x for x in parsed_args.positionals]
-        raw_kwargs = {k: v for k, v in parsed_args.kv.asDict().items()}
-        resolved_kwargs, unresolved_kwargs = command.resolved_kwarg_names(raw_kwargs)
+        """
+        pos_arg_values = [_fresh_value(x) for x in parsed_args.positionals]
+        resolved_kwargs, unresolved_kwargs = command.resolved_kwarg_names(
+            {k: _fresh_value(v) for k, v in parsed_args.kwargs.items()}
+        )
 
         # Check if we have any extra/unresolvable kwargs.
         if not command.has_var_kw_arg and unresolved_kwargs:
             extra_kwargs = list(unresolved_kwargs.keys())
-            raise NoSuchArgumentError(*extra_kwargs)
+            raise NoSuchArgumentError(*extra_kwargs, command_name=command.name)
 
         # We can safely merged these kwarg dicts now since we know any unresolvable
         # arguments must be due to a **kwargs variant.
@@ -205,42 +602,8 @@ class CommandEngine:
         except TypeError:
             can_bind = False
 
-        # If we can call our function, we next promote all eligible arguments and
-        # execute the coroutine call.
         if can_bind:
-            for arg_name, value in bound_args.arguments.items():
-                param = coro_signature.parameters[arg_name]
-                arg_annotation = param.annotation
-
-                for _type, promoter_callable in self._type_promoter_mapping.items():
-                    if not is_matching_type(_type, arg_annotation):
-                        continue
-
-                    new_value: Any
-                    if param.kind == param.VAR_POSITIONAL:
-                        # Promote over all entries in a *args variant.
-                        new_value = tuple(promoter_callable(x) for x in value)
-                    elif param.kind == param.VAR_KEYWORD:
-                        # Promote over all values in a **kwargs variant.
-                        new_value = {
-                            k: promoter_callable(v) for k, v in value.items()
-                        }
-                    else:
-                        # Promote a single value.
-                        new_value = promoter_callable(value)
-
-                    bound_args.arguments[arg_name] = new_value
-
-            await self._app.run_async_callbacks(
-                self._before_command_callbacks[command],
-                *bound_args.args, **bound_args.kwargs
-            )
-            ret = await command.run(*bound_args.args, **bound_args.kwargs)
-            await self._app.run_async_callbacks(
-                self._after_command_callbacks[command],
-                *bound_args.args, **bound_args.kwargs
-            )
-            return ret
+            return bound_args
 
         # Otherwise, we do some inspection to generate an informative error.
         try:
@@ -296,16 +659,35 @@ class CommandEngine:
         """Find the closest matching names/aliases to the specified string.
 
         Returns:
-            A possibly-empty tuple of :class:`Command`s that most
-            closely match the specified `name_or_alias` field.
+            A possibly-empty tuple of the registered names and aliases that most
+            closely match the specified `name_or_alias` field, best match first.
+
+        """
+        return self._suggestion_index.matches(
+            name_or_alias, num_max_matches=max_suggestions
+        )
+
+    def get_argument_suggestions(
+        self,
+        name_or_alias: str,
+        argument_name: str,
+        max_suggestions: int = 3
+    ) -> Tuple[str, ...]:
+        """Find the closest matching argument names of a command to a string.
+
+        Returns:
+            A possibly-empty tuple of the argument display names of the command that
+            most closely match the specified `argument_name` field, best match first.
+
+        Raises:
+            :class:`NoSuchCommandError`: If the specified ``name_or_alias`` is not
+                contained within this instance.
 
         """
-        fuzz = FuzzyMatcher(
-            name_or_alias,
-            self._command_lookup_table.keys(),
-            num_max_matches=max_suggestions
+        command = self[name_or_alias]
+        return command.argument_suggestion_index.matches(
+            argument_name, num_max_matches=max_suggestions
         )
-        return fuzz.matches
 
     def keys(
         self
@@ -325,7 +707,7 @@ class CommandEngine:
         name_or_alias: str
     ) -> bool:
         """Whether a specified command name or alias is mapped."""
-        return name_or_alias in self._command_lookup_table.keys()
+        return name_or_alias in self._command_lookup_table
 
     def __len__(
         self
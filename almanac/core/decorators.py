@@ -2,14 +2,19 @@ from __future__ import annotations
 
 import functools
 
-from typing import Callable, Iterable, Optional, TYPE_CHECKING, Union
-
-from prompt_toolkit.completion import Completer
+from typing import Any, Callable, Dict, Iterable, Optional, TYPE_CHECKING, Union
 
 from ..arguments import MutableArgument
-from ..commands import FrozenCommand, MutableCommand
-from ..completion import WordCompleter
+from ..commands import (
+    CachePolicy,
+    CommandLimits,
+    FrozenCommand,
+    LimitPolicy,
+    MutableCommand,
+    RateLimit
+)
 from ..errors import (
+    CommandRegistrationError,
     InvalidArgumentNameError,
     NoSuchArgumentError,
 )
@@ -17,6 +22,8 @@ from ..parsing import Patterns
 from ..types import CommandCoroutine
 
 if TYPE_CHECKING:
+    from prompt_toolkit.completion import Completer
+
     from .application import Application
 
 
@@ -64,7 +71,11 @@ class ArgumentDecoratorProxy:
                 if description is not None:
                     argument.description = description
 
+                # The completion imports are deferred, so that importing almanac does
+                # not load prompt_toolkit.
                 if choices is not None:
+                    from ..completion import WordCompleter
+
                     if isinstance(choices, str):
                         choice_list = [choices]
                     else:
@@ -73,6 +84,8 @@ class ArgumentDecoratorProxy:
                     argument.completers.append(WordCompleter(choice_list))
 
                 if completers is not None:
+                    from prompt_toolkit.completion import Completer
+
                     if isinstance(completers, Completer):
                         argument.completers.append(completers)
                     else:
@@ -148,9 +161,68 @@ class CommandDecoratorProxy:
         *,
         name: Optional[str] = None,
         description: Optional[str] = None,
-        aliases: Optional[Union[str, Iterable[str]]] = None
+        aliases: Optional[Union[str, Iterable[str]]] = None,
+        requires: Optional[Union[str, Iterable[str]]] = None,
+        timeout: Optional[float] = None,
+        cache: Optional[Union[bool, CachePolicy]] = None,
+        max_concurrency: Optional[int] = None,
+        rate: Optional[Union[float, RateLimit]] = None,
+        limit_policy: Optional[LimitPolicy] = None
     ) -> CommandMutatingDecorator:
-        """A decorator for mutating properties of a :class:`MutableCommand`."""
+        """A decorator for mutating properties of a :class:`MutableCommand`.
+
+        ``requires`` names the resources (see :meth:`Application.on_init`) that the
+        command needs. When a command is run on its own with
+        :meth:`Application.run_argv`, only the on-init and on-exit callbacks of those
+        resources (and of no resource at all) are run.
+
+        ``timeout`` is the number of seconds after which the command is cancelled and a
+        :class:`CommandTimeoutError` is raised, overriding the application's default.
+        Pass ``math.inf`` to exempt a command from the default.
+
+        ``cache`` memoizes the results of an idempotent command, per its promoted
+        arguments and the current page path. It is either a :class:`CachePolicy`, or
+        ``True`` for the default policy. Repeated calls are answered (along with the
+        output printed by the original call) without running the command's coroutine.
+
+        ``max_concurrency`` bounds how many calls of the command run at once, and
+        ``rate`` bounds how quickly calls are admitted, either as a :class:`RateLimit`
+        or as a number of calls per second. Calls over a limit wait their turn, unless
+        the ``limit_policy`` is :attr:`LimitPolicy.REJECT`, in which case they fail with
+        a :class:`CommandLimitError`. Cached results are not subject to these limits.
+
+        """
+        if timeout is not None and timeout <= 0:
+            raise CommandRegistrationError(f'Invalid command timeout {timeout}')
+
+        cache_policy: Optional[CachePolicy]
+        if cache is True:
+            cache_policy = CachePolicy()
+        elif cache is False:
+            cache_policy = None
+        else:
+            cache_policy = cache
+
+        if cache_policy is not None and (
+            (cache_policy.ttl is not None and cache_policy.ttl <= 0) or
+            cache_policy.max_entries < 1
+        ):
+            raise CommandRegistrationError(f'Invalid command cache policy {cache_policy}')
+
+        rate_limit = RateLimit(float(rate)) if isinstance(rate, (int, float)) else rate
+        if max_concurrency is not None and max_concurrency < 1:
+            raise CommandRegistrationError(f'Invalid command concurrency {max_concurrency}')
+        elif rate_limit is not None and (rate_limit.per_second <= 0 or rate_limit.burst < 1):
+            raise CommandRegistrationError(f'Invalid command rate limit {rate_limit}')
+
+        limit_changes: Dict[str, Any] = {}
+        if max_concurrency is not None:
+            limit_changes['max_concurrency'] = max_concurrency
+        if rate_limit is not None:
+            limit_changes['rate'] = rate_limit
+        if limit_policy is not None:
+            limit_changes['policy'] = limit_policy
+
         def wrapped(
             command_or_coro: Union[MutableCommand, CommandCoroutine]
         ) -> MutableCommand:
@@ -171,6 +243,22 @@ class CommandDecoratorProxy:
                 else:
                     command.add_alias(*aliases)
 
+            if requires is not None:
+                if isinstance(requires, str):
+                    command.add_requirement(requires)
+                else:
+                    command.add_requirement(*requires)
+
+            if timeout is not None:
+                command.timeout = timeout
+
+            if cache is not None:
+                command.cache = cache_policy
+
+            if limit_changes:
+                limits = command.limits if command.limits is not None else CommandLimits()
+                command.limits = limits._replace(**limit_changes)
+
             return command
 
         return wrapped
@@ -0,0 +1,270 @@
+"""Utilities for running commands in the background."""
+
+import asyncio
+
+from contextvars import ContextVar
+from enum import auto, Enum
+from typing import Awaitable, Dict, Iterator, Optional, Tuple
+
+from .scripts import exit_code_for_exception, exit_code_for_return_value
+from ..constants import ExitCodes
+from ..errors import NoSuchJobError
+from ..io import BufferedIoContext
+
+_current_job: ContextVar[Optional['Job']] = ContextVar('_current_job', default=None)
+
+
+def current_job(
+) -> Optional['Job']:
+    """Get the background job that is currently running, if any."""
+    return _current_job.get()
+
+
+class JobStatus(Enum):
+    """The states of a background job."""
+
+    RUNNING = auto()
+    DONE = auto()
+    CANCELLED = auto()
+
+
+class Job:
+    """A command line executing in the background, as an :mod:`asyncio` task.
+
+    Anything the command prints is recorded in the job's :attr:`output` buffer, rather
+    than being printed while the prompt is in use.
+
+    Jobs are created with :meth:`JobTable.start`.
+
+    """
+
+    def __init__(
+        self,
+        job_id: int,
+        command_line: str,
+        coro: Awaitable[int],
+        *,
+        max_output_messages: Optional[int] = None
+    ) -> None:
+        self._id = job_id
+        self._command_line = command_line
+        self._output = BufferedIoContext(max_messages=max_output_messages)
+
+        self._status = JobStatus.RUNNING
+        self._exit_code: Optional[int] = None
+        self._exception: Optional[Exception] = None
+
+        self._coro = coro
+        self._task = asyncio.ensure_future(self._run(coro))
+        self._task.add_done_callback(self._on_done)
+
+    async def _run(
+        self,
+        coro: Awaitable[int]
+    ) -> None:
+        _current_job.set(self)
+
+        try:
+            self._exit_code = exit_code_for_return_value(await coro)
+            self._status = JobStatus.DONE
+        except asyncio.CancelledError:
+            self._exit_code = ExitCodes.ERR_COMMAND_CANCELLED
+            self._status = JobStatus.CANCELLED
+        except Exception as e:
+            # Exceptions only escape the command when they are configured to propagate.
+            self._exception = e
+            self._exit_code = exit_code_for_exception(e)
+            self._status = JobStatus.DONE
+
+    def _on_done(
+        self,
+        task: asyncio.Future
+    ) -> None:
+        # A task cancelled before it starts never runs the handling in _run, nor awaits
+        # the command's coroutine.
+        if task.cancelled() and self._status == JobStatus.RUNNING:
+            self._exit_code = ExitCodes.ERR_COMMAND_CANCELLED
+            self._status = JobStatus.CANCELLED
+            if asyncio.iscoroutine(self._coro):
+                self._coro.close()
+
+    @property
+    def id(
+        self
+    ) -> int:
+        """The number identifying this job in its :class:`JobTable`."""
+        return self._id
+
+    @property
+    def command_line(
+        self
+    ) -> str:
+        """The command line being executed by this job."""
+        return self._command_line
+
+    @property
+    def output(
+        self
+    ) -> BufferedIoContext:
+        """The output printed by this job's command."""
+        return self._output
+
+    @property
+    def status(
+        self
+    ) -> JobStatus:
+        """The current state of this job."""
+        return self._status
+
+    @property
+    def exit_code(
+        self
+    ) -> Optional[int]:
+        """The exit code of this job's command, or ``None`` while it is running."""
+        return self._exit_code
+
+    @property
+    def exception(
+        self
+    ) -> Optional[Exception]:
+        """The exception propagated from this job's command, if any."""
+        return self._exception
+
+    def done(
+        self
+    ) -> bool:
+        """Whether this job has finished running."""
+        return self._status != JobStatus.RUNNING
+
+    def cancel(
+        self
+    ) -> None:
+        """Request the cancellation of this job's command."""
+        self._task.cancel()
+
+    async def wait(
+        self
+    ) -> int:
+        """Wait for this job to finish.
+
+        Returns:
+            The exit code of this job's command.
+
+        """
+        try:
+            await asyncio.shield(self._task)
+        except asyncio.CancelledError:
+            # Only swallow the cancellation of the job, not of the waiter.
+            if not self._task.cancelled():
+                raise
+
+            self._on_done(self._task)
+
+        assert self._exit_code is not None
+        return self._exit_code
+
+    def __repr__(
+        self
+    ) -> str:
+        return (
+            f'<{self.__class__.__qualname__} [{self._id}] {self._status.name} '
+            f'{self._command_line!r}>'
+        )
+
+
+class JobTable:
+    """The background jobs of an application, by id.
+
+    Ids are assigned like a shell's job numbers: each new job is numbered one higher
+    than the highest id in the table, so numbering restarts once the table is empty.
+
+    """
+
+    def __init__(
+        self
+    ) -> None:
+        self._jobs: Dict[int, Job] = {}
+
+    def start(
+        self,
+        command_line: str,
+        coro: Awaitable[int],
+        *,
+        max_output_messages: Optional[int] = None
+    ) -> Job:
+        """Schedule a coroutine as a new job, which is added to the table."""
+        job_id = max(self._jobs, default=0) + 1
+        job = Job(job_id, command_line, coro, max_output_messages=max_output_messages)
+        self._jobs[job_id] = job
+        return job
+
+    def remove(
+        self,
+        job_id: int
+    ) -> Job:
+        """Remove a job from the table, without cancelling it.
+
+        Raises:
+            :class:`NoSuchJobError`: If no job with the specified id exists.
+
+        """
+        job = self[job_id]
+        del self._jobs[job_id]
+        return job
+
+    @property
+    def latest(
+        self
+    ) -> Optional[Job]:
+        """The most recently started job in the table, if any."""
+        if not self._jobs:
+            return None
+
+        return self._jobs[max(self._jobs)]
+
+    @property
+    def running(
+        self
+    ) -> Tuple[Job, ...]:
+        """The jobs in the table that have not finished."""
+        return tuple(job for job in self._jobs.values() if not job.done())
+
+    async def cancel_all(
+        self
+    ) -> None:
+        """Cancel every running job and wait for them to finish."""
+        running = self.running
+        for job in running:
+            job.cancel()
+
+        await asyncio.gather(*(job.wait() for job in running))
+
+    def __getitem__(
+        self,
+        job_id: int
+    ) -> Job:
+        try:
+            return self._jobs[job_id]
+        except KeyError:
+            raise NoSuchJobError(job_id)
+
+    def __contains__(
+        self,
+        job_id: object
+    ) -> bool:
+        return job_id in self._jobs
+
+    def __iter__(
+        self
+    ) -> Iterator[Job]:
+        return iter(tuple(self._jobs.values()))
+
+    def __len__(
+        self
+    ) -> int:
+        return len(self._jobs)
+
+    def __repr__(
+        self
+    ) -> str:
+        return f'<{self.__class__.__qualname__} [{len(self)} jobs]>'
@@ -0,0 +1,187 @@
+"""Enforcement of the concurrency and rate limits of commands."""
+
+import asyncio
+import time
+
+from collections import deque
+from typing import Any, Deque, NamedTuple
+
+from ..commands import CommandLimits, LimitPolicy
+from ..errors import CommandLimitError
+
+
+class CommandLimiterInfo(NamedTuple):
+    """A snapshot of the counters of a :class:`CommandLimiter`."""
+
+    running: int
+    waiting: int
+    peak_running: int
+    admitted: int
+    queued: int
+    rejected: int
+
+
+class CommandLimiter:
+    """Admits the calls of a single command within its :class:`CommandLimits`.
+
+    Concurrency is bounded like a semaphore whose slots are handed directly to waiting
+    calls in arrival order. The rate is bounded by a token bucket, in which a queued
+    call reserves the next token and sleeps until it is due, so that waiting calls are
+    also admitted in arrival order without polling.
+
+    A limiter is entered as an asynchronous context manager around each call. It does
+    not bind itself to an event loop, so a single application may be run by several.
+
+    Raises:
+        :class:`CommandLimitError`: On entry, if the call is over a limit and the
+            policy is :attr:`LimitPolicy.REJECT`.
+
+    """
+
+    def __init__(
+        self,
+        command_name: str,
+        limits: CommandLimits
+    ) -> None:
+        self._command_name = command_name
+        self._limits = limits
+        self._rejects = limits.policy == LimitPolicy.REJECT
+
+        self._running = 0
+        self._slot_waiters: Deque[asyncio.Future] = deque()
+
+        self._tokens = float(limits.rate.burst) if limits.rate is not None else 0.0
+        self._tokens_updated = time.monotonic()
+
+        self._waiting = 0
+        self._peak_running = 0
+        self._admitted = 0
+        self._queued = 0
+        self._rejected = 0
+
+    @property
+    def limits(
+        self
+    ) -> CommandLimits:
+        """The limits enforced by this limiter."""
+        return self._limits
+
+    def _reject(
+        self,
+        limit: str
+    ) -> CommandLimitError:
+        self._rejected += 1
+        return CommandLimitError(self._command_name, limit)
+
+    async def _acquire_slot(
+        self
+    ) -> bool:
+        max_concurrency = self._limits.max_concurrency
+        if (
+            max_concurrency is None or
+            (self._running < max_concurrency and not self._slot_waiters)
+        ):
+            self._running += 1
+            return False
+        elif self._rejects:
+            raise self._reject('concurrency')
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._slot_waiters.append(waiter)
+        self._waiting += 1
+        try:
+            # A releasing call hands its slot over, so the running count is unchanged.
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.cancelled():
+                self._slot_waiters.remove(waiter)
+            else:
+                self._release_slot()
+
+            raise
+        finally:
+            self._waiting -= 1
+
+        return True
+
+    def _release_slot(
+        self
+    ) -> None:
+        while self._slot_waiters:
+            waiter = self._slot_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+        self._running -= 1
+
+    async def _acquire_token(
+        self
+    ) -> bool:
+        rate = self._limits.rate
+        if rate is None:
+            return False
+
+        now = time.monotonic()
+        self._tokens = min(
+            float(rate.burst),
+            self._tokens + (now - self._tokens_updated) * rate.per_second
+        )
+        self._tokens_updated = now
+
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return False
+        elif self._rejects:
+            raise self._reject('rate')
+
+        # Reserve the next token, which is due once the bucket has refilled to zero.
+        self._tokens -= 1
+        self._waiting += 1
+        try:
+            await asyncio.sleep(-self._tokens / rate.per_second)
+        except asyncio.CancelledError:
+            self._tokens += 1
+            raise
+        finally:
+            self._waiting -= 1
+
+        return True
+
+    async def __aenter__(
+        self
+    ) -> None:
+        waited = await self._acquire_slot()
+        try:
+            waited = await self._acquire_token() or waited
+        except BaseException:
+            self._release_slot()
+            raise
+
+        self._admitted += 1
+        self._queued += waited
+        self._peak_running = max(self._peak_running, self._running)
+
+    async def __aexit__(
+        self,
+        *exc_info: Any
+    ) -> None:
+        self._release_slot()
+
+    def info(
+        self
+    ) -> CommandLimiterInfo:
+        """Get a snapshot of the counters of this limiter.
+
+        ``queued`` counts the admitted calls that had to wait for a limit, and
+        ``waiting`` the calls that are waiting right now.
+
+        """
+        return CommandLimiterInfo(
+            running=self._running,
+            waiting=self._waiting,
+            peak_running=self._peak_running,
+            admitted=self._admitted,
+            queued=self._queued,
+            rejected=self._rejected
+        )
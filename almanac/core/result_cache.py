@@ -0,0 +1,150 @@
+"""A bounded, expiring cache of command results."""
+
+import time
+
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, NamedTuple, Optional, Tuple
+
+from ..commands import CachePolicy
+from ..io import BufferedIoContext
+
+
+class ResultCacheInfo(NamedTuple):
+    """A snapshot of the statistics of a :class:`ResultCache`."""
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    entries: int
+    max_entries: int
+    ttl: Optional[float]
+
+
+class CachedResult(NamedTuple):
+    """A memoized command result, along with the output printed while computing it."""
+
+    value: Any
+    output: BufferedIoContext
+    expires_at: float
+
+
+def _hashable(
+    value: Any
+) -> Hashable:
+    # Values are tagged with their types, so that (for instance) 1 and True differ.
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(_hashable(x) for x in value)
+    elif isinstance(value, dict):
+        return type(value), frozenset((k, _hashable(v)) for k, v in value.items())
+    elif isinstance(value, (set, frozenset)):
+        return type(value), frozenset(_hashable(x) for x in value)
+
+    hash(value)
+    return type(value), value
+
+
+def result_cache_key(
+    path: str,
+    arguments: Iterable[Tuple[str, Any]]
+) -> Optional[Hashable]:
+    """Build the key of a command call from its page path and bound arguments.
+
+    Returns:
+        The key, or ``None`` if one of the argument values cannot be hashed (in which
+        case the call cannot be cached).
+
+    """
+    try:
+        return path, tuple((name, _hashable(value)) for name, value in arguments)
+    except TypeError:
+        return None
+
+
+class ResultCache:
+    """A least-recently-used cache of the results of a single command.
+
+    Entries older than the policy's ``ttl`` are treated as missing, and are discarded
+    when they are next looked up.
+
+    """
+
+    def __init__(
+        self,
+        policy: CachePolicy
+    ) -> None:
+        self._policy = policy
+        self._entries: 'OrderedDict[Hashable, CachedResult]' = OrderedDict()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @property
+    def policy(
+        self
+    ) -> CachePolicy:
+        """The policy that bounds this cache."""
+        return self._policy
+
+    def get(
+        self,
+        key: Hashable
+    ) -> Optional[CachedResult]:
+        """Look up the unexpired result of a call, counting a hit or a miss."""
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            self._expirations += 1
+            entry = None
+
+        if entry is None:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def store(
+        self,
+        key: Hashable,
+        value: Any,
+        output: BufferedIoContext
+    ) -> None:
+        """Cache the result of a call, evicting the least recently used if full."""
+        ttl = self._policy.ttl
+        expires_at = float('inf') if ttl is None else time.monotonic() + ttl
+
+        self._entries[key] = CachedResult(value, output, expires_at)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._policy.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def clear(
+        self
+    ) -> None:
+        """Remove every result from the cache, without resetting its statistics."""
+        self._entries.clear()
+
+    def info(
+        self
+    ) -> ResultCacheInfo:
+        """Get a snapshot of the statistics of this cache."""
+        return ResultCacheInfo(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            expirations=self._expirations,
+            entries=len(self._entries),
+            max_entries=self._policy.max_entries,
+            ttl=self._policy.ttl
+        )
+
+    def __len__(
+        self
+    ) -> int:
+        return len(self._entries)
@@ -0,0 +1,371 @@
+"""Utilities for working with scripts of many command lines."""
+
+import asyncio
+import threading
+
+from collections import Counter, deque
+from contextlib import suppress
+from typing import (
+    Any,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Tuple
+)
+
+from ..constants import ExitCodes
+from ..errors import (
+    AlmanacError,
+    BaseArgumentError,
+    BaseParseError,
+    CommandLimitError,
+    CommandTimeoutError,
+    NoSuchCommandError
+)
+from ..parsing import parse_lines, ParsedLine, ParserEngine
+
+
+class ScriptLineError(NamedTuple):
+    """An error found on a line of a script."""
+
+    line_number: int
+    line: str
+    error: AlmanacError
+
+    def __str__(
+        self
+    ) -> str:
+        return f'line {self.line_number}: {self.error}'
+
+
+class ScriptLineResult(NamedTuple):
+    """The exit code of a line executed from a script."""
+
+    line_number: int
+    line: str
+    exit_code: int
+
+
+class ScriptResult(NamedTuple):
+    """The aggregated outcome of running a script.
+
+    ``stopped_early`` is set when lines were left unexecuted, either because a line
+    failed or because a command quit the application. It is not set when the line that
+    failed or quit was the last one, unless the script was read in a thread that had not
+    yet reached its end (see :meth:`ParseAheadReader.has_more_lines`).
+
+    """
+
+    line_results: Tuple[ScriptLineResult, ...]
+    stopped_early: bool
+
+    @property
+    def failures(
+        self
+    ) -> Tuple[ScriptLineResult, ...]:
+        """The results of the executed lines that exited with a non-zero code."""
+        return tuple(x for x in self.line_results if x.exit_code != ExitCodes.OK)
+
+    @property
+    def exit_code(
+        self
+    ) -> int:
+        """The exit code of the first failed line, or ``0`` if no line failed."""
+        for line_result in self.line_results:
+            if line_result.exit_code != ExitCodes.OK:
+                return line_result.exit_code
+
+        return ExitCodes.OK
+
+    @property
+    def exit_code_counts(
+        self
+    ) -> Dict[int, int]:
+        """The number of executed lines that exited with each exit code."""
+        return dict(Counter(x.exit_code for x in self.line_results))
+
+    def __bool__(
+        self
+    ) -> bool:
+        """Whether every executed line of the script succeeded."""
+        return not self.failures
+
+    def __str__(
+        self
+    ) -> str:
+        summary = f'{len(self.line_results)} lines executed, {len(self.failures)} failed'
+        if self.stopped_early:
+            summary += ' (stopped early)'
+
+        return summary
+
+
+def exit_code_for_exception(
+    exc: Exception
+) -> ExitCodes:
+    """Get the exit code of a command line whose evaluation raised an exception."""
+    if isinstance(exc, BaseParseError):
+        return ExitCodes.ERR_COMMAND_PARSING
+    elif isinstance(exc, NoSuchCommandError):
+        return ExitCodes.ERR_COMMAND_NONEXISTENT
+    elif isinstance(exc, BaseArgumentError):
+        return ExitCodes.ERR_COMMAND_INVALID_ARGUMENTS
+    elif isinstance(exc, CommandTimeoutError):
+        return ExitCodes.ERR_COMMAND_TIMEOUT
+    elif isinstance(exc, CommandLimitError):
+        return ExitCodes.ERR_COMMAND_REJECTED
+
+    return ExitCodes.ERR_RUNTIME_EXC
+
+
+def exit_code_for_return_value(
+    value: Any
+) -> int:
+    """Get the exit code of a command line from its command's return value.
+
+    Commands that do not return an integer are considered to have succeeded.
+
+    """
+    if isinstance(value, int):
+        return value
+
+    return ExitCodes.OK
+
+
+class ParseAheadReader:
+    """Parses the lines of a script ahead of their execution, in a background task.
+
+    At most ``max_parse_ahead`` parsed lines are buffered. Once the buffer is full,
+    parsing pauses until the reader has drained it to half of that size, so that the
+    parsing task is resumed once per batch of lines rather than once per line.
+
+    With ``read_in_thread``, the lines are instead read in a daemon thread, so that
+    reading from a slow stream (such as a pipe) never blocks the event loop. Each batch
+    of lines read is parsed as soon as it is handed over, and the thread stops reading
+    while ``max_parse_ahead`` lines are waiting to be parsed. A daemon thread is used
+    rather than the loop's executor, since a read that is still blocked when the reader
+    exits cannot be interrupted, and must not hold up the interpreter's exit.
+
+    The reader must be entered as an asynchronous context manager, which starts the
+    parsing task (and reading thread) and stops it upon exit. Parsed lines are then
+    retrieved by asynchronous iteration. An exception raised while reading the lines is
+    re-raised from the iteration, after the lines parsed before it.
+
+    """
+
+    def __init__(
+        self,
+        lines: Iterable[str],
+        *,
+        parser_engine: ParserEngine = ParserEngine.FAST,
+        max_parse_ahead: int = 64,
+        read_in_thread: bool = False
+    ) -> None:
+        if max_parse_ahead < 1:
+            raise ValueError('max_parse_ahead must be positive')
+
+        self._lines = lines
+        self._parser_engine = parser_engine
+        self._max_parse_ahead = max_parse_ahead
+        self._low_water_mark = max_parse_ahead // 2
+        self._read_in_thread = read_in_thread
+
+        self._buffer: Deque[ParsedLine] = deque()
+        self._has_lines = asyncio.Event()
+        self._has_room = asyncio.Event()
+        self._is_done = False
+        self._exc: Optional[Exception] = None
+        self._task: Optional[asyncio.Future] = None
+
+        # The state shared with the reading thread, if any. Lines are appended to the
+        # deque by the thread and popped by the parsing task.
+        self._unparsed_lines: Deque[str] = deque()
+        self._has_unparsed_lines = asyncio.Event()
+        self._unparsed_room = threading.Semaphore(max_parse_ahead)
+        # Set while the thread has a wakeup of the parsing task scheduled, so that lines
+        # read in quick succession are handed over together.
+        self._wakeup_pending = False
+        self._is_read = False
+        self._read_exc: Optional[Exception] = None
+        self._is_closed = False
+
+    async def _buffer_parsed_lines(
+        self,
+        lines: Iterable[str],
+        *,
+        start: int = 1
+    ) -> None:
+        for parsed_line in parse_lines(
+            lines, parser_engine=self._parser_engine, start=start
+        ):
+            if len(self._buffer) >= self._max_parse_ahead:
+                self._has_room.clear()
+                await self._has_room.wait()
+
+            self._buffer.append(parsed_line)
+            self._has_lines.set()
+
+    async def _parse_ahead(
+        self
+    ) -> None:
+        try:
+            if self._read_in_thread:
+                await self._parse_lines_read_in_thread()
+            else:
+                await self._buffer_parsed_lines(self._lines)
+        except Exception as e:
+            self._exc = e
+        finally:
+            self._is_done = True
+            self._has_lines.set()
+
+    async def _parse_lines_read_in_thread(
+        self
+    ) -> None:
+        num_lines_parsed = 0
+        while True:
+            while not self._unparsed_lines and not self._is_read:
+                # Lets has_more_lines() see that all lines read so far are parsed.
+                self._has_lines.set()
+
+                self._has_unparsed_lines.clear()
+                await self._has_unparsed_lines.wait()
+
+            if not self._unparsed_lines:
+                break
+
+            # Only lines present up front are popped, since the thread may keep
+            # appending.
+            batch = [
+                self._unparsed_lines.popleft()
+                for _ in range(len(self._unparsed_lines))
+            ]
+            for _ in batch:
+                self._unparsed_room.release()
+
+            await self._buffer_parsed_lines(batch, start=num_lines_parsed + 1)
+            num_lines_parsed += len(batch)
+
+        if self._read_exc is not None:
+            raise self._read_exc
+
+    def _read_lines(
+        self,
+        loop: asyncio.AbstractEventLoop
+    ) -> None:
+        exc: Optional[Exception] = None
+        try:
+            for line in self._lines:
+                self._unparsed_room.acquire()
+                if self._is_closed:
+                    return
+
+                # Appending to a deque is thread-safe.
+                self._unparsed_lines.append(line)
+                if not self._wakeup_pending:
+                    self._wakeup_pending = True
+                    loop.call_soon_threadsafe(self._wake_up)
+        except Exception as e:
+            exc = e
+
+        # The loop may already be closed, if the reader exited during the last read.
+        with suppress(RuntimeError):
+            if not self._is_closed:
+                loop.call_soon_threadsafe(self._finish_reading, exc)
+
+    def _wake_up(
+        self
+    ) -> None:
+        self._wakeup_pending = False
+        self._has_unparsed_lines.set()
+
+    def _finish_reading(
+        self,
+        exc: Optional[Exception]
+    ) -> None:
+        self._read_exc = exc
+        self._is_read = True
+        self._has_unparsed_lines.set()
+
+    async def __aenter__(
+        self
+    ) -> 'ParseAheadReader':
+        if self._read_in_thread:
+            threading.Thread(
+                target=self._read_lines, args=(asyncio.get_running_loop(),), daemon=True
+            ).start()
+
+        self._task = asyncio.ensure_future(self._parse_ahead())
+        return self
+
+    async def __aexit__(
+        self,
+        *exc_info: Any
+    ) -> None:
+        # Lets a reading thread that is waiting for room stop.
+        self._is_closed = True
+        self._unparsed_room.release()
+
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _wait_for_line(
+        self
+    ) -> None:
+        while not self._buffer and not self._is_done:
+            self._has_lines.clear()
+            await self._has_lines.wait()
+
+    async def has_more_lines(
+        self
+    ) -> bool:
+        """Whether the iteration has another line to return (or error to raise).
+
+        This waits for the next line to be parsed. With ``read_in_thread``, it does not
+        wait for a line that is still being read, which is assumed to be there, since
+        the stream it is read from may stay open indefinitely.
+
+        """
+        while not self._buffer and not self._is_done:
+            if (
+                self._read_in_thread and
+                not self._unparsed_lines and
+                not self._is_read
+            ):
+                return True
+
+            self._has_lines.clear()
+            await self._has_lines.wait()
+
+        return bool(self._buffer) or self._exc is not None
+
+    def __aiter__(
+        self
+    ) -> AsyncIterator[ParsedLine]:
+        return self
+
+    async def __anext__(
+        self
+    ) -> ParsedLine:
+        await self._wait_for_line()
+        if not self._buffer:
+            if self._exc is not None:
+                exc, self._exc = self._exc, None
+                raise exc
+
+            raise StopAsyncIteration
+
+        parsed_line = self._buffer.popleft()
+        if len(self._buffer) <= self._low_water_mark:
+            self._has_room.set()
+
+        return parsed_line
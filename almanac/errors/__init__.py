@@ -3,6 +3,7 @@ from .argument_errors import *  # noqa
 from .command_errors import *  # noqa
 from .configuration_errors import *  # noqa
 from .generic_errors import *  # noqa
+from .job_errors import *  # noqa
 from .page_errors import *  # noqa
 from .parsing_errors import *  # noqa
 from .runtime_errors import *  # noqa
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import inspect
 
-from typing import Any, Dict, Iterable, Tuple
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 from .almanac_error import AlmanacError
 from .generic_errors import AlmanacKeyError
@@ -81,7 +81,8 @@ class NoSuchArgumentError(BaseArgumentError, AlmanacKeyError):
 
     def __init__(
         self,
-        *names: str
+        *names: str,
+        command_name: Optional[str] = None
     ) -> None:
         if not names:
             msg = 'No such argument with specified name.'
@@ -95,6 +96,7 @@ class NoSuchArgumentError(BaseArgumentError, AlmanacKeyError):
 
         super().__init__(msg)
         self._names = names
+        self._command_name = command_name
 
     @property
     def names(
@@ -103,6 +105,13 @@ class NoSuchArgumentError(BaseArgumentError, AlmanacKeyError):
         """A tuple of the argument names that triggered this error."""
         return self._names
 
+    @property
+    def command_name(
+        self
+    ) -> Optional[str]:
+        """The name of the command whose arguments were searched, if known."""
+        return self._command_name
+
 
 class TooManyPositionalArgumentsError(BaseArgumentError):
     """An exception type for when too many positional arguments are specified."""
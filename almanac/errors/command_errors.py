@@ -70,3 +70,57 @@ class NoSuchCommandError(BaseCommandError, BaseConfigurationError, AlmanacKeyErr
     ) -> Tuple[str, ...]:
         """A tuple of the command names that spawned this error."""
         return self._names
+
+
+class CommandTimeoutError(BaseCommandError):
+    """An exception type for commands that were cancelled for exceeding a timeout."""
+
+    def __init__(
+        self,
+        command_name: str,
+        timeout: float
+    ) -> None:
+        super().__init__(f'Command {command_name} timed out after {timeout:g} seconds.')
+        self._command_name = command_name
+        self._timeout = timeout
+
+    @property
+    def command_name(
+        self
+    ) -> str:
+        """The name of the command that timed out."""
+        return self._command_name
+
+    @property
+    def timeout(
+        self
+    ) -> float:
+        """The timeout, in seconds, that the command exceeded."""
+        return self._timeout
+
+
+class CommandLimitError(BaseCommandError):
+    """An exception type for calls rejected for exceeding a command's limits."""
+
+    def __init__(
+        self,
+        command_name: str,
+        limit: str
+    ) -> None:
+        super().__init__(f'Command {command_name} rejected, as it is over its {limit} limit.')
+        self._command_name = command_name
+        self._limit = limit
+
+    @property
+    def command_name(
+        self
+    ) -> str:
+        """The name of the command whose call was rejected."""
+        return self._command_name
+
+    @property
+    def limit(
+        self
+    ) -> str:
+        """The kind of limit that was exceeded, either ``concurrency`` or ``rate``."""
+        return self._limit
@@ -0,0 +1,24 @@
+from .almanac_error import AlmanacError
+from .generic_errors import AlmanacKeyError
+
+
+class BaseJobError(AlmanacError):
+    """The base exception type for errors involving background jobs."""
+
+
+class NoSuchJobError(BaseJobError, AlmanacKeyError):
+    """An exception type for lookups of non-existent background jobs."""
+
+    def __init__(
+        self,
+        job_id: int
+    ) -> None:
+        super().__init__(f'No such job with id {job_id}.')
+        self._job_id = job_id
+
+    @property
+    def job_id(
+        self
+    ) -> int:
+        """The job id that spawned this error."""
+        return self._job_id
@@ -1,4 +1,4 @@
-import pyparsing as pp
+from typing import Any
 
 from .almanac_error import AlmanacError
 from .generic_errors import PositionalValueError
@@ -15,7 +15,7 @@ class PartialParseError(BaseParseError, PositionalValueError):
         self,
         msg: str,
         remaining: str,
-        partial_result: pp.ParseResults,
+        partial_result: Any,
         col: int,
     ) -> None:
         super().__init__(msg, col-1)
@@ -1,4 +1,10 @@
 from .assertions import assert_async_callback, assert_sync_callback  # noqa
+from .command_hooks import (  # noqa
+    CommandHook,
+    compile_hook_chain,
+    HookChain,
+    HookMode
+)
 from .exception_hook_dispatch_table import (  # noqa
     AsyncExceptionHookCallback,
     ExceptionHookDispatchTable
@@ -0,0 +1,102 @@
+"""Compilation of the hooks that run before and after a command."""
+
+import asyncio
+import inspect
+
+from enum import auto, Enum
+from typing import Awaitable, Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .types import AsyncHookCallback
+from ..errors import NoSuchArgumentError
+
+
+class HookMode(Enum):
+    """How a command hook is run relative to the other hooks of the same command."""
+
+    CONCURRENT = auto()
+    """Run together with the adjacent concurrent hooks, via :func:`asyncio.gather`."""
+
+    SEQUENTIAL = auto()
+    """Run on its own, after the preceding hooks have finished."""
+
+    PIPELINE = auto()
+    """Run like a sequential hook, but able to replace argument values.
+
+    The hook may return a mapping of parameter names to new values, which are passed to
+    the following hooks and (for before hooks) to the command itself.
+
+    """
+
+
+class CommandHook(NamedTuple):
+    """A callback registered to run before or after a command."""
+
+    callback: AsyncHookCallback
+    mode: HookMode = HookMode.CONCURRENT
+
+
+# A compiled sequence of hooks, called with the command's bound arguments.
+HookChain = Callable[[inspect.BoundArguments], Awaitable[None]]
+
+_HookStep = Tuple[HookMode, Tuple[AsyncHookCallback, ...]]
+
+
+def _compile_steps(
+    hooks: Sequence[CommandHook]
+) -> List[_HookStep]:
+    # Adjacent concurrent hooks are grouped into a single gathered step.
+    steps: List[_HookStep] = []
+    for hook in hooks:
+        if (
+            hook.mode == HookMode.CONCURRENT and
+            steps and
+            steps[-1][0] == HookMode.CONCURRENT
+        ):
+            steps[-1] = (HookMode.CONCURRENT, steps[-1][1] + (hook.callback,))
+        else:
+            steps.append((hook.mode, (hook.callback,)))
+
+    return steps
+
+
+def compile_hook_chain(
+    hooks: Sequence[CommandHook],
+    *,
+    command_name: str
+) -> Optional[HookChain]:
+    """Compile a command's hooks, in registration order, into a single coroutine.
+
+    Returns:
+        The compiled chain, or ``None`` if there are no hooks, so that callers can skip
+        hook dispatch entirely.
+
+    Raises:
+        :class:`NoSuchArgumentError`: From the compiled chain, if a pipeline hook
+            returns a value for a parameter that the command does not have.
+
+    """
+    if not hooks:
+        return None
+
+    steps = _compile_steps(hooks)
+
+    async def run_chain(
+        bound_args: inspect.BoundArguments
+    ) -> None:
+        for mode, callbacks in steps:
+            args, kwargs = bound_args.args, bound_args.kwargs
+
+            if len(callbacks) > 1:
+                await asyncio.gather(*(callback(*args, **kwargs) for callback in callbacks))
+                continue
+
+            result = await callbacks[0](*args, **kwargs)
+            if mode == HookMode.PIPELINE and result is not None:
+                parameters = bound_args.signature.parameters
+                unknown_names = [name for name in result if name not in parameters]
+                if unknown_names:
+                    raise NoSuchArgumentError(*unknown_names, command_name=command_name)
+
+                bound_args.arguments.update(result)
+
+    return run_chain
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Callable, List, TYPE_CHECKING, Union
 
 from .assertions import assert_async_callback
+from .command_hooks import HookMode
 from .exception_hook_dispatch_table import ExceptionHookDispatchTable
 from .types import AsyncHookCallback
 from ..errors import InvalidCallbackTypeError, NoSuchCommandError
@@ -16,7 +17,8 @@ class HookProxy:
     """A simple proxy for hooking events.
 
     Command hook callbacks will be called with the same arguments as the command that
-    they are hooking.
+    they are hooking. By default, the hooks of a command are run concurrently; see
+    :class:`HookMode` for the alternatives.
 
     Exception hook callbacks will be called with the raised exception.
 
@@ -44,7 +46,8 @@ class HookProxy:
 
     def before(
         self,
-        *command_names: Union[str, FrozenCommand]
+        *command_names: Union[str, FrozenCommand],
+        mode: HookMode = HookMode.CONCURRENT
     ) -> Callable[[AsyncHookCallback], AsyncHookCallback]:
         """A decorator to add a callback to fire before commands execute."""
         frozen_commands = self._resolved_commands(*command_names)
@@ -58,14 +61,15 @@ class HookProxy:
                 raise e
 
             for command in frozen_commands:
-                self.command_engine.add_before_command_callback(command, hook_coro)
+                self.command_engine.add_before_command_callback(command, hook_coro, mode=mode)
             return hook_coro
 
         return decorator
 
     def after(
         self,
-        *command_names: Union[str, FrozenCommand]
+        *command_names: Union[str, FrozenCommand],
+        mode: HookMode = HookMode.CONCURRENT
     ) -> Callable[[AsyncHookCallback], AsyncHookCallback]:
         """A decorator to add a callback to fire after commands execute."""
         frozen_commands = self._resolved_commands(*command_names)
@@ -79,7 +83,7 @@ class HookProxy:
                 raise e
 
             for command in frozen_commands:
-                self.command_engine.add_after_command_callback(command, hook_coro)
+                self.command_engine.add_after_command_callback(command, hook_coro, mode=mode)
             return hook_coro
 
         return decorator
@@ -91,7 +95,7 @@ class HookProxy:
         nonexistent_command_names = [
             name_or_cmd for name_or_cmd in commands
             if isinstance(name_or_cmd, str) and
-            name_or_cmd not in self._app.command_engine.keys()
+            name_or_cmd not in self._app.command_engine
         ]
 
         if nonexistent_command_names:
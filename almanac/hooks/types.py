@@ -1,6 +1,7 @@
-from typing import Any, Callable, Coroutine, Protocol, TypeVar, Union
+from typing import Any, Callable, Coroutine, Protocol, TYPE_CHECKING, TypeVar, Union
 
-from prompt_toolkit.formatted_text import FormattedText
+if TYPE_CHECKING:
+    from prompt_toolkit.formatted_text import FormattedText
 
 
 # In the future, would like to make AsyncHookCallback a generic protocol-based type. In
@@ -35,4 +36,4 @@ class AsyncExceptionHookCallback(Protocol):
         ...
 
 
-PromptCallback = SyncNoArgsCallback[Union[str, FormattedText]]
+PromptCallback = SyncNoArgsCallback[Union[str, 'FormattedText']]
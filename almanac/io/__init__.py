@@ -1,3 +1,5 @@
 from .abstract_io_context import AbstractIoContext  # noqa
+from .buffered_io_context import BufferedIoContext, BufferedMessage  # noqa
 from .null_io_context import NullIoContext  # noqa
 from .standard_console_io_context import StandardConsoleIoContext  # noqa
+from .streams import is_interactive_stream  # noqa
@@ -0,0 +1,110 @@
+"""Implementation of the ``BufferedIoContext`` class."""
+
+from collections import deque
+from typing import Any, Deque, Dict, NamedTuple, Optional, Tuple
+
+from .abstract_io_context import AbstractIoContext
+
+
+class BufferedMessage(NamedTuple):
+    """A message printed to a :class:`BufferedIoContext`.
+
+    ``kind`` is the name of the printing method that was called (such as ``info``).
+
+    """
+
+    kind: str
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
+
+
+class BufferedIoContext(AbstractIoContext):
+    """An input/output context that records printed messages, to be replayed later.
+
+    Args:
+        max_messages: The maximum number of messages to keep. Once it is reached, the
+            oldest messages are discarded. By default, every message is kept.
+        forward_to: Another context to which messages are also printed, as they are
+            recorded.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        max_messages: Optional[int] = None,
+        forward_to: Optional[AbstractIoContext] = None
+    ) -> None:
+        self._messages: Deque[BufferedMessage] = deque(maxlen=max_messages)
+        self._forward_to = forward_to
+
+    def _record(
+        self,
+        kind: str,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any]
+    ) -> None:
+        self._messages.append(BufferedMessage(kind, args, kwargs))
+        if self._forward_to is not None:
+            getattr(self._forward_to, kind)(*args, **kwargs)
+
+    @property
+    def messages(
+        self
+    ) -> Tuple[BufferedMessage, ...]:
+        """The recorded messages, oldest first."""
+        return tuple(self._messages)
+
+    def replay(
+        self,
+        io_context: AbstractIoContext
+    ) -> None:
+        """Print the recorded messages, in order, to another input/output context."""
+        for message in tuple(self._messages):
+            getattr(io_context, message.kind)(*message.args, **message.kwargs)
+
+    def clear(
+        self
+    ) -> None:
+        """Discard the recorded messages."""
+        self._messages.clear()
+
+    def __len__(
+        self
+    ) -> int:
+        return len(self._messages)
+
+    def info(
+        self,
+        *args: Any,
+        **kwargs: Any
+    ) -> None:
+        self._record('info', args, kwargs)
+
+    def warn(
+        self,
+        *args: Any,
+        **kwargs: Any
+    ) -> None:
+        self._record('warn', args, kwargs)
+
+    def error(
+        self,
+        *args: Any,
+        **kwargs: Any
+    ) -> None:
+        self._record('error', args, kwargs)
+
+    def raw(
+        self,
+        *args,
+        **kwargs
+    ) -> None:
+        self._record('raw', args, kwargs)
+
+    def ansi(
+        self,
+        *args,
+        **kwargs
+    ) -> None:
+        self._record('ansi', args, kwargs)
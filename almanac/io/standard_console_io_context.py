@@ -1,18 +1,22 @@
 from typing import Any
 
-from prompt_toolkit import ANSI, HTML, print_formatted_text
-
 from .abstract_io_context import AbstractIoContext
 
 
 class StandardConsoleIoContext(AbstractIoContext):
-    """An input/output context for printing information to the console."""
+    """An input/output context for printing information to the console.
+
+    prompt_toolkit is only imported once something is printed, so that importing
+    almanac does not load it.
+
+    """
 
     def info(
         self,
         *args: Any,
         **kwargs: Any
     ) -> None:
+        from prompt_toolkit import HTML, print_formatted_text
         print_formatted_text(HTML('<ansicyan>[*]</ansicyan>'), *args, **kwargs)
 
     def warn(
@@ -20,6 +24,7 @@ class StandardConsoleIoContext(AbstractIoContext):
         *args: Any,
         **kwargs: Any
     ) -> None:
+        from prompt_toolkit import HTML, print_formatted_text
         print_formatted_text(HTML('<ansiyellow>[!]</ansiyellow>'), *args, **kwargs)
 
     def error(
@@ -27,6 +32,7 @@ class StandardConsoleIoContext(AbstractIoContext):
         *args: Any,
         **kwargs: Any
     ) -> None:
+        from prompt_toolkit import HTML, print_formatted_text
         print_formatted_text(HTML('<ansired>[!]</ansired>'), *args, **kwargs)
 
     def raw(
@@ -34,6 +40,7 @@ class StandardConsoleIoContext(AbstractIoContext):
         *args,
         **kwargs
     ) -> None:
+        from prompt_toolkit import print_formatted_text
         print_formatted_text(*args, **kwargs)
 
     def ansi(
@@ -41,5 +48,6 @@ class StandardConsoleIoContext(AbstractIoContext):
         *args,
         **kwargs
     ) -> None:
+        from prompt_toolkit import ANSI, print_formatted_text
         ansi_args = iter(ANSI(arg) for arg in args)
         print_formatted_text(*ansi_args, **kwargs)
@@ -0,0 +1,20 @@
+"""Utilities for inspecting input and output streams."""
+
+from typing import IO, Optional
+
+
+def is_interactive_stream(
+    stream: Optional[IO]
+) -> bool:
+    """Whether a stream is attached to an interactive terminal.
+
+    Missing (``None``) and closed streams are not interactive.
+
+    """
+    if stream is None:
+        return False
+
+    try:
+        return stream.isatty()
+    except (AttributeError, ValueError):
+        return False
@@ -1,10 +1,56 @@
-from .lexer import get_lexer_cls_for_app  # noqa
+from importlib import import_module
+from typing import Any, Dict, TYPE_CHECKING
+
+from .argv import parse_argv  # noqa
+from .batch import is_ignored_script_line, parse_lines, ParsedLine  # noqa
+from .engines import (  # noqa
+    get_parse_func_for_engine,
+    get_session_parse_func_for_engine,
+    ParseFunction,
+    ParserEngine
+)
+from .fast_parser import fast_parse_cmd_line, IncrementalParser  # noqa
+from .parse_cache import ParseCache, ParseCacheInfo  # noqa
+from .parsed_command_line import (  # noqa
+    KwargSpans,
+    make_parsed_command_line,
+    ParsedCommandLine,
+    Span,
+    tab_expansion_offsets,
+    Token,
+    TokenKind
+)
 from .parsing import (  # noqa
+    incomplete_token_at_cursor,
     IncompleteToken,
     last_incomplete_token,
     last_incomplete_token_from_document,
     parse_cmd_line,
     ParseState,
     ParseStatus,
-    Patterns
+    Patterns,
+    results_or_raise,
+    split_background_marker
 )
+
+if TYPE_CHECKING:
+    from .lexer import CommandLineLexer, get_lexer_cls_for_app  # noqa
+
+# The lexer is built on prompt_toolkit and pygments, so it is only imported when one of
+# its names is first accessed (per PEP 562).
+_LAZY_EXPORTS: Dict[str, str] = {
+    'CommandLineLexer': '.lexer',
+    'get_lexer_cls_for_app': '.lexer',
+}
+
+
+def __getattr__(
+    name: str
+) -> Any:
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,87 @@
+"""Parsing of command lines that have already been split into arguments."""
+
+import re
+
+from typing import Any, List, Sequence, Tuple
+
+from .engines import get_parse_func_for_engine, ParseFunction, ParserEngine
+from .parsed_command_line import make_parsed_command_line, ParsedCommandLine
+from .parsing import ParseState, Patterns
+
+_kwarg_arg_re = re.compile(Patterns.IDENTIFIER + '=')
+
+# A placeholder command name, for parsing a lone value with the command line grammar.
+_VALUE_PREFIX = '_ '
+
+
+def _parse_argv_value(
+    text: str,
+    parse_func: ParseFunction
+) -> Any:
+    parse_status = parse_func(_VALUE_PREFIX + text)
+    results = parse_status.results
+    value_span = (len(_VALUE_PREFIX), len(_VALUE_PREFIX) + len(text))
+    if (
+        parse_status.state == ParseState.FULL and
+        results is not None and
+        len(results.positionals) == 1 and
+        not results.kwargs and
+        results.positional_spans[0] == value_span
+    ):
+        return results.positionals[0]
+
+    return text
+
+
+def parse_argv(
+    argv: Sequence[str],
+    *,
+    parser_engine: ParserEngine = ParserEngine.FAST
+) -> ParsedCommandLine:
+    """Map command-line arguments (such as ``sys.argv[1:]``) onto the grammar.
+
+    The first argument is the command name or alias. Each of the remaining arguments is
+    a single positional argument, or a keyword argument if it has the form
+    ``name=value``. Values are parsed as they would be at the prompt, so ``3`` is an
+    integer and ``[1, 2]`` is a list. Since the shell has already removed any quoting,
+    an argument that is not a single value of the grammar (such as one containing
+    spaces) is used verbatim as a string.
+
+    Spans index into the arguments joined by single spaces.
+
+    Raises:
+        ValueError: If ``argv`` is empty.
+
+    """
+    if not argv:
+        raise ValueError('argv must contain a command name')
+
+    parse_func = get_parse_func_for_engine(parser_engine)
+
+    command = argv[0]
+    command_span = (0, len(command))
+    pos = len(command) + 1
+
+    positionals: List[Tuple[Any, Tuple[int, int]]] = []
+    kwargs: List[Tuple[str, Any, Tuple[int, int], Tuple[int, int]]] = []
+    for arg in argv[1:]:
+        match = _kwarg_arg_re.match(arg)
+        if match is None:
+            positionals.append(
+                (_parse_argv_value(arg, parse_func), (pos, pos + len(arg)))
+            )
+        else:
+            name = match.group(1)
+            value_start = pos + match.end()
+            kwargs.append((
+                name,
+                _parse_argv_value(arg[match.end():], parse_func),
+                (pos, pos + len(name)),
+                (value_start, pos + len(arg))
+            ))
+
+        pos += len(arg) + 1
+
+    return make_parsed_command_line(
+        ' '.join(argv), command, command_span, positionals, kwargs
+    )
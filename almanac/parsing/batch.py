@@ -0,0 +1,57 @@
+"""Parsing of many command lines at once, such as the lines of a script."""
+
+from typing import Iterable, Iterator, NamedTuple
+
+from .engines import get_parse_func_for_engine, ParserEngine
+from .parsing import ParseStatus, split_background_marker
+
+
+class ParsedLine(NamedTuple):
+    """The parse of a single line within a batch of lines.
+
+    ``text`` excludes the trailing ``&`` of a line to be run in the background, which
+    is instead recorded by ``in_background``.
+
+    """
+
+    line_number: int
+    text: str
+    status: ParseStatus
+    in_background: bool = False
+
+
+def is_ignored_script_line(
+    text: str
+) -> bool:
+    """Whether a script line is blank or a ``#`` comment, and so has no command."""
+    stripped = text.lstrip()
+    return not stripped or stripped.startswith('#')
+
+
+def parse_lines(
+    lines: Iterable[str],
+    *,
+    parser_engine: ParserEngine = ParserEngine.FAST,
+    start: int = 1
+) -> Iterator[ParsedLine]:
+    """Lazily parse a batch of command lines, such as those read from a file.
+
+    Blank lines and ``#`` comments are skipped, but still counted towards the line
+    numbers of the lines that follow them. Lines are numbered from ``start``, so that a
+    batch continuing an earlier one can keep its numbering. A trailing line terminator on
+    each line is ignored, as is a trailing ``&`` (see
+    :func:`~almanac.parsing.parsing.split_background_marker`).
+
+    Lines are parsed directly with the specified engine's parse function, so a large
+    batch does not flush the interactive lines out of an application's parse cache.
+
+    """
+    parse_func = get_parse_func_for_engine(parser_engine)
+
+    for line_number, text in enumerate(lines, start=start):
+        text = text.rstrip('\r\n')
+        if is_ignored_script_line(text):
+            continue
+
+        text, in_background = split_background_marker(text)
+        yield ParsedLine(line_number, text, parse_func(text), in_background)
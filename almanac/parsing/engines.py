@@ -0,0 +1,54 @@
+"""Selection of the implementation used to parse command lines."""
+
+from enum import auto, Enum
+from typing import Callable, Dict
+
+from .fast_parser import fast_parse_cmd_line, IncrementalParser
+from .parsing import parse_cmd_line, ParseStatus
+
+ParseFunction = Callable[[str], ParseStatus]
+
+
+class ParserEngine(Enum):
+    """The available command line parser implementations.
+
+    Both engines accept the same grammar and produce equivalent
+    :class:`~almanac.parsing.parsing.ParseStatus` results.
+
+    * ``FAST``: A hand-written, single-pass parser. This is the default.
+    * ``PYPARSING``: The reference grammar, implemented with pyparsing.
+
+    """
+
+    FAST = auto()
+    PYPARSING = auto()
+
+
+_PARSE_FUNCTIONS: Dict[ParserEngine, ParseFunction] = {
+    ParserEngine.FAST: fast_parse_cmd_line,
+    ParserEngine.PYPARSING: parse_cmd_line,
+}
+
+
+def get_parse_func_for_engine(
+    engine: ParserEngine
+) -> ParseFunction:
+    """Get the command line parsing function for a parser engine."""
+    return _PARSE_FUNCTIONS[engine]
+
+
+def get_session_parse_func_for_engine(
+    engine: ParserEngine
+) -> ParseFunction:
+    """Get a command line parsing function for use by a single prompt session.
+
+    Unlike the function returned by :func:`get_parse_func_for_engine`, the returned
+    function may keep state between calls. For the ``FAST`` engine, this is the
+    ``parse`` method of a new :class:`~almanac.parsing.fast_parser.IncrementalParser`,
+    which re-uses the work of parsing the previous line while the user types.
+
+    """
+    if engine == ParserEngine.FAST:
+        return IncrementalParser().parse
+
+    return get_parse_func_for_engine(engine)
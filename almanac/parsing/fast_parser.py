@@ -0,0 +1,458 @@
+"""A hand-written, single-pass implementation of the command line grammar.
+
+The functions in this module accept exactly the same language as the pyparsing
+grammar defined in :mod:`almanac.parsing.grammar`, including its quirks, but avoid the
+overhead of pyparsing's generic matching machinery. Each grammar element has a
+corresponding ``_parse_*`` function, which either returns a ``(value, end_pos)`` tuple
+or ``None`` if the element could not be matched at the specified position.
+
+"""
+
+import re
+
+from bisect import bisect_right
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .parsed_command_line import make_parsed_command_line, ParsedCommandLine
+from .parsing import (
+    make_parse_status,
+    ParseState,
+    ParseStatus,
+    Patterns,
+    results_or_raise
+)
+
+# The whitespace characters that pyparsing skips between grammar elements.
+_WHITESPACE = ' \n\t\r'
+
+_identifier_re = re.compile(r'[a-zA-Z_\-][a-zA-Z0-9_\-]*')
+_unquoted_string_re = re.compile(
+    r'[a-zA-Z0-9' + re.escape(Patterns.ALLOWED_SYMBOLS_IN_STRING) + r']+'
+)
+_float_re = re.compile(Patterns.FLOAT)
+_int_re = re.compile(Patterns.INTEGER)
+
+# These mirror pyparsing's quotedString, minus the closing quote character.
+_dbl_quoted_string_re = re.compile(
+    r'"(?:[^"\n\r\\]|(?:"")|(?:\\(?:[^x]|x[0-9a-fA-F]+)))*'
+)
+_sgl_quoted_string_re = re.compile(
+    r"'(?:[^'\n\r\\]|(?:'')|(?:\\(?:[^x]|x[0-9a-fA-F]+)))*"
+)
+
+_Match = Optional[Tuple[Any, int]]
+
+# A positional argument's value and span.
+_Positional = Tuple[Any, Tuple[int, int]]
+
+# A keyword argument's name, value, name span, and value span.
+_Kwarg = Tuple[str, Any, Tuple[int, int], Tuple[int, int]]
+
+
+def _skip_whitespace(
+    text: str,
+    pos: int,
+    n: int
+) -> int:
+    while pos < n and text[pos] in _WHITESPACE:
+        pos += 1
+
+    return pos
+
+
+def _parse_string(
+    text: str,
+    pos: int,
+    n: int
+) -> _Match:
+    """Match a quoted or unquoted string."""
+    c = text[pos]
+    if c == '"' or c == "'":
+        regex = _dbl_quoted_string_re if c == '"' else _sgl_quoted_string_re
+        match = regex.match(text, pos)
+        if match is None:
+            return None
+
+        end = match.end()
+        if end < n and text[end] == c:
+            return text[pos:end+1].strip('"\''), end + 1
+
+        return None
+
+    match = _unquoted_string_re.match(text, pos)
+    if match is None:
+        return None
+
+    return match.group(), match.end()
+
+
+def _parse_single_value(
+    text: str,
+    pos: int,
+    n: int
+) -> _Match:
+    """Match a boolean, float, integer, or string value (in that order)."""
+    if pos >= n:
+        return None
+
+    c = text[pos]
+    if c == 'T' or c == 't':
+        if text.startswith('rue', pos + 1):
+            return True, pos + 4
+    elif c == 'F' or c == 'f':
+        if text.startswith('alse', pos + 1):
+            return False, pos + 5
+    elif c == '-' or c.isdecimal():
+        match = _float_re.match(text, pos)
+        if match is not None:
+            return float(match.group()), match.end()
+
+        match = _int_re.match(text, pos)
+        if match is not None:
+            return int(match.group()), match.end()
+
+    return _parse_string(text, pos, n)
+
+
+def _parse_list_value(
+    text: str,
+    pos: int,
+    n: int
+) -> _Match:
+    """Match a bracket-enclosed, comma-delimited list of single values."""
+    items: List[Any] = []
+
+    pos = _skip_whitespace(text, pos + 1, n)
+    match = _parse_single_value(text, pos, n)
+    if match is not None:
+        value, pos = match
+        items.append(value)
+
+        while True:
+            delim_pos = _skip_whitespace(text, pos, n)
+            if delim_pos >= n or text[delim_pos] != ',':
+                break
+
+            match = _parse_single_value(
+                text, _skip_whitespace(text, delim_pos + 1, n), n
+            )
+            if match is None:
+                break
+
+            value, pos = match
+            items.append(value)
+
+    pos = _skip_whitespace(text, pos, n)
+    if pos < n and text[pos] == ']':
+        return items, pos + 1
+
+    return None
+
+
+def _parse_dict_entries(
+    text: str,
+    pos: int,
+    n: int,
+    entries: Dict[str, Any]
+) -> Optional[int]:
+    """Match one or more key:value pairs, storing them in ``entries``.
+
+    Returns:
+        The end position of the last matched pair, or ``None`` if no pairs could be
+        matched.
+
+    """
+    end: Optional[int] = None
+
+    while pos < n:
+        match = _parse_string(text, pos, n)
+        if match is None:
+            break
+
+        key, key_end = match
+        colon_pos = _skip_whitespace(text, key_end, n)
+        if colon_pos >= n or text[colon_pos] != ':':
+            break
+
+        match = _parse_value(text, _skip_whitespace(text, colon_pos + 1, n), n)
+        if match is None:
+            break
+
+        value, end = match
+        entries[key] = value
+        pos = _skip_whitespace(text, end, n)
+
+    return end
+
+
+def _parse_dict_value(
+    text: str,
+    pos: int,
+    n: int
+) -> _Match:
+    """Match a brace-enclosed collection of key:value pairs."""
+    entries: Dict[str, Any] = {}
+
+    end = _parse_dict_entries(text, _skip_whitespace(text, pos + 1, n), n, entries)
+    if end is None:
+        return None
+
+    pos = end
+    while True:
+        delim_pos = _skip_whitespace(text, pos, n)
+        if delim_pos >= n or text[delim_pos] != ',':
+            break
+
+        end = _parse_dict_entries(
+            text, _skip_whitespace(text, delim_pos + 1, n), n, entries
+        )
+        if end is None:
+            break
+
+        pos = end
+
+    pos = _skip_whitespace(text, pos, n)
+    if pos < n and text[pos] == '}':
+        return entries, pos + 1
+
+    return None
+
+
+def _parse_value(
+    text: str,
+    pos: int,
+    n: int
+) -> _Match:
+    """Match a list, dict, or single value.
+
+    The grammar takes the longest of these alternatives, but they can always be
+    distinguished by their first character.
+
+    """
+    if pos >= n:
+        return None
+
+    c = text[pos]
+    if c == '[':
+        return _parse_list_value(text, pos, n)
+    elif c == '{':
+        return _parse_dict_value(text, pos, n)
+
+    return _parse_single_value(text, pos, n)
+
+
+class _Scan(NamedTuple):
+    """The raw outcome of scanning a command line, used to resume later scans.
+
+    Checkpoints are ``(pos, in_kwargs, num_positionals, num_kwargs)`` tuples that
+    record the scanner's state at the start of each argument. A checkpoint may only be
+    reused for a new line of text if that text begins with the same first
+    ``stable_lens[i]`` characters, which covers every character that was examined in
+    order to reach the checkpoint.
+
+    """
+
+    text: str
+    command: Optional[str]
+    command_span: Tuple[int, int]
+    positionals: List[_Positional]
+    kwargs: List[_Kwarg]
+    end_pos: int
+    checkpoints: List[Tuple[int, bool, int, int]]
+    stable_lens: List[int]
+
+
+def _common_prefix_len(
+    a: str,
+    b: str
+) -> int:
+    if b.startswith(a):
+        return len(a)
+    elif a.startswith(b):
+        return len(b)
+
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+
+    return lo
+
+
+def _scan(
+    text: str,
+    previous: Optional[_Scan] = None
+) -> _Scan:
+    """Scan a (tab-expanded) command line, resuming from a previous scan if possible."""
+    n = len(text)
+
+    resume_idx = -1
+    if previous is not None and previous.stable_lens:
+        common_len = _common_prefix_len(previous.text, text)
+        resume_idx = bisect_right(previous.stable_lens, common_len) - 1
+
+    if previous is not None and resume_idx >= 0:
+        command = previous.command
+        command_span = previous.command_span
+        pos, in_kwargs, num_positionals, num_kwargs = previous.checkpoints[resume_idx]
+        positionals = previous.positionals[:num_positionals]
+        kwargs = previous.kwargs[:num_kwargs]
+        checkpoints = previous.checkpoints[:resume_idx+1]
+        stable_lens = previous.stable_lens[:resume_idx+1]
+    else:
+        pos = _skip_whitespace(text, 0, n)
+        match = _identifier_re.match(text, pos)
+        if match is None:
+            return _Scan(text, None, (pos, pos), [], [], pos, [], [])
+
+        command = match.group()
+        command_span = match.span()
+        pos = match.end()
+        in_kwargs = False
+        positionals = []
+        kwargs = []
+        checkpoints = [(pos, False, 0, 0)]
+        stable_lens = [pos + 1]
+
+    # Positional values must be followed by whitespace or the end of the line.
+    while not in_kwargs:
+        value_pos = _skip_whitespace(text, pos, n)
+        value_match = _parse_value(text, value_pos, n)
+        if value_match is None:
+            break
+
+        value, end = value_match
+        if end < n and text[end] not in _WHITESPACE:
+            break
+
+        positionals.append((value, (value_pos, end)))
+        pos = end + 1
+        checkpoints.append((pos, False, len(positionals), 0))
+        stable_lens.append(pos)
+
+    # Keyword values can be followed by anything, and values like 1.5e1 may require
+    # looking two characters past the end of a value to know where it stops.
+    while True:
+        key_pos = _skip_whitespace(text, pos, n)
+        match = _identifier_re.match(text, key_pos)
+        if match is None:
+            break
+
+        eq_pos = _skip_whitespace(text, match.end(), n)
+        if eq_pos >= n or text[eq_pos] != '=':
+            break
+
+        value_pos = _skip_whitespace(text, eq_pos + 1, n)
+        value_match = _parse_value(text, value_pos, n)
+        if value_match is None:
+            break
+
+        value, pos = value_match
+        kwargs.append((match.group(), value, match.span(), (value_pos, pos)))
+        checkpoints.append((pos, True, len(positionals), len(kwargs)))
+        stable_lens.append(pos + 2)
+
+    return _Scan(
+        text,
+        command,
+        command_span,
+        positionals,
+        kwargs,
+        min(pos, n),
+        checkpoints,
+        stable_lens
+    )
+
+
+def _status_from_scan(
+    scan: _Scan,
+    original_text: str
+) -> ParseStatus:
+    """Convert a scan of a command line into a :class:`ParseStatus`."""
+    if scan.command is None:
+        return ParseStatus(None, original_text, 0, ParseState.NONE)
+
+    results = make_parsed_command_line(
+        original_text, scan.command, scan.command_span, scan.positionals, scan.kwargs
+    )
+    end_loc = _skip_whitespace(scan.text, scan.end_pos, len(scan.text))
+
+    return make_parse_status(results, original_text, scan.text, end_loc)
+
+
+def _expanded(
+    text: str
+) -> str:
+    # pyparsing expands tabs before parsing, which affects reported error columns.
+    return text.expandtabs() if '\t' in text else text
+
+
+def fast_parse_cmd_line(
+    text: str
+) -> ParseStatus:
+    """Attempt to parse a command line, returning a :class:`ParseStatus` object.
+
+    This is a drop-in replacement for
+    :func:`~almanac.parsing.parsing.parse_cmd_line`.
+
+    """
+    return _status_from_scan(_scan(_expanded(text)), text)
+
+
+def _raw_fast_parse_cmd_line(
+    text: str
+) -> ParsedCommandLine:
+    """Attempt to parse the command line in a single pass.
+
+    Raises:
+        :class:`PartialParseError`: If the specified text can be partially
+            parsed, but errors still exist.
+        :class:`TotalParseError`: If the text cannot even be partially parsed.
+
+    """
+    results: ParsedCommandLine = results_or_raise(fast_parse_cmd_line(text))
+    return results
+
+
+class IncrementalParser:
+    """A parser for successive edits of the same command line.
+
+    Each parse remembers where every argument of the line began. When the next line
+    to parse shares a prefix with the previous one (as it does when the user is typing
+    or editing the tail of a line), scanning resumes from the last argument boundary
+    that is unaffected by the edit, so the cost of a parse is proportional to the
+    edited portion of the line rather than its full length.
+
+    Results are identical to those of :func:`fast_parse_cmd_line`.
+
+    """
+
+    def __init__(
+        self
+    ) -> None:
+        self._previous: Optional[Tuple[str, ParseStatus, _Scan]] = None
+
+    def parse(
+        self,
+        text: str
+    ) -> ParseStatus:
+        """Parse a command line, resuming from the previously parsed line."""
+        # Read the previous state once, as completion may parse from another thread.
+        previous = self._previous
+        if previous is not None and previous[0] == text:
+            return previous[1]
+
+        scan = _scan(_expanded(text), None if previous is None else previous[2])
+        status = _status_from_scan(scan, text)
+
+        self._previous = (text, status, scan)
+        return status
+
+    def reset(
+        self
+    ) -> None:
+        """Discard the state of the previously parsed line."""
+        self._previous = None
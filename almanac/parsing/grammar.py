@@ -0,0 +1,177 @@
+# The parsing logic is heavily borrowed from the python-nubia project, available at:
+# https://github.com/facebookincubator/python-nubia
+#
+# In compliance with python-nubia's BSD-style license, its copyright and license terms
+# are included below:
+#
+# BSD License
+#
+# For python-nubia software
+#
+# Copyright (c) Facebook, Inc. and its affiliates. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#  * Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+#  * Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+#  * Neither the name Facebook nor the names of its contributors may be used to
+#    endorse or promote products derived from this software without specific
+#    prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""The pyparsing grammar of command lines.
+
+This is the reference implementation of the command line grammar, used by the
+``PYPARSING`` parser engine. As importing pyparsing and building the grammar is
+relatively slow, this module is only imported when the grammar is first used.
+
+"""
+
+from typing import Any
+
+import pyparsing as pp
+
+from .parsing import Patterns
+
+ParseException = pp.ParseException
+
+
+def _no_transform(x):
+    return x
+
+
+def _bool_transform(x):
+    return x in ('True', 'true',)
+
+
+def _str_transform(x):
+    return x.strip('"\'')
+
+
+_TRANSFORMS = {
+    'bool': _bool_transform,
+    'str': _str_transform,
+    'int': int,
+    'float': float,
+    'dict': dict,
+}
+
+
+def _parse_type(data_type):
+    transform = _TRANSFORMS.get(data_type, _no_transform)
+
+    def _parse(s, loc, toks):
+        return [transform(x) for x in toks]
+
+    return _parse
+
+
+# Valid identifiers cannot start with a number, but may contain them in their body.
+identifier = pp.Word(pp.alphas + '_-', pp.alphanums + '_-')
+
+# XXX: allow for hex?
+int_value = pp.Regex(Patterns.INTEGER).setParseAction(_parse_type('int'))
+
+float_value = pp.Regex(Patterns.FLOAT).setParseAction(_parse_type('float'))
+
+bool_value = (
+    pp.Literal('True') ^ pp.Literal('true') ^
+    pp.Literal('False') ^ pp.Literal('false')
+).setParseAction(_parse_type('bool'))
+
+quoted_string = pp.quotedString.setParseAction(_parse_type('str'))
+
+unquoted_string = pp.Word(
+    pp.alphanums + Patterns.ALLOWED_SYMBOLS_IN_STRING
+).setParseAction(_parse_type('str'))
+
+string_value = quoted_string | unquoted_string
+
+single_value = bool_value | float_value | int_value | string_value
+
+list_value = pp.Group(
+    pp.Suppress('[') +
+    pp.Optional(pp.delimitedList(single_value)) +
+    pp.Suppress(']')
+).setParseAction(_parse_type('list'))
+
+dict_value = pp.Forward()
+
+value = list_value ^ single_value ^ dict_value
+
+dict_key_value = pp.dictOf(string_value + pp.Suppress(':'), value)
+
+dict_value << pp.Group(
+    pp.Suppress('{') + pp.delimitedList(dict_key_value) + pp.Suppress('}')
+).setParseAction(_parse_type('dict'))
+
+
+def _loc_action(s, loc, toks):
+    return [loc]
+
+
+def _start_loc():
+    # Skips leading whitespace, so records where the next element begins.
+    return pp.Empty().setParseAction(_loc_action)
+
+
+def _end_loc():
+    # Does not skip whitespace, so records where the previous element ended.
+    return pp.Empty().leaveWhitespace().setParseAction(_loc_action)
+
+
+def _located(expr):
+    """Group an element's tokens between its start and end locations."""
+    return pp.Group(_start_loc() + expr + _end_loc())
+
+
+# Positionals must be end of line or has a space (or more) afterwards.
+# This is to ensure that the parser treats text like "something=" as invalid
+# instead of parsing this as positional "something" and leaving the "=" as
+# invalid on its own. The whitespace separator must not skip leading whitespace
+# itself, as pyparsing 3 no longer inherits the whitespace settings of White.
+positionals = pp.Group(pp.ZeroOrMore(
+    _located(value) +
+    (pp.StringEnd() ^ pp.Suppress(pp.OneOrMore(pp.White())).leaveWhitespace())
+)).setResultsName('positionals')
+
+key_value = pp.Group(pp.ZeroOrMore(pp.Group(
+    _located(identifier) + pp.Suppress('=') + _located(value)
+))).setResultsName('kv')
+
+command = _located(identifier).setResultsName('command')
+
+command_line = command + positionals + key_value
+
+# Matching this after the command line records where parsing stopped (after skipping
+# any trailing whitespace). This lets a single parse of a line yield both the partial
+# results and the location of the error for lines that cannot be fully parsed.
+command_line_with_end_loc = command_line + _start_loc()
+
+
+def plain_value(
+    value: Any
+) -> Any:
+    """Convert any pyparsing results nested within a parsed value to lists."""
+    if isinstance(value, pp.ParseResults):
+        return [plain_value(x) for x in value]
+    elif isinstance(value, dict):
+        return {k: plain_value(v) for k, v in value.items()}
+
+    return value
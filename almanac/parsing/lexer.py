@@ -2,8 +2,23 @@ from __future__ import annotations
 
 import re
 
-from typing import Iterator, Tuple, Type, TypeVar, TYPE_CHECKING
+from collections import OrderedDict
+from typing import (
+    Callable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    TYPE_CHECKING
+)
 
+from prompt_toolkit.document import Document
+from prompt_toolkit.formatted_text import StyleAndTextTuples
+from prompt_toolkit.formatted_text.utils import split_lines
+from prompt_toolkit.lexers import Lexer
+from prompt_toolkit.styles.pygments import pygments_token_to_classname
 from pygments.lexer import RegexLexer, bygroups
 from pygments.token import (
     Name,
@@ -15,6 +30,7 @@ from pygments.token import (
     String
 )
 
+from .parsed_command_line import ParsedCommandLine, TokenKind
 from .parsing import Patterns
 
 if TYPE_CHECKING:
@@ -51,7 +67,7 @@ def _resolve_command(lexer, match) -> Iterator[Tuple[int, Token, str]]:
     command_engine: CommandEngine = lexer.app.command_engine
     command_name = match.group(0)
 
-    if command_name.strip() in command_engine.keys():
+    if command_name.strip() in command_engine:
         token_type = Name.RealCommand
     else:
         token_type = Name.NonexistentCommand
@@ -62,7 +78,12 @@ def _resolve_command(lexer, match) -> Iterator[Tuple[int, Token, str]]:
 def get_lexer_cls_for_app(
     app: Application
 ) -> Type[RegexLexer]:
-    """Get a lexer class for a specific Application instance."""
+    """Get a Pygments lexer class for a specific Application instance.
+
+    Applications highlight their command lines with a :class:`CommandLineLexer`
+    instead; this lexer is kept for use with Pygments' own highlighting functions.
+
+    """
 
     @_with_app(app)
     class _Lexer(RegexLexer):
@@ -93,3 +114,193 @@ def get_lexer_cls_for_app(
         }
 
     return _Lexer
+
+
+def _style_for(
+    token_type: Token
+) -> str:
+    # Mirror the class names of prompt_toolkit's PygmentsLexer, so existing styles
+    # built with style_from_pygments_dict continue to apply.
+    return f'class:{pygments_token_to_classname(token_type)}'
+
+
+_REAL_COMMAND_STYLE = _style_for(Name.RealCommand)
+_NONEXISTENT_COMMAND_STYLE = _style_for(Name.NonexistentCommand)
+_KWARG_STYLE = _style_for(Name.Kwarg)
+_OPERATOR_STYLE = _style_for(Operator)
+_BOOLEAN_STYLE = _style_for(Keyword.Boolean)
+_INTEGER_STYLE = _style_for(Number.Integer)
+_FLOAT_STYLE = _style_for(Number.Float)
+_SINGLE_QUOTE_STYLE = _style_for(String.SingleQuote)
+_DOUBLE_QUOTE_STYLE = _style_for(String.DoubleQuote)
+_TEXT_STYLE = _style_for(Text)
+
+_value_fragment_re = re.compile(
+    r'(?P<whitespace>\s+)|'
+    r'(?P<dbl_quoted>"(?:[^"\\]|\\.)*"?)|'
+    r"(?P<sgl_quoted>'(?:[^'\\]|\\.)*'?)|"
+    r'(?P<kwarg>[a-zA-Z_\-][a-zA-Z0-9_\-]*)(?P<operator>\s*=)|'
+    r'(?P<word>[a-zA-Z0-9' + re.escape(Patterns.ALLOWED_SYMBOLS_IN_STRING) + r']+)|'
+    r'(?P<other>.)',
+    re.DOTALL
+)
+_boolean_re = re.compile(Patterns.BOOLEAN)
+_float_re = re.compile(Patterns.FLOAT)
+_integer_re = re.compile(Patterns.INTEGER)
+
+
+def _word_style(
+    word: str
+) -> str:
+    if _boolean_re.fullmatch(word):
+        return _BOOLEAN_STYLE
+    elif _integer_re.fullmatch(word):
+        return _INTEGER_STYLE
+    elif _float_re.fullmatch(word):
+        return _FLOAT_STYLE
+
+    return _TEXT_STYLE
+
+
+def _value_fragments(
+    text: str
+) -> StyleAndTextTuples:
+    """Split text that is not a command or keyword name into styled fragments.
+
+    This is used for argument values (including the contents of lists and dicts) and
+    for any trailing text that could not be parsed.
+
+    """
+    fragments: StyleAndTextTuples = []
+
+    for match in _value_fragment_re.finditer(text):
+        kind = match.lastgroup
+        if kind == 'word':
+            fragments.append((_word_style(match.group()), match.group()))
+        elif kind == 'dbl_quoted':
+            fragments.append((_DOUBLE_QUOTE_STYLE, match.group()))
+        elif kind == 'sgl_quoted':
+            fragments.append((_SINGLE_QUOTE_STYLE, match.group()))
+        elif kind == 'operator':
+            fragments.append((_KWARG_STYLE, match.group('kwarg')))
+            fragments.append((_OPERATOR_STYLE, match.group('operator')))
+        else:
+            fragments.append((_TEXT_STYLE, match.group()))
+
+    return fragments
+
+
+def _gap_fragments(
+    text: str
+) -> StyleAndTextTuples:
+    """Style the text between two parsed tokens, such as whitespace or an ``=``."""
+    if not text:
+        return []
+
+    before, eq, after = text.partition('=')
+    if not eq:
+        return [(_TEXT_STYLE, text)]
+
+    return [(_TEXT_STYLE, before), (_OPERATOR_STYLE, eq), (_TEXT_STYLE, after)]
+
+
+def _command_line_fragments(
+    text: str,
+    results: Optional[ParsedCommandLine],
+    command_exists: bool
+) -> StyleAndTextTuples:
+    """Style a command line using the tokens from its parse."""
+    if results is None:
+        return _value_fragments(text)
+
+    fragments: StyleAndTextTuples = []
+
+    pos = 0
+    for token in results.tokens:
+        fragments.extend(_gap_fragments(text[pos:token.start]))
+
+        token_text = text[token.start:token.end]
+        if token.kind == TokenKind.COMMAND:
+            style = _REAL_COMMAND_STYLE if command_exists else _NONEXISTENT_COMMAND_STYLE
+            fragments.append((style, token_text))
+        elif token.kind == TokenKind.KWARG_NAME:
+            fragments.append((_KWARG_STYLE, token_text))
+        else:
+            fragments.extend(_value_fragments(token_text))
+
+        pos = token.end
+
+    fragments.extend(_value_fragments(text[pos:]))
+    return fragments
+
+
+class CommandLineLexer(Lexer):
+    """A prompt_toolkit lexer for the command lines of an application.
+
+    Rather than re-lexing the line with its own set of rules, this lexer styles the
+    tokens found by the application's parser (whose results are themselves cached).
+    The styled lines of recently lexed documents are cached by their text, so a
+    re-render of an unchanged line is a dictionary lookup; whether the command exists
+    is re-checked in constant time against the command engine's
+    :attr:`~almanac.core.command_engine.CommandEngine.name_index`.
+
+    """
+
+    def __init__(
+        self,
+        app: Application,
+        *,
+        max_cached_documents: int = 64
+    ) -> None:
+        self._app = app
+        self._max_cached_documents = max_cached_documents
+
+        # Maps document text to its command name, whether that command existed, and
+        # its styled lines.
+        self._cache: OrderedDict[
+            str, Tuple[Optional[str], bool, List[StyleAndTextTuples]]
+        ] = OrderedDict()
+
+    def _lex_lines(
+        self,
+        text: str
+    ) -> List[StyleAndTextTuples]:
+        name_index = self._app.command_engine.name_index
+
+        cached = self._cache.get(text)
+        if cached is not None:
+            command, command_existed, lines = cached
+            if command is None or (command in name_index) == command_existed:
+                self._cache.move_to_end(text)
+                return lines
+
+        results = self._app.parse_cmd_line(text).results
+        command = None if results is None else results.command
+        command_exists = command is not None and command in name_index
+
+        fragments = _command_line_fragments(text, results, command_exists)
+        lines = list(split_lines(fragments))
+
+        if self._max_cached_documents:
+            self._cache[text] = (command, command_exists, lines)
+            self._cache.move_to_end(text)
+            if len(self._cache) > self._max_cached_documents:
+                self._cache.popitem(last=False)
+
+        return lines
+
+    def lex_document(
+        self,
+        document: Document
+    ) -> Callable[[int], StyleAndTextTuples]:
+        lines = self._lex_lines(document.text)
+
+        def get_line(
+            lineno: int
+        ) -> StyleAndTextTuples:
+            try:
+                return lines[lineno]
+            except IndexError:
+                return []
+
+        return get_line
@@ -0,0 +1,178 @@
+"""A bounded, instrumented cache of command line parse results."""
+
+import threading
+
+from collections import OrderedDict
+from typing import NamedTuple, Tuple
+
+from .engines import ParseFunction
+from .parsing import ParseStatus
+
+
+class ParseCacheInfo(NamedTuple):
+    """A snapshot of the statistics of a :class:`ParseCache`."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    input_bytes: int
+    max_entries: int
+    max_input_bytes: int
+
+
+class ParseCache:
+    """A least-recently-used cache in front of a command line parsing function.
+
+    The cache is bounded both by its number of entries and by the total size (in
+    UTF-8 encoded bytes) of the command lines it holds. A single line larger than
+    ``max_input_bytes`` is parsed but never cached, so very long pasted lines cannot
+    flush everything else out of the cache. A ``max_entries`` of ``0`` disables
+    caching entirely.
+
+    Lookups are guarded by a lock, as completion and lexing may parse lines from a
+    thread other than the one evaluating them.
+
+    """
+
+    def __init__(
+        self,
+        parse_func: ParseFunction,
+        *,
+        max_entries: int = 128,
+        max_input_bytes: int = 1 << 20
+    ) -> None:
+        if max_entries < 0:
+            raise ValueError('max_entries must be non-negative')
+        elif max_input_bytes < 0:
+            raise ValueError('max_input_bytes must be non-negative')
+
+        self._parse_func = parse_func
+        self._max_entries = max_entries
+        self._max_input_bytes = max_input_bytes
+
+        self._lock = threading.Lock()
+        # Maps each cached line to its parse status and its size in bytes.
+        self._entries: 'OrderedDict[str, Tuple[ParseStatus, int]]' = OrderedDict()
+        self._input_bytes = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def max_entries(
+        self
+    ) -> int:
+        """The maximum number of parsed lines held by this cache."""
+        return self._max_entries
+
+    @property
+    def max_input_bytes(
+        self
+    ) -> int:
+        """The maximum total size of the parsed lines held by this cache."""
+        return self._max_input_bytes
+
+    def parse(
+        self,
+        text: str
+    ) -> ParseStatus:
+        """Parse a command line, re-using a cached result when one exists."""
+        with self._lock:
+            entry = self._entries.get(text)
+            if entry is not None:
+                self._hits += 1
+                self._entries.move_to_end(text)
+                return entry[0]
+
+            self._misses += 1
+
+        parse_status = self._parse_func(text)
+        self._store(text, parse_status)
+        return parse_status
+
+    def _store(
+        self,
+        text: str,
+        parse_status: ParseStatus
+    ) -> None:
+        size = len(text.encode('utf-8', 'surrogatepass'))
+        if not self._max_entries or size > self._max_input_bytes:
+            return
+
+        with self._lock:
+            if text in self._entries:
+                # Another thread parsed the same line while we were parsing it.
+                return
+
+            self._entries[text] = (parse_status, size)
+            self._input_bytes += size
+
+            while (
+                len(self._entries) > self._max_entries or
+                self._input_bytes > self._max_input_bytes
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._input_bytes -= evicted_size
+                self._evictions += 1
+
+    def invalidate(
+        self,
+        text: str
+    ) -> bool:
+        """Remove a single line from the cache, returning whether it was cached."""
+        with self._lock:
+            entry = self._entries.pop(text, None)
+            if entry is None:
+                return False
+
+            self._input_bytes -= entry[1]
+            return True
+
+    def clear(
+        self
+    ) -> None:
+        """Remove every line from the cache.
+
+        The hit, miss, and eviction counters are not reset; see :meth:`reset_stats`.
+
+        """
+        with self._lock:
+            self._entries.clear()
+            self._input_bytes = 0
+
+    def reset_stats(
+        self
+    ) -> None:
+        """Reset the hit, miss, and eviction counters of this cache."""
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def info(
+        self
+    ) -> ParseCacheInfo:
+        """Get a snapshot of the statistics of this cache."""
+        with self._lock:
+            return ParseCacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                input_bytes=self._input_bytes,
+                max_entries=self._max_entries,
+                max_input_bytes=self._max_input_bytes
+            )
+
+    def __len__(
+        self
+    ) -> int:
+        return len(self._entries)
+
+    def __contains__(
+        self,
+        text: object
+    ) -> bool:
+        return text in self._entries
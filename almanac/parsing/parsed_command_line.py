@@ -0,0 +1,299 @@
+"""The engine-independent result of parsing a command line."""
+
+from bisect import bisect_left, bisect_right
+from enum import auto, Enum
+from types import MappingProxyType
+from typing import Any, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+
+class Span(NamedTuple):
+    """The half-open ``[start, end)`` range of a token within a command line."""
+
+    start: int
+    end: int
+
+
+# The spans of a keyword argument's name and value, respectively.
+KwargSpans = Tuple[Span, Span]
+
+
+class TokenKind(Enum):
+    COMMAND = auto()
+    POSITIONAL = auto()
+    KWARG_NAME = auto()
+    KWARG_VALUE = auto()
+
+
+class Token(NamedTuple):
+    """The kind and half-open ``[start, end)`` range of a token in a command line."""
+
+    kind: TokenKind
+    start: int
+    end: int
+
+
+class ParsedCommandLine:
+    """The command name and argument values parsed from a command line.
+
+    Instances are immutable. Argument values are plain Python objects (lists, dicts,
+    strings, etc.), ready to be bound to a command's signature.
+
+    Spans are offsets into the original (not tab-expanded) line of text.
+
+    """
+
+    __slots__ = (
+        '_command',
+        '_positionals',
+        '_kwargs',
+        '_command_span',
+        '_positional_spans',
+        '_kwarg_spans',
+        '_tokens',
+        '_token_starts',
+    )
+
+    def __init__(
+        self,
+        command: str,
+        positionals: Tuple[Any, ...],
+        kwargs: Mapping[str, Any],
+        command_span: Span,
+        positional_spans: Tuple[Span, ...],
+        kwarg_spans: Tuple[KwargSpans, ...]
+    ) -> None:
+        self._command = command
+        self._positionals = positionals
+        self._kwargs = MappingProxyType(kwargs)
+        self._command_span = command_span
+        self._positional_spans = positional_spans
+        self._kwarg_spans = kwarg_spans
+
+        # Only built when needed, as most parses are never inspected token-by-token.
+        self._tokens: Optional[Tuple[Token, ...]] = None
+        self._token_starts: Tuple[int, ...] = ()
+
+    @property
+    def command(
+        self
+    ) -> str:
+        """The name or alias of the command."""
+        return self._command
+
+    @property
+    def positionals(
+        self
+    ) -> Tuple[Any, ...]:
+        """The positional argument values."""
+        return self._positionals
+
+    @property
+    def kwargs(
+        self
+    ) -> Mapping[str, Any]:
+        """A read-only mapping of keyword argument names to values.
+
+        When a name is specified more than once, the last value wins.
+
+        """
+        return self._kwargs
+
+    @property
+    def command_span(
+        self
+    ) -> Span:
+        """The span of the command name or alias."""
+        return self._command_span
+
+    @property
+    def positional_spans(
+        self
+    ) -> Tuple[Span, ...]:
+        """The span of each positional argument value."""
+        return self._positional_spans
+
+    @property
+    def kwarg_spans(
+        self
+    ) -> Tuple[KwargSpans, ...]:
+        """The name and value spans of each keyword argument, in order of appearance.
+
+        Unlike :attr:`kwargs`, this includes every occurrence of a repeated name.
+
+        """
+        return self._kwarg_spans
+
+    @property
+    def tokens(
+        self
+    ) -> Tuple[Token, ...]:
+        """Every parsed token, in order of appearance.
+
+        A keyword argument yields a :attr:`TokenKind.KWARG_NAME` token immediately
+        followed by a :attr:`TokenKind.KWARG_VALUE` token.
+
+        """
+        if self._tokens is None:
+            self._build_tokens()
+
+        assert self._tokens is not None
+        return self._tokens
+
+    @property
+    def token_starts(
+        self
+    ) -> Tuple[int, ...]:
+        """The start offset of each of the :attr:`tokens`, for bisection."""
+        if self._tokens is None:
+            self._build_tokens()
+
+        return self._token_starts
+
+    def _build_tokens(
+        self
+    ) -> None:
+        tokens = [Token(TokenKind.COMMAND, *self._command_span)]
+        tokens.extend(
+            Token(TokenKind.POSITIONAL, *span) for span in self._positional_spans
+        )
+        for name_span, value_span in self._kwarg_spans:
+            tokens.append(Token(TokenKind.KWARG_NAME, *name_span))
+            tokens.append(Token(TokenKind.KWARG_VALUE, *value_span))
+
+        self._token_starts = tuple(token.start for token in tokens)
+        self._tokens = tuple(tokens)
+
+    def token_index_at(
+        self,
+        pos: int
+    ) -> Optional[int]:
+        """Find the index of the token containing a position, by bisection.
+
+        A position at the very end of a token (such as that of a cursor that has just
+        typed it) is considered to be within the token.
+
+        Returns:
+            The index into :attr:`tokens`, or ``None`` if the position is not within
+            any token.
+
+        """
+        tokens = self.tokens
+        idx = bisect_right(self._token_starts, pos) - 1
+        if idx < 0 or pos > tokens[idx].end:
+            return None
+
+        return idx
+
+    def token_at(
+        self,
+        pos: int
+    ) -> Optional[Token]:
+        """Find the token containing a position; see :meth:`token_index_at`."""
+        idx = self.token_index_at(pos)
+        return None if idx is None else self.tokens[idx]
+
+    def __eq__(
+        self,
+        other: object
+    ) -> bool:
+        if not isinstance(other, ParsedCommandLine):
+            return NotImplemented
+
+        return (
+            self._command == other._command and
+            self._positionals == other._positionals and
+            self._kwargs == other._kwargs and
+            self._command_span == other._command_span and
+            self._positional_spans == other._positional_spans and
+            self._kwarg_spans == other._kwarg_spans
+        )
+
+    # Argument values may be unhashable lists or dicts.
+    __hash__ = None  # type: ignore
+
+    def __repr__(
+        self
+    ) -> str:
+        return (
+            f'<{self.__class__.__qualname__} [{self._command} {self._positionals} '
+            f'{dict(self._kwargs)}]>'
+        )
+
+
+def tab_expansion_offsets(
+    text: str
+) -> Optional[List[int]]:
+    """Map each position in a line to its position once tabs have been expanded.
+
+    Returns:
+        A list of ``len(text) + 1`` increasing offsets into ``text.expandtabs()``, or
+        ``None`` if the text contains no tabs (and so positions are unchanged).
+
+    """
+    if '\t' not in text:
+        return None
+
+    offsets = []
+    expanded_pos = 0
+    col = 0
+    for c in text:
+        offsets.append(expanded_pos)
+        if c == '\t':
+            width = 8 - col % 8
+            expanded_pos += width
+            col += width
+        else:
+            expanded_pos += 1
+            col = 0 if c in '\n\r' else col + 1
+
+    offsets.append(expanded_pos)
+    return offsets
+
+
+def make_parsed_command_line(
+    text: str,
+    command: str,
+    command_span: Tuple[int, int],
+    positionals: Iterable[Tuple[Any, Tuple[int, int]]],
+    kwargs: Iterable[Tuple[str, Any, Tuple[int, int], Tuple[int, int]]]
+) -> ParsedCommandLine:
+    """Build a :class:`ParsedCommandLine` from the tokens found by a parser engine.
+
+    Args:
+        text: The original line of text.
+        command: The parsed command name or alias.
+        command_span: The span of the command within the tab-expanded line.
+        positionals: ``(value, span)`` pairs for each positional argument.
+        kwargs: ``(name, value, name_span, value_span)`` tuples for each keyword
+            argument, in order of appearance.
+
+    """
+    offsets = tab_expansion_offsets(text)
+
+    def span(raw_span: Tuple[int, int]) -> Span:
+        start, end = raw_span
+        if offsets is None:
+            return Span(start, end)
+
+        return Span(bisect_left(offsets, start), bisect_left(offsets, end))
+
+    positional_values = []
+    positional_spans = []
+    for value, raw_span in positionals:
+        positional_values.append(value)
+        positional_spans.append(span(raw_span))
+
+    kwarg_values = {}
+    kwarg_spans = []
+    for name, value, raw_name_span, raw_value_span in kwargs:
+        kwarg_values[name] = value
+        kwarg_spans.append((span(raw_name_span), span(raw_value_span)))
+
+    return ParsedCommandLine(
+        command,
+        tuple(positional_values),
+        kwarg_values,
+        span(command_span),
+        tuple(positional_spans),
+        tuple(kwarg_spans)
+    )
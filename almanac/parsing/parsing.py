@@ -35,17 +35,21 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+from __future__ import annotations
+
 import re
 
-import pyparsing as pp
+from bisect import bisect_right
 
 from enum import auto, Enum
-from functools import lru_cache
-from typing import NamedTuple
+from typing import NamedTuple, Optional, Tuple, TYPE_CHECKING
 
-from prompt_toolkit.document import Document
+from .parsed_command_line import make_parsed_command_line, ParsedCommandLine, TokenKind
+from ..context import current_app
+from ..errors import NoActiveApplicationError, PartialParseError, TotalParseError
 
-from ..errors import PartialParseError, TotalParseError
+if TYPE_CHECKING:
+    from prompt_toolkit.document import Document
 
 
 class Patterns:
@@ -72,163 +76,156 @@ class Patterns:
         return bool(re.fullmatch(Patterns.IDENTIFIER, s))
 
 
-def _no_transform(x):
-    return x
-
-
-def _bool_transform(x):
-    return x in ('True', 'true',)
-
-
-def _str_transform(x):
-    return x.strip('"\'')
-
-
-_TRANSFORMS = {
-    'bool': _bool_transform,
-    'str': _str_transform,
-    'int': int,
-    'float': float,
-    'dict': dict,
-}
-
-
-def _parse_type(data_type):
-    transform = _TRANSFORMS.get(data_type, _no_transform)
-
-    def _parse(s, loc, toks):
-        return [transform(x) for x in toks]
-
-    return _parse
-
-
-# Valid identifiers cannot start with a number, but may contain them in their body.
-identifier = pp.Word(pp.alphas + '_-', pp.alphanums + '_-')
+class ParseState(Enum):
+    FULL = auto()
+    PARTIAL = auto()
+    NONE = auto()
 
-# XXX: allow for hex?
-int_value = pp.Regex(Patterns.INTEGER).setParseAction(_parse_type('int'))
 
-float_value = pp.Regex(Patterns.FLOAT).setParseAction(_parse_type('float'))
+class ParseStatus(NamedTuple):
+    results: Optional[ParsedCommandLine]
+    unparsed_text: str
+    unparsed_start_pos: int
+    state: ParseState
 
-bool_value = (
-    pp.Literal('True') ^ pp.Literal('true') ^
-    pp.Literal('False') ^ pp.Literal('false')
-).setParseAction(_parse_type('bool'))
 
-quoted_string = pp.quotedString.setParseAction(_parse_type('str'))
+def split_background_marker(
+    text: str
+) -> Tuple[str, bool]:
+    """Split the trailing ``&`` that requests background execution off a command line.
 
-unquoted_string = pp.Word(
-    pp.alphanums + Patterns.ALLOWED_SYMBOLS_IN_STRING
-).setParseAction(_parse_type('str'))
+    The ``&`` character cannot otherwise end a command line, as it is not allowed in
+    unquoted strings.
 
-string_value = quoted_string | unquoted_string
+    Returns:
+        The command line without the marker, and whether the marker was present.
 
-single_value = bool_value | float_value | int_value | string_value
+    """
+    stripped = text.rstrip()
+    if stripped.endswith('&'):
+        return stripped[:-1].rstrip(), True
 
-list_value = pp.Group(
-    pp.Suppress('[') +
-    pp.Optional(pp.delimitedList(single_value)) +
-    pp.Suppress(']')
-).setParseAction(_parse_type('list'))
+    return text, False
 
-dict_value = pp.Forward()
 
-value = list_value ^ single_value ^ dict_value
+def make_parse_status(
+    results: ParsedCommandLine,
+    text: str,
+    expanded_text: str,
+    end_loc: int
+) -> ParseStatus:
+    """Build the status of a parse that stopped at a location within a line.
 
-dict_key_value = pp.dictOf(string_value + pp.Suppress(':'), value)
+    Args:
+        results: The results parsed up until ``end_loc``.
+        text: The original line of text.
+        expanded_text: The line of text with any tabs expanded, as parsed.
+        end_loc: The position in ``expanded_text`` at which parsing stopped, after
+            skipping any whitespace.
 
-dict_value << pp.Group(
-    pp.Suppress('{') + pp.delimitedList(dict_key_value) + pp.Suppress('}')
-).setParseAction(_parse_type('dict'))
+    """
+    if end_loc >= len(expanded_text):
+        return ParseStatus(results, '', len(text), ParseState.FULL)
 
-# Positionals must be end of line or has a space (or more) afterwards.
-# This is to ensure that the parser treats text like "something=" as invalid
-# instead of parsing this as positional "something" and leaving the "=" as
-# invalid on its own.
-positionals = pp.ZeroOrMore(
-    value + (pp.StringEnd() ^ pp.Suppress(pp.OneOrMore(pp.White())))
-).setResultsName('positionals')
+    # Mirror the column and remaining text reported by pyparsing's exceptions.
+    if 0 < end_loc and expanded_text[end_loc-1] == '\n':
+        col = 1
+    else:
+        col = end_loc - expanded_text.rfind('\n', 0, end_loc)
 
-key_value = pp.Dict(pp.ZeroOrMore(pp.Group(
-    identifier + pp.Suppress('=') + value
-))).setResultsName('kv')
+    line_start = end_loc - col + 1
+    line_end = expanded_text.find('\n', end_loc)
+    if line_end < 0:
+        line_end = len(expanded_text)
 
-command = identifier.setResultsName('command')
+    line = expanded_text[line_start:line_end]
+    marked_line = (line[:col-1] + '>!<' + line[col-1:]).strip()
+    remaining = marked_line[(marked_line.find('>!<') + 3):]
 
-command_line = command + positionals + key_value
+    return ParseStatus(results, remaining, col - 1, ParseState.PARTIAL)
 
 
-class ParseState(Enum):
-    FULL = auto()
-    PARTIAL = auto()
-    NONE = auto()
+def results_or_raise(
+    parse_status: ParseStatus
+) -> ParsedCommandLine:
+    """Get the results of a full parse, or raise an error for an incomplete one.
 
+    Raises:
+        :class:`PartialParseError`: If the status is of a partial parse.
+        :class:`TotalParseError`: If the status is of a failed parse.
 
-class ParseStatus(NamedTuple):
-    results: pp.ParseResults
-    unparsed_text: str
-    unparsed_start_pos: int
-    state: ParseState
+    """
+    if parse_status.state == ParseState.NONE:
+        raise TotalParseError(
+            f'Unable to parse a command name from {parse_status.unparsed_text!r}'
+        )
+    elif parse_status.state == ParseState.PARTIAL:
+        col = parse_status.unparsed_start_pos + 1
+        raise PartialParseError(
+            f'Unable to parse {parse_status.unparsed_text!r} (col:{col})',
+            parse_status.unparsed_text,
+            parse_status.results,
+            col
+        )
+
+    assert parse_status.results is not None
+    return parse_status.results
 
 
-@lru_cache()
 def parse_cmd_line(
     text: str
 ) -> ParseStatus:
-    """Attempt to parse a command line, returning a :class:`ParseStatus` object."""
+    """Attempt to parse a command line, returning a :class:`ParseStatus` object.
+
+    Lines that can only be partially parsed are handled in the same single pass as
+    lines that can be fully parsed.
+
+    """
+    # The grammar is only imported (and so built) when first used, as doing so is slow
+    # and the default parser engine does not need it.
+    from .grammar import command_line_with_end_loc, ParseException, plain_value
+
     try:
-        parse_results = _raw_parse_cmd_line(text)
-        unparsed_text = ''
-        unparsed_start_pos = len(text)
-        parse_state = ParseState.FULL
-    except PartialParseError as e:
-        parse_results = e.partial_result
-        unparsed_text = e.remaining
-        unparsed_start_pos = e.error_pos
-        parse_state = ParseState.PARTIAL
-    except TotalParseError:
-        parse_results = None
-        unparsed_text = text
-        unparsed_start_pos = 0
-        parse_state = ParseState.NONE
-
-    return ParseStatus(parse_results, unparsed_text, unparsed_start_pos, parse_state)
+        tokens = command_line_with_end_loc.parseString(text)
+    except ParseException:
+        return ParseStatus(None, text, 0, ParseState.NONE)
+
+    (command_start, command, command_end), positional_groups, kwarg_groups, end_loc = \
+        tokens
+
+    results = make_parsed_command_line(
+        text,
+        command,
+        (command_start, command_end),
+        (
+            (plain_value(value), (start, end))
+            for start, value, end in positional_groups
+        ),
+        (
+            (name, plain_value(value), (name_start, name_end), (start, end))
+            for (name_start, name, name_end), (start, value, end) in kwarg_groups
+        )
+    )
+    expanded_text = text.expandtabs() if '\t' in text else text
+
+    return make_parse_status(results, text, expanded_text, end_loc)
 
 
 def _raw_parse_cmd_line(
     text: str
-) -> pp.ParseResults:
-    """Attempt to parse the command line as per the grammar defined in this module.
-
-    If the specified text can be fully parsed, then a `pypaysing.ParseResults` will be
-    returned with the following attributes:
+) -> ParsedCommandLine:
+    """Attempt to parse the command line as per the grammar in :mod:`almanac.parsing.grammar`.
 
-        * command: The name or alias of the command.
-        * kv: A dictionary of key-value pairs representing the keyword arguments.
-        * positionals: Any positional argument values.
-
-    Otherwise, a descendant of :class:`CommandParseError` is raised.
+    If the specified text can be fully parsed, then a :class:`ParsedCommandLine` will
+    be returned. Otherwise, a descendant of :class:`BaseParseError` is raised.
 
     Raises:
-        :class:`CommandPartialParseError`: If the specified text can be partially
+        :class:`PartialParseError`: If the specified text can be partially
             parsed, but errors still exist.
-        :class:`CommandPartialParseError`: If the text cannot even be partially parsed.
+        :class:`TotalParseError`: If the text cannot even be partially parsed.
 
     """
-    try:
-        result = command_line.parseString(text, parseAll=True)
-        return result
-    except pp.ParseException as e:
-        remaining = e.markInputline()
-        remaining = remaining[(remaining.find('>!<') + 3):]
-
-        try:
-            partial_result = command_line.parseString(text, parseAll=False)
-        except pp.ParseException as ee:
-            raise TotalParseError(str(ee)) from None
-
-        new_exc = PartialParseError(str(e), remaining, partial_result, e.col)
-        raise new_exc from None
+    return results_or_raise(parse_cmd_line(text))
 
 
 class IncompleteToken:
@@ -247,6 +244,48 @@ class IncompleteToken:
 
         self._parse()
 
+    @classmethod
+    def _from_fields(
+        cls,
+        token: str,
+        key: str,
+        value: str,
+        is_kw_arg: bool,
+        is_pos_arg: bool
+    ) -> IncompleteToken:
+        incomplete_token = cls.__new__(cls)
+        incomplete_token._token = token
+        incomplete_token._key = key
+        incomplete_token._value = value
+        incomplete_token._is_kw_arg = is_kw_arg
+        incomplete_token._is_pos_arg = is_pos_arg
+        return incomplete_token
+
+    @classmethod
+    def for_kw_arg(
+        cls,
+        key: str,
+        value: str
+    ) -> IncompleteToken:
+        """Create a token known to be the value of a keyword argument."""
+        return cls._from_fields(f'{key}={value}', key, value, True, False)
+
+    @classmethod
+    def for_pos_arg(
+        cls,
+        value: str
+    ) -> IncompleteToken:
+        """Create a token known to be a positional argument value."""
+        return cls._from_fields(value, '', value, False, True)
+
+    @classmethod
+    def for_ambiguous_arg(
+        cls,
+        value: str
+    ) -> IncompleteToken:
+        """Create a token that may either be a positional value or a keyword name."""
+        return cls._from_fields(value, value, value, False, False)
+
     def _parse(
         self
     ) -> None:
@@ -337,9 +376,71 @@ def last_incomplete_token(
     return IncompleteToken(last_token)
 
 
+def incomplete_token_at_cursor(
+    document: Document,
+    parse_status: ParseStatus
+) -> IncompleteToken:
+    """Get the token under the cursor, using the token spans of a parse of a document.
+
+    The token containing the cursor is found by bisecting the spans of the parsed
+    tokens, so quoted literals containing spaces are handled correctly. Only text that
+    could not be parsed (which must follow all of the parsed tokens) is inspected
+    directly.
+
+    """
+    results = parse_status.results
+    if results is None:
+        return last_incomplete_token(document, parse_status.unparsed_text)
+
+    text = document.text
+    pos = document.cursor_position
+
+    tokens = results.tokens
+    parsed_end = tokens[-1].end
+    if pos > parsed_end:
+        # The cursor is past everything that could be parsed.
+        start = parsed_end
+        while start < pos and text[start] in ' \n\t\r':
+            start += 1
+
+        return IncompleteToken(text[start:pos])
+
+    idx = bisect_right(results.token_starts, pos) - 1
+    token = tokens[idx]
+    if pos > token.end:
+        # The cursor is between tokens, such as just after the = of a key=value.
+        if token.kind == TokenKind.KWARG_NAME:
+            return IncompleteToken.for_kw_arg(text[token.start:token.end], '')
+
+        return IncompleteToken.for_ambiguous_arg('')
+
+    value = text[token.start:pos]
+    if value[-1:] in (']', '}') and pos == token.end:
+        # A closed list or dict literal is complete, so we are starting a new token.
+        return IncompleteToken.for_ambiguous_arg('')
+    elif token.kind == TokenKind.KWARG_VALUE:
+        name_token = tokens[idx-1]
+        return IncompleteToken.for_kw_arg(
+            text[name_token.start:name_token.end], value
+        )
+    elif token.kind == TokenKind.POSITIONAL and value[:1] in ('"', "'", '[', '{'):
+        return IncompleteToken.for_pos_arg(value)
+
+    return IncompleteToken.for_ambiguous_arg(value)
+
+
 def last_incomplete_token_from_document(
     document: Document
 ) -> IncompleteToken:
-    """Shortcut for getting the last incomplete token only from a ``Document``."""
-    parse_status = parse_cmd_line(document.text)
-    return last_incomplete_token(document, parse_status.unparsed_text)
+    """Shortcut for getting the last incomplete token only from a ``Document``.
+
+    The document is parsed with the parser of the currently running application, or
+    with the pyparsing grammar when no application is running.
+
+    """
+    try:
+        parse_status = current_app().parse_cmd_line(document.text)
+    except NoActiveApplicationError:
+        parse_status = parse_cmd_line(document.text)
+
+    return incomplete_token_at_cursor(document, parse_status)
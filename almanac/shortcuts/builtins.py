@@ -1,3 +1,5 @@
+from typing import Optional
+
 from ..constants import ExitCodes
 from ..pages import PagePath, PagePathLike
 from ..context import current_app
@@ -64,6 +66,76 @@ async def pwd() -> int:
     return ExitCodes.OK
 
 
+@_arg.action(
+    choices=['clear', 'info'],
+    description='Either clear, to clear the caches, or info, to list their statistics.'
+)
+async def cache(action: str = 'info') -> int:
+    """Clear, or show the statistics of, the caches of memoized command results."""
+    app = current_app()
+    command_engine = app.command_engine
+
+    if action == 'clear':
+        command_engine.clear_result_caches()
+        app.io.info('Cleared the command result caches.')
+    elif action == 'info':
+        for name, result_cache in command_engine.result_caches.items():
+            info = result_cache.info()
+            app.io.raw(
+                f'{name}: {info.entries}/{info.max_entries} entries, '
+                f'{info.hits} hits, {info.misses} misses'
+            )
+    else:
+        app.io.error(f'Unknown cache action {action}; expected clear or info.')
+        return ExitCodes.ERR_COMMAND_INVALID_ARGUMENTS
+
+    return ExitCodes.OK
+
+
+async def jobs() -> int:
+    """List the background jobs."""
+    app = current_app()
+
+    for job in app.jobs:
+        status = job.status.name.lower()
+        if job.done():
+            status += f' ({job.exit_code})'
+
+        app.io.raw(f'[{job.id}] {status:<16}{job.command_line}')
+
+    return ExitCodes.OK
+
+
+@_arg.job_id(description='The id of the job to wait for (the latest job by default).')
+async def fg(job_id: Optional[int] = None) -> int:
+    """Wait for a background job to finish, print its output, and remove it."""
+    app = current_app()
+
+    job = app.jobs.latest if job_id is None else app.jobs[job_id]
+    if job is None:
+        app.io.error('There are no background jobs.')
+        return ExitCodes.ERR_COMMAND_INVALID_ARGUMENTS
+
+    exit_code = await job.wait()
+    app.jobs.remove(job.id)
+    job.output.replay(app.io)
+
+    return exit_code
+
+
+@_arg.job_id(description='The id of the job to cancel.')
+async def kill(job_id: int) -> int:
+    """Cancel a background job and remove it."""
+    app = current_app()
+
+    job = app.jobs[job_id]
+    job.cancel()
+    await job.wait()
+    app.jobs.remove(job.id)
+
+    return ExitCodes.OK
+
+
 async def quit() -> int:
     """Quit the application."""
     app = current_app()
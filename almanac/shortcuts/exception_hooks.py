@@ -1,7 +1,10 @@
 from ..context import current_app
 from ..errors import (
     BaseArgumentError,
+    BaseJobError,
     BasePageError,
+    CommandLimitError,
+    CommandTimeoutError,
     MissingArgumentsError,
     NoSuchArgumentError,
     NoSuchCommandError,
@@ -15,6 +18,16 @@ async def hook_BaseArgumentError(exc: BaseArgumentError):
     app.io.error(exc)
 
 
+async def hook_CommandLimitError(exc: CommandLimitError):
+    app = current_app()
+    app.io.error(exc)
+
+
+async def hook_CommandTimeoutError(exc: CommandTimeoutError):
+    app = current_app()
+    app.io.error(exc)
+
+
 async def hook_MissingArgumentsError(exc: MissingArgumentsError):
     app = current_app()
     app.io.error(exc)
@@ -22,7 +35,11 @@ async def hook_MissingArgumentsError(exc: MissingArgumentsError):
 
 async def hook_NoSuchArgumentError(exc: NoSuchArgumentError):
     app = current_app()
+
     app.io.error(exc)
+    if exc.command_name is not None:
+        for argument_name in exc.names:
+            app.print_argument_suggestions(exc.command_name, argument_name)
 
 
 async def hook_TooManyPositionalArgumentsError(exc: TooManyPositionalArgumentsError):
@@ -48,6 +65,11 @@ async def hook_UnknownArgumentBindingError(exc: UnknownArgumentBindingError):
             app.io.error(f'    {key}={repr(value)}')
 
 
+async def hook_BaseJobError(exc: BaseJobError):
+    app = current_app()
+    app.io.error(exc)
+
+
 async def hook_BasePageError(exc: BasePageError):
     app = current_app()
     app.io.error(exc)
@@ -1,19 +1,26 @@
-from typing import Type
+from __future__ import annotations
 
-from prompt_toolkit.styles import Style
+from typing import Optional, Type, TYPE_CHECKING
 
 from .builtins import (
     back as builtin_back,
+    cache as builtin_cache,
     cd as builtin_cd,
+    fg as builtin_fg,
     forward as builtin_forward,
     help as builtin_help,
+    jobs as builtin_jobs,
+    kill as builtin_kill,
     ls as builtin_ls,
     pwd as builtin_pwd,
     quit as builtin_quit
 )
 from .exception_hooks import (
     hook_BaseArgumentError,
+    hook_BaseJobError,
     hook_BasePageError,
+    hook_CommandLimitError,
+    hook_CommandTimeoutError,
     hook_MissingArgumentsError,
     hook_NoSuchArgumentError,
     hook_NoSuchCommandError,
@@ -26,7 +33,10 @@ from ..context import current_app
 from ..core import Application
 from ..errors import (
     BaseArgumentError,
+    BaseJobError,
     BasePageError,
+    CommandLimitError,
+    CommandTimeoutError,
     MissingArgumentsError,
     NoSuchArgumentError,
     NoSuchCommandError,
@@ -35,7 +45,10 @@ from ..errors import (
 )
 from ..io import AbstractIoContext, StandardConsoleIoContext
 from ..pages import PagePath
-from ..style import DARK_MODE_STYLE
+from ..parsing import ParserEngine
+
+if TYPE_CHECKING:
+    from prompt_toolkit.styles import Style
 
 
 def _current_page_prompt_str(
@@ -49,17 +62,24 @@ def make_standard_app(
     with_completion: bool = True,
     with_pages: bool = True,
     with_style: bool = True,
-    style: Style = DARK_MODE_STYLE,
+    style: Optional[Style] = None,
     io_context_cls: Type[AbstractIoContext] = StandardConsoleIoContext,
+    parser_engine: ParserEngine = ParserEngine.FAST,
+    parse_cache_max_entries: int = 128,
+    parse_cache_max_input_bytes: int = 1 << 20,
     propagate_runtime_exceptions: bool = False,
     print_all_exception_tracebacks: bool = False,
-    print_unknown_exception_tracebacks: bool = True
+    print_unknown_exception_tracebacks: bool = True,
+    max_job_output_messages: Optional[int] = 1000,
+    command_timeout: Optional[float] = None,
+    completion_debounce: float = 0.05,
+    max_completions: Optional[int] = 1000
 ) -> Application:
     """Instantiate and configure a standard application.
 
     When pages enabled, file-related commands will be registered on the returned
     :class:`Application` instance. Otherwise, only a few barebones commands are
-    registered (quit, help, etc.).
+    registered (quit, help, the job control commands, etc.).
 
     """
     app = Application(
@@ -67,9 +87,16 @@ def make_standard_app(
         with_style=with_style,
         style=style,
         io_context_cls=io_context_cls,
+        parser_engine=parser_engine,
+        parse_cache_max_entries=parse_cache_max_entries,
+        parse_cache_max_input_bytes=parse_cache_max_input_bytes,
         propagate_runtime_exceptions=propagate_runtime_exceptions,
         print_all_exception_tracebacks=print_all_exception_tracebacks,
-        print_unknown_exception_tracebacks=print_unknown_exception_tracebacks
+        print_unknown_exception_tracebacks=print_unknown_exception_tracebacks,
+        max_job_output_messages=max_job_output_messages,
+        command_timeout=command_timeout,
+        completion_debounce=completion_debounce,
+        max_completions=max_completions
     )
 
     app.add_completers_for_type(bool, WordCompleter(['True', 'False']))
@@ -79,10 +106,17 @@ def make_standard_app(
     add_command = app.cmd.register()
     add_exc_hook = app.hook.exception.set_hook_for_exc_type
 
+    add_command(builtin_cache)
+    add_command(builtin_fg)
     add_command(builtin_help)
+    add_command(builtin_jobs)
+    add_command(builtin_kill)
     add_command(builtin_quit)
 
     add_exc_hook(BaseArgumentError, hook_BaseArgumentError)
+    add_exc_hook(BaseJobError, hook_BaseJobError)
+    add_exc_hook(CommandLimitError, hook_CommandLimitError)
+    add_exc_hook(CommandTimeoutError, hook_CommandTimeoutError)
     add_exc_hook(MissingArgumentsError, hook_MissingArgumentsError)
     add_exc_hook(NoSuchArgumentError, hook_NoSuchArgumentError)
     add_exc_hook(NoSuchCommandError, hook_NoSuchCommandError)
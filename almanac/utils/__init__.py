@@ -1,3 +1,5 @@
 from .fuzzy_matcher import FuzzyMatcher  # noqa
 from .iteration import pairwise  # noqa
+from .prefix_index import PrefixIndex  # noqa
 from .strings import abbreviated, capitalized  # noqa
+from .suggestion_index import SuggestionIndex  # noqa
@@ -1,5 +1,7 @@
 """Implementation of the ``FuzzyMatcher`` class."""
 
+import heapq
+
 from collections import namedtuple
 from difflib import SequenceMatcher
 from operator import attrgetter
@@ -35,15 +37,10 @@ class FuzzyMatcher:
 
         _fuzzes = iter(self.__class__.fuzz(reference, c) for c in candidates)
         _passing_fuzzes = iter(f for f in _fuzzes if f.ratio > ratio_threshold)
-        _sorted_passing_fuzzes = tuple(
-            sorted(_passing_fuzzes, key=attrgetter('ratio'))
+        self._results: Tuple[FuzzResult, ...] = tuple(
+            heapq.nlargest(num_max_matches, _passing_fuzzes, key=attrgetter('ratio'))
         )
 
-        if len(_sorted_passing_fuzzes) <= num_max_matches:
-            self._results = _sorted_passing_fuzzes
-        else:
-            self._results = _sorted_passing_fuzzes[:num_max_matches]
-
         self._matches = tuple(r.string for r in self._results)
 
     @staticmethod
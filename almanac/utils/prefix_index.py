@@ -0,0 +1,91 @@
+"""Implementation of the ``PrefixIndex`` class."""
+
+import threading
+
+from bisect import bisect_left
+from typing import Iterable, Iterator, List, Set
+
+
+class PrefixIndex:
+    """A sorted index of strings, supporting lazy prefix queries.
+
+    Strings are kept in a sorted list, so the strings that start with a prefix are a
+    contiguous run that is found by bisection and then yielded lazily, in sorted
+    order. Membership checks are answered in constant time.
+
+    Added strings are buffered and merged into the sorted list on the next query, so
+    adding many strings one at a time (as happens when registering thousands of
+    commands) does not re-sort the index for each of them. Queries iterate over a
+    snapshot of the index, so it is safe to add strings while another thread is
+    iterating over query results.
+
+    """
+
+    def __init__(
+        self,
+        strings: Iterable[str] = ()
+    ) -> None:
+        self._members: Set[str] = set(strings)
+        self._sorted: List[str] = sorted(self._members)
+        self._pending: List[str] = []
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        string: str
+    ) -> None:
+        """Add a string to the index, if it is not already present."""
+        with self._lock:
+            if string in self._members:
+                return
+
+            self._members.add(string)
+            self._pending.append(string)
+
+    def _snapshot(
+        self
+    ) -> List[str]:
+        if self._pending:
+            with self._lock:
+                if self._pending:
+                    # Sorting is linear for a sorted list with a sorted run appended.
+                    self._pending.sort()
+                    self._sorted = sorted(self._sorted + self._pending)
+                    self._pending = []
+
+        return self._sorted
+
+    def iter_prefix(
+        self,
+        prefix: str
+    ) -> Iterator[str]:
+        """Lazily yield the indexed strings that start with a prefix, in sorted order."""
+        strings = self._snapshot()
+
+        for i in range(bisect_left(strings, prefix), len(strings)):
+            string = strings[i]
+            if not string.startswith(prefix):
+                break
+
+            yield string
+
+    def __contains__(
+        self,
+        string: object
+    ) -> bool:
+        return string in self._members
+
+    def __iter__(
+        self
+    ) -> Iterator[str]:
+        return iter(self._snapshot())
+
+    def __len__(
+        self
+    ) -> int:
+        return len(self._members)
+
+    def __repr__(
+        self
+    ) -> str:
+        return f'<{self.__class__.__qualname__} [{len(self)} strings]>'
@@ -0,0 +1,196 @@
+"""Implementation of the ``SuggestionIndex`` class."""
+
+import heapq
+import threading
+
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import DefaultDict, Iterable, Iterator, List, Set, Tuple
+
+from .fuzzy_matcher import FuzzResult
+
+_DEFAULT_FUZZ_RATIO_THRESHOLD = 0.6
+_DEFAULT_MAX_MATCHES = 3
+
+# Marks the start and end of each string, so that its first and last characters also
+# form n-grams.
+_PADDING = '\x00'
+
+
+def _ngrams(
+    string: str,
+    n: int
+) -> Set[str]:
+    padded = _PADDING + string + _PADDING
+    return {padded[i:i + n] for i in range(max(len(padded) - n + 1, 1))}
+
+
+def _common_char_count(
+    a: Counter,
+    b: Counter
+) -> int:
+    return sum(min(count, b[c]) for c, count in a.items() if c in b)
+
+
+class SuggestionIndex:
+    """An n-gram index of strings, for "did you mean" suggestions.
+
+    Matches are ranked by the same :class:`difflib.SequenceMatcher` ratio used by
+    :class:`FuzzyMatcher`, but only strings that share at least one n-gram with the
+    misspelled string are considered, and those that cannot beat either the ratio
+    threshold or the current worst of the best ``k`` matches (judged by their lengths
+    and characters alone) are never fully compared. The best matches are kept in a
+    bounded heap rather than by sorting every passing candidate.
+
+    The index is built incrementally, so it can be maintained as strings (such as
+    command names) are registered.
+
+    Args:
+        strings: The initial strings to index.
+        n: The length of the indexed n-grams.
+
+    """
+
+    def __init__(
+        self,
+        strings: Iterable[str] = (),
+        *,
+        n: int = 2
+    ) -> None:
+        if n < 1:
+            raise ValueError('n must be positive')
+
+        self._n = n
+        self._strings: List[str] = []
+        self._members: Set[str] = set()
+        self._char_counts: List[Counter] = []
+        # Maps each n-gram to the ids (insertion order) of the strings containing it.
+        self._postings: DefaultDict[str, Set[int]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+        for string in strings:
+            self.add(string)
+
+    def add(
+        self,
+        string: str
+    ) -> None:
+        """Add a string to the index, if it is not already present."""
+        with self._lock:
+            if string in self._members:
+                return
+
+            string_id = len(self._strings)
+            self._strings.append(string)
+            self._members.add(string)
+            self._char_counts.append(Counter(string))
+            for ngram in _ngrams(string, self._n):
+                self._postings[ngram].add(string_id)
+
+    def _candidate_ids(
+        self,
+        reference: str
+    ) -> List[int]:
+        postings = [
+            self._postings[ngram] for ngram in _ngrams(reference, self._n)
+            if ngram in self._postings
+        ]
+        return sorted(set().union(*postings))
+
+    def results(
+        self,
+        reference: str,
+        *,
+        ratio_threshold: float = _DEFAULT_FUZZ_RATIO_THRESHOLD,
+        num_max_matches: int = _DEFAULT_MAX_MATCHES
+    ) -> Tuple[FuzzResult, ...]:
+        """Find the indexed strings most similar to a reference string.
+
+        Returns:
+            Up to ``num_max_matches`` :class:`FuzzResult` tuples whose ratio surpasses
+            ``ratio_threshold``, most similar first. Ties are broken in favor of the
+            string that was indexed first.
+
+        """
+        if num_max_matches <= 0:
+            return ()
+
+        with self._lock:
+            candidate_ids = self._candidate_ids(reference)
+
+        reference_len = len(reference)
+        reference_char_counts = Counter(reference)
+
+        # Sequences are ordered as in FuzzyMatcher.fuzz, as the ratio is not symmetric.
+        matcher = SequenceMatcher(None, reference, '')
+
+        # A min-heap of (ratio, -id, string), whose root is the worst match kept.
+        heap: List[Tuple[float, int, str]] = []
+        for string_id in candidate_ids:
+            string = self._strings[string_id]
+            floor = ratio_threshold if len(heap) < num_max_matches else heap[0][0]
+
+            # Candidates are compared in the order they were indexed, so one that only
+            # ties the worst kept match loses the tie. These bounds are those of
+            # SequenceMatcher.real_quick_ratio and quick_ratio, without the cost of
+            # analyzing the candidate.
+            total_len = reference_len + len(string)
+            if total_len and (
+                2.0 * min(reference_len, len(string)) / total_len <= floor or
+                2.0 * _common_char_count(
+                    reference_char_counts, self._char_counts[string_id]
+                ) / total_len <= floor
+            ):
+                continue
+
+            matcher.set_seq2(string)
+            ratio = matcher.ratio()
+            if ratio <= floor:
+                continue
+
+            entry = (ratio, -string_id, string)
+            if len(heap) < num_max_matches:
+                heapq.heappush(heap, entry)
+            else:
+                heapq.heapreplace(heap, entry)
+
+        return tuple(
+            FuzzResult(string, ratio) for ratio, _, string in sorted(heap, reverse=True)
+        )
+
+    def matches(
+        self,
+        reference: str,
+        *,
+        ratio_threshold: float = _DEFAULT_FUZZ_RATIO_THRESHOLD,
+        num_max_matches: int = _DEFAULT_MAX_MATCHES
+    ) -> Tuple[str, ...]:
+        """Only the strings of the :meth:`results` for a reference string."""
+        return tuple(
+            result.string for result in self.results(
+                reference,
+                ratio_threshold=ratio_threshold,
+                num_max_matches=num_max_matches
+            )
+        )
+
+    def __contains__(
+        self,
+        string: object
+    ) -> bool:
+        return string in self._members
+
+    def __iter__(
+        self
+    ) -> Iterator[str]:
+        return iter(tuple(self._strings))
+
+    def __len__(
+        self
+    ) -> int:
+        return len(self._strings)
+
+    def __repr__(
+        self
+    ) -> str:
+        return f'<{self.__class__.__qualname__} [{len(self)} strings]>'
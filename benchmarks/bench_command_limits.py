@@ -0,0 +1,71 @@
+"""Benchmarks for the concurrency and rate limits of commands.
+
+Run from the repository root with::
+
+    python -m benchmarks.bench_command_limits
+
+"""
+
+import asyncio
+
+from almanac import Application, NullIoContext
+
+from .utils import report
+
+NUM_CALLS = 200
+CALL_LATENCY = 0.01
+
+
+def make_app() -> Application:
+    app = Application(with_style=False, io_context_cls=NullIoContext)
+
+    async def fetch(*, latency: float = 0.0):
+        await asyncio.sleep(latency)
+
+    app.cmd.register()(fetch)
+    app.cmd.register(app.cmd(name='limited', max_concurrency=20))(fetch)
+    app.cmd.register(
+        app.cmd(name='rate_limited', max_concurrency=20, rate=1e6)
+    )(fetch)
+
+    return app
+
+
+async def eval_sequentially(
+    app: Application,
+    line: str
+) -> None:
+    for _ in range(NUM_CALLS):
+        await app.eval_line(line)
+
+
+async def eval_concurrently(
+    app: Application,
+    line: str
+) -> None:
+    await asyncio.gather(*(app.eval_line(line) for _ in range(NUM_CALLS)))
+
+
+def main() -> None:
+    app = make_app()
+
+    for name in ('fetch', 'limited', 'rate_limited'):
+        report(
+            f'{NUM_CALLS} sequential calls of {name}',
+            lambda: asyncio.run(eval_sequentially(app, name)),
+            number=1,
+            repeat=5
+        )
+
+    for name in ('fetch', 'limited'):
+        report(
+            f'{NUM_CALLS} concurrent calls of {name} with '
+            f'{CALL_LATENCY * 1000:.0f}ms latency',
+            lambda: asyncio.run(eval_concurrently(app, f'{name} latency={CALL_LATENCY}')),
+            number=1,
+            repeat=3
+        )
+
+
+if __name__ == '__main__':
+    main()
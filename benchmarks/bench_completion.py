@@ -0,0 +1,233 @@
+"""Benchmarks for command line completion.
+
+Run from the repository root with::
+
+    python -m benchmarks.bench_completion
+
+"""
+
+import asyncio
+import time
+
+from typing import List
+
+from prompt_toolkit.completion import CompleteEvent, Completer, Completion
+from prompt_toolkit.document import Document
+
+from almanac import Application, WordCompleter
+
+from .utils import report
+
+
+def make_app(
+    num_commands: int
+) -> Application:
+    app = Application(with_style=False)
+
+    for i in range(num_commands):
+        async def command():
+            pass
+
+        app.cmd.register(app.cmd(name=f'endpoint_{i:06d}'))(command)
+
+    return app
+
+
+def complete(
+    app: Application,
+    text: str
+) -> None:
+    completer = app._session_opts['completer']
+    document = Document(text)
+    app.call_as_current_app_sync(
+        lambda: list(completer.get_completions(document, CompleteEvent()))
+    )
+
+
+def bench_command_names() -> None:
+    for num_commands in (100, 10_000):
+        app = make_app(num_commands)
+        report(
+            f'command name prefix with 10 matches, {num_commands} commands',
+            lambda: complete(app, 'endpoint_00000'),
+            number=200
+        )
+
+
+def make_argument_app() -> Application:
+    app = Application(with_style=False)
+
+    for i in range(20):
+        app.add_completers_for_type(
+            type(f'Unused{i}', (str,), {}), WordCompleter([f'unused_{i}'])
+        )
+
+    app.add_completers_for_type(str, WordCompleter(['alpha', 'beta', 'gamma']))
+
+    @app.cmd.register()
+    async def command(
+        a: str, b: int,
+        *,
+        k00: str = '', k01: str = '', k02: str = '', k03: str = '', k04: str = '',
+        k05: str = '', k06: str = '', k07: str = '', k08: str = '', k09: str = '',
+        k10: int = 0, k11: int = 0, k12: int = 0, k13: int = 0, k14: int = 0,
+        **kwargs: int
+    ):
+        pass
+
+    return app
+
+
+def bench_arguments() -> None:
+    app = make_argument_app()
+    report(
+        'keyword names, 17 keyword parameters',
+        lambda: complete(app, 'command x 1 k0'),
+        number=200
+    )
+    report(
+        'positional value with global type completers',
+        lambda: complete(app, 'command '),
+        number=200
+    )
+    report(
+        'keyword value with global type completers',
+        lambda: complete(app, 'command x 1 k05=a'),
+        number=200
+    )
+
+
+def bench_word_lists() -> None:
+    for num_words in (1_000, 100_000, 1_000_000):
+        words = [f'host-{i:07d}.example.com' for i in range(num_words)]
+        document = Document('host-00009')
+
+        report(
+            f'linear scan for 10 of {num_words} words',
+            lambda: [word for word in words if word.startswith('host-00009')],
+            number=5,
+            repeat=3
+        )
+        completer = WordCompleter(words, max_completions=100)
+        report(
+            f'indexed completion of 10 of {num_words} words',
+            lambda: list(completer.get_completions(document, CompleteEvent())),
+            number=200
+        )
+        report(
+            f'indexed completion of all {num_words} words, capped at 100',
+            lambda: list(completer.get_completions(Document(''), CompleteEvent())),
+            number=200
+        )
+
+
+def bench_dynamic_words() -> None:
+    def inventory() -> List[str]:
+        return [f'host-{i:05d}.example.com' for i in range(50_000)]
+
+    for label, completer in (
+        ('50k dynamic words, fetched per keystroke', WordCompleter(inventory)),
+        ('50k dynamic words, cached with ttl', WordCompleter(inventory, ttl=60)),
+    ):
+        document = Document('host-4999')
+        report(
+            label,
+            lambda: list(completer.get_completions(document, CompleteEvent())),
+            number=20
+        )
+
+
+class HugeCompleter(Completer):
+    """A completer over a large dataset, which it filters as it is iterated."""
+
+    def get_completions(
+        self,
+        document,
+        complete_event
+    ):
+        for i in range(1_000_000):
+            yield Completion(f'item-{i:07d}')
+
+
+def bench_max_completions() -> None:
+    for max_completions in (None, 1000):
+        app = Application(with_style=False, max_completions=max_completions)
+
+        @app.cmd.register()
+        @app.arg.item(completers=HugeCompleter())
+        async def show(item: str):
+            pass
+
+        report(
+            f'1M completions, max_completions={max_completions}',
+            lambda: complete(app, 'show item='),
+            number=1,
+            repeat=3
+        )
+
+
+class SlowCompleter(Completer):
+    """A synchronous completer that blocks for a while, like a remote lookup."""
+
+    def __init__(
+        self
+    ) -> None:
+        self.calls = 0
+
+    def get_completions(
+        self,
+        document,
+        complete_event
+    ):
+        self.calls += 1
+        time.sleep(0.02)
+        return []
+
+
+def bench_keystroke_burst() -> None:
+    app = Application(with_style=False)
+    slow_completer = SlowCompleter()
+
+    @app.cmd.register()
+    @app.arg.host(completers=slow_completer)
+    async def connect(host: str):
+        pass
+
+    completer = app._session_opts['completer']
+
+    async def type_burst() -> None:
+        # Each keystroke invalidates the completion of the previous one, as the
+        # prompt's buffer does.
+        for i in range(10):
+            completer.invalidate()
+            document = Document('connect host=' + 'x' * i)
+            asyncio.ensure_future(
+                consume(completer.get_completions_async(document, CompleteEvent()))
+            )
+            await asyncio.sleep(0.01)
+
+        await asyncio.sleep(0.2)
+
+    async def consume(completions) -> None:
+        async for _ in completions:
+            pass
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(type_burst())
+    loop.close()
+
+    print(f'{"slow completer runs for a burst of 10 keystrokes":<60} '
+          f'{slow_completer.calls:>10}')
+
+
+def main() -> None:
+    bench_command_names()
+    bench_arguments()
+    bench_word_lists()
+    bench_dynamic_words()
+    bench_max_completions()
+    bench_keystroke_burst()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Benchmarks for the overhead of dispatching a parsed command line to a command.
+
+Run from the repository root with::
+
+    python -m benchmarks.bench_dispatch
+
+"""
+
+import asyncio
+
+from typing import Optional, Union
+
+from almanac import Application
+
+from .utils import report
+
+
+NUM_DISPATCHES = 1000
+
+
+class Celsius(float):
+    pass
+
+
+class Label(str):
+    pass
+
+
+def make_app() -> Application:
+    app = Application(with_completion=False, with_style=False)
+
+    app.add_promoter_for_type(str, str)
+    app.add_promoter_for_type(Celsius, Celsius)
+    app.add_promoter_for_type(Label, Label)
+
+    for i in range(20):
+        app.add_promoter_for_type(type(f'Unused{i}', (), {}), lambda x: x)
+
+    @app.cmd.register()
+    async def small(a: int, b: str):
+        pass
+
+    @app.cmd.register()
+    async def hooked(a: int, b: str):
+        pass
+
+    @app.hook.before(hooked)
+    async def before_hooked(a: int, b: str):
+        pass
+
+    @app.hook.after(hooked)
+    async def after_hooked(a: int, b: str):
+        pass
+
+    @app.cmd.register()
+    async def large(
+        a0: int, a1: str, a2: float, a3: bool, a4: Celsius, a5: Label,
+        a6: int, a7: str, a8: float, a9: bool, a10: Celsius, a11: Label,
+        *args: Label,
+        k0: Optional[str] = None, k1: Union[int, Celsius] = 0, k2: Label = Label(),
+        k3: int = 0, k4: str = '', k5: float = 0.0, k6: bool = False,
+        k7: Celsius = Celsius(), k8: Label = Label(), k9: Optional[Label] = None,
+        **kwargs: Celsius
+    ):
+        pass
+
+    return app
+
+
+def bench_command(
+    app: Application,
+    label: str,
+    line: str
+) -> None:
+    parsed_args = app.parse_cmd_line(line).results
+    assert parsed_args is not None
+
+    loop = asyncio.new_event_loop()
+
+    async def dispatch_many() -> None:
+        for _ in range(NUM_DISPATCHES):
+            await app.command_engine.run(parsed_args.command, parsed_args)
+
+    total_us = report(
+        f'{label} (x{NUM_DISPATCHES}, total)',
+        lambda: loop.run_until_complete(dispatch_many()),
+        number=1
+    )
+    print(f'{label + " (per dispatch)":<60} {total_us / NUM_DISPATCHES:>10.2f} us')
+
+    loop.close()
+
+
+def main() -> None:
+    app = make_app()
+
+    bench_command(app, 'small command, 2 parameters', 'small 1 x')
+    bench_command(app, 'small command, before and after hooks', 'hooked 1 x')
+    bench_command(
+        app,
+        'large command, 24 parameters',
+        'large 1 a 1.5 true 2.5 b 2 c 3.5 false 4.5 d e f g '
+        'k0=x k1=2 k2=y k3=3 k4=z k5=1.5 k6=true k7=2.5 k8=w k9=v x=1.5 y=2.5'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Benchmarks for running commands as background jobs.
+
+Run from the repository root with::
+
+    python -m benchmarks.bench_jobs
+
+"""
+
+import asyncio
+
+from almanac import Application, NullIoContext
+
+from .utils import report
+
+NUM_REQUESTS = 200
+REQUEST_LATENCY = 0.01
+
+
+def make_app() -> Application:
+    app = Application(with_style=False, io_context_cls=NullIoContext)
+
+    @app.cmd.register()
+    async def fetch(url: str, *, latency: float = 0.0):
+        app.io.raw(f'fetching {url}')
+        await asyncio.sleep(latency)
+
+    return app
+
+
+async def fetch_in_foreground(
+    app: Application,
+    latency: float
+) -> None:
+    for i in range(NUM_REQUESTS):
+        await app.eval_line(f'fetch "http://host/{i}" latency={latency}')
+
+
+async def fetch_in_background(
+    app: Application,
+    latency: float
+) -> None:
+    for i in range(NUM_REQUESTS):
+        await app.eval_line(f'fetch "http://host/{i}" latency={latency} &')
+
+    for job in app.jobs:
+        await job.wait()
+        app.jobs.remove(job.id)
+
+
+def main() -> None:
+    app = make_app()
+
+    for latency in (0.0, REQUEST_LATENCY):
+        for mode, func in (
+            ('foreground', fetch_in_foreground),
+            ('background', fetch_in_background)
+        ):
+            report(
+                f'{NUM_REQUESTS} {mode} requests with {latency * 1000:.0f}ms latency',
+                lambda: asyncio.run(func(app, latency)),
+                number=1,
+                repeat=3
+            )
+
+
+if __name__ == '__main__':
+    main()
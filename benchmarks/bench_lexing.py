@@ -0,0 +1,69 @@
+"""Benchmarks for syntax highlighting of command lines.
+
+Run from the repository root with::
+
+    python -m benchmarks.bench_lexing
+
+"""
+
+from prompt_toolkit.document import Document
+from prompt_toolkit.lexers import PygmentsLexer
+
+from almanac import Application, CommandLineLexer, get_lexer_cls_for_app
+
+from .utils import report
+
+
+LINE = 'cmd0 1 2.5 "a string" key=[1, 2, 3] other={a: "b"}'
+
+
+def make_app(
+    num_commands: int
+) -> Application:
+    app = Application(with_completion=False, with_style=False)
+
+    for i in range(num_commands):
+        async def command(*args, **kwargs):
+            pass
+
+        app.cmd.register(app.cmd(name=f'cmd{i}'))(command)
+
+    return app
+
+
+def lex_line(
+    lexer,
+    document: Document
+) -> None:
+    get_line = lexer.lex_document(document)
+    get_line(0)
+
+
+def main() -> None:
+    document = Document(LINE)
+
+    for num_commands in (10, 10_000):
+        app = make_app(num_commands)
+
+        pygments_lexer = PygmentsLexer(get_lexer_cls_for_app(app))
+        report(
+            f'pygments lexer, {num_commands} commands',
+            lambda: lex_line(pygments_lexer, document)
+        )
+
+        # A fresh lexer with an empty cache for each call measures the first render of
+        # a line, while the shared lexer measures re-renders of an unchanged line.
+        report(
+            f'command line lexer (uncached), {num_commands} commands',
+            lambda: lex_line(CommandLineLexer(app), document)
+        )
+
+        lexer = CommandLineLexer(app)
+        report(
+            f'command line lexer (cached), {num_commands} commands',
+            lambda: lex_line(lexer, document)
+        )
+
+
+if __name__ == '__main__':
+    main()
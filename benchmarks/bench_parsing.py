@@ -0,0 +1,106 @@
+"""Benchmarks for the command line parser engines.
+
+Run from the repository root with::
+
+    python -m benchmarks.bench_parsing
+
+"""
+
+from almanac import (
+    Application,
+    fast_parse_cmd_line,
+    IncrementalParser,
+    parse_cmd_line,
+    ParseCache
+)
+
+from .utils import report
+
+
+LINES = {
+    'short': 'cd /some/path',
+    'positionals': 'cmd 1 2.5 true "a string" [1, 2, 3]',
+    'kwarg-heavy': ' '.join(
+        f'key{i}=[{i}, "{i}", {i}.5]' for i in range(20)
+    ),
+    'dict literal': 'cmd x={a: 1, b: [1, 2], c: {d: "e"}} y=2',
+    'partial': 'cmd 1 2 key=[1, 2',
+}
+
+
+def bench_partial_lines() -> None:
+    """Compare lines that fail to fully parse with similar lines that do not."""
+    full_line = 'cmd 1 2 key=[1, 2, 3] other="value"'
+    partial_line = 'cmd 1 2 key=[1, 2, 3] other="value'
+
+    for label, parse_func in (
+        ('pyparsing', parse_cmd_line),
+        ('fast', fast_parse_cmd_line),
+    ):
+        report(f'full line ({label})', lambda: parse_func(full_line), number=200)
+        report(f'partial line ({label})', lambda: parse_func(partial_line), number=200)
+
+
+def bench_typing() -> None:
+    """Simulate typing the tail of a line that starts with a long pasted literal."""
+    prefix = 'cmd data=[' + ', '.join(f'"item{i}"' for i in range(200)) + '] '
+    tail = 'other_key={a: 1, b: [1, 2, 3]} final="value"'
+    keystrokes = [prefix + tail[:i] for i in range(len(tail) + 1)]
+
+    def type_with_full_parses() -> None:
+        for text in keystrokes:
+            fast_parse_cmd_line(text)
+
+    def type_with_incremental_parses() -> None:
+        parser = IncrementalParser()
+        for text in keystrokes:
+            parser.parse(text)
+
+    num_keystrokes = len(keystrokes)
+    full_us = report('typing tail (full re-parse, total)', type_with_full_parses, number=5)
+    incremental_us = report(
+        'typing tail (incremental, total)', type_with_incremental_parses, number=5
+    )
+    print(f'{"per keystroke (full re-parse)":<60} {full_us / num_keystrokes:>10.2f} us')
+    print(f'{"per keystroke (incremental)":<60} {incremental_us / num_keystrokes:>10.2f} us')
+
+
+def bench_parse_cache() -> None:
+    """Measure re-parsing a recently parsed line through an application's cache."""
+    line = 'cmd ' + LINES['kwarg-heavy']
+    parse_cache = ParseCache(fast_parse_cmd_line)
+    parse_cache.parse(line)
+
+    report('kwarg-heavy (cache hit)', lambda: parse_cache.parse(line))
+
+
+def bench_script_validation() -> None:
+    """Measure validating a 10,000 line script against an application's commands."""
+    app = Application(with_completion=False, with_style=False)
+
+    @app.cmd.register()
+    async def cmd(a: int, b: str, *, key: int = 0, other: str = ''):
+        pass
+
+    script = [f'cmd {i} "value {i}" key={i} other=x' for i in range(10_000)]
+    report('validate 10k line script', lambda: app.validate_script(script), number=1)
+
+
+def main() -> None:
+    for name, line in LINES.items():
+        line = f'cmd {line}' if not line.startswith(('cd', 'cmd')) else line
+
+        for label, parse_func in (
+            ('pyparsing', parse_cmd_line),
+            ('fast', fast_parse_cmd_line),
+        ):
+            report(f'{name} ({label})', lambda: parse_func(line), number=200)
+
+    bench_partial_lines()
+    bench_typing()
+    bench_parse_cache()
+    bench_script_validation()
+
+
+if __name__ == '__main__':
+    main()
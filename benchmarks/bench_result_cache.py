@@ -0,0 +1,54 @@
+"""Benchmarks for memoizing the results of commands.
+
+Run from the repository root with::
+
+    python -m benchmarks.bench_result_cache
+
+"""
+
+import asyncio
+
+from almanac import Application, NullIoContext
+
+from .utils import report
+
+NUM_CALLS = 100
+LOOKUP_LATENCY = 0.001
+
+
+def make_app() -> Application:
+    app = Application(with_style=False, io_context_cls=NullIoContext)
+
+    async def status(host: str, *, detail: list = []):
+        await asyncio.sleep(LOOKUP_LATENCY)
+        app.io.raw(f'{host} is up')
+
+    app.cmd.register()(status)
+    app.cmd.register(app.cmd(name='cached_status', cache=True))(status)
+
+    return app
+
+
+async def eval_repeatedly(
+    app: Application,
+    line: str
+) -> None:
+    for _ in range(NUM_CALLS):
+        await app.eval_line(line)
+
+
+def main() -> None:
+    app = make_app()
+
+    for name in ('status', 'cached_status'):
+        line = f'{name} "host-1" detail=["cpu", "disk"]'
+        report(
+            f'{NUM_CALLS} calls of {name}',
+            lambda: asyncio.run(eval_repeatedly(app, line)),
+            number=1,
+            repeat=3
+        )
+
+
+if __name__ == '__main__':
+    main()
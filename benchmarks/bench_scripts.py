@@ -0,0 +1,111 @@
+"""Benchmarks for running scripts of command lines.
+
+Run from the repository root with::
+
+    python -m benchmarks.bench_scripts
+
+"""
+
+import asyncio
+import io
+import sys
+import timeit
+
+from prompt_toolkit.application import create_app_session
+from prompt_toolkit.input import create_pipe_input
+from prompt_toolkit.output import DummyOutput
+
+from almanac import Application
+
+from .utils import report
+
+NUM_LINES = 10_000
+
+
+def make_app() -> Application:
+    app = Application(with_style=False)
+
+    @app.cmd.register()
+    async def provision(host: str, *, cpus: int = 1, tags: list = []):
+        await asyncio.sleep(0)
+
+    return app
+
+
+def make_script() -> list:
+    return [
+        f'provision "host-{i:05d}" cpus={i % 8} tags=["a", "b", {i}]'
+        for i in range(NUM_LINES)
+    ]
+
+
+async def eval_lines(
+    app: Application,
+    lines: list
+) -> None:
+    for line in lines:
+        await app.eval_line(line)
+
+
+def bench_scripts() -> None:
+    app = make_app()
+    script = make_script()
+
+    report(
+        f'eval_line for each of {NUM_LINES} lines',
+        lambda: asyncio.run(eval_lines(app, script)),
+        number=1,
+        repeat=3
+    )
+    report(
+        f'run_script of {NUM_LINES} lines',
+        lambda: asyncio.run(app.run_script(script)),
+        number=1,
+        repeat=3
+    )
+
+
+def prompt_piped(
+    lines: list,
+    interactive: bool
+) -> None:
+    app = make_app()
+    text = ''.join(line + '\n' for line in lines)
+
+    if not interactive:
+        stdin, sys.stdin = sys.stdin, io.StringIO(text)
+        try:
+            asyncio.run(app.prompt())
+        finally:
+            sys.stdin = stdin
+        return
+
+    # Feed the same lines through a full prompt session, as a pipe into an
+    # application would have been before non-interactive input was detected.
+    with create_pipe_input() as pipe_input:
+        pipe_input.send_text(text)
+        pipe_input.close()
+        with create_app_session(input=pipe_input, output=DummyOutput()):
+            asyncio.run(app.prompt(interactive=True))
+
+
+def bench_piped_prompt() -> None:
+    # A prompt session is far slower per line, so it is fed fewer of them.
+    for interactive, num_lines in ((True, 200), (False, NUM_LINES)):
+        script = make_script()[:num_lines]
+        best = min(timeit.repeat(
+            lambda: prompt_piped(script, interactive), number=1, repeat=3
+        ))
+
+        mode = 'prompt session' if interactive else 'non-interactive prompt'
+        label = f'{mode} reading {num_lines} piped lines'
+        print(f'{label:<60} {num_lines / best:>10.0f} lines/sec')
+
+
+def main() -> None:
+    bench_scripts()
+    bench_piped_prompt()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Benchmarks for the startup cost of one-shot application invocations.
+
+Each measurement runs a fresh interpreter, as a cron job invoking an application would.
+Run from the repository root with::
+
+    python -m benchmarks.bench_startup
+
+"""
+
+import subprocess
+import sys
+import timeit
+
+_ONE_SHOT_SCRIPT = '''
+import asyncio
+from almanac import make_standard_app
+
+app = make_standard_app()
+
+@app.cmd.register()
+async def greet(name: str, *, times: int = 1):
+    return 0
+
+raise SystemExit(asyncio.run(app.run_argv(['greet', 'world', 'times=2'])))
+'''
+
+_PROMPT_SESSION_SCRIPT = '''
+from prompt_toolkit import PromptSession
+from prompt_toolkit.input import create_pipe_input
+from prompt_toolkit.output import DummyOutput
+from almanac import make_standard_app
+
+app = make_standard_app()
+with create_pipe_input() as pipe_input:
+    PromptSession(input=pipe_input, output=DummyOutput(), **app._session_opts)
+'''
+
+
+def run_python(
+    code: str
+) -> None:
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+def report_process(
+    label: str,
+    code: str,
+    *,
+    repeat: int = 10
+) -> float:
+    best_ms = min(timeit.repeat(lambda: run_python(code), number=1, repeat=repeat)) * 1e3
+    print(f'{label:<60} {best_ms:>10.2f} ms')
+    return best_ms
+
+
+def bench_startup() -> None:
+    report_process('bare interpreter', 'pass')
+    report_process('import almanac', 'import almanac')
+    report_process('one-shot run_argv of a command', _ONE_SHOT_SCRIPT)
+    report_process('app with a prompt session', _PROMPT_SESSION_SCRIPT)
+
+
+def main() -> None:
+    bench_startup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Benchmarks for "did you mean" suggestions of misspelled names.
+
+Run from the repository root with::
+
+    python -m benchmarks.bench_suggestions
+
+"""
+
+from almanac import Application
+
+from .bench_completion import make_app
+from .utils import report
+
+
+def make_kwarg_app(
+    num_arguments: int
+) -> Application:
+    app = Application(with_style=False)
+
+    namespace: dict = {}
+    params = ', '.join(f'option_{i:04d}: int = 0' for i in range(num_arguments))
+    exec(f'async def command(*, {params}):\n    pass', namespace)
+
+    app.cmd.register(app.cmd(name='command'))(namespace['command'])
+    return app
+
+
+def bench_command_suggestions() -> None:
+    for num_commands in (100, 10_000):
+        app = make_app(num_commands)
+        engine = app.command_engine
+        report(
+            f'suggestions for a misspelled command, {num_commands} commands',
+            lambda: engine.get_suggestions('endpont_000042'),
+            number=20
+        )
+        report(
+            f'suggestions for an unrelated name, {num_commands} commands',
+            lambda: engine.get_suggestions('quit'),
+            number=20
+        )
+
+
+def bench_argument_suggestions() -> None:
+    app = make_kwarg_app(200)
+    engine = app.command_engine
+    report(
+        'suggestions for a misspelled argument, 200 arguments',
+        lambda: engine.get_argument_suggestions('command', 'optoin_0042'),
+        number=200
+    )
+
+
+def main() -> None:
+    bench_command_suggestions()
+    bench_argument_suggestions()
+
+
+if __name__ == '__main__':
+    main()
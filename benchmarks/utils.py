@@ -0,0 +1,19 @@
+"""Shared helpers for the almanac benchmark scripts."""
+
+import timeit
+
+from typing import Callable
+
+
+def report(
+    label: str,
+    func: Callable[[], object],
+    *,
+    number: int = 1000,
+    repeat: int = 5
+) -> float:
+    """Time a callable, printing and returning the best per-call time in microseconds."""
+    best = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+    best_us = best * 1e6
+    print(f'{label:<60} {best_us:>10.2f} us')
+    return best_us
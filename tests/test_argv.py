@@ -0,0 +1,85 @@
+"""Tests for one-shot execution of commands from command-line arguments."""
+
+import pytest
+
+from almanac import ExitCodes, parse_argv, ParserEngine
+
+from .utils import get_test_app
+
+
+@pytest.mark.parametrize('parser_engine', list(ParserEngine))
+def test_parse_argv(parser_engine):
+    argv = [
+        'deploy', '3', 'hello world', '"quoted"', 'x=[1, 2]', 'flag=true', 'empty=',
+        'a b=c', 'k=v=w', ' 4'
+    ]
+    parsed = parse_argv(argv, parser_engine=parser_engine)
+
+    assert parsed.command == 'deploy'
+    assert parsed.positionals == (3, 'hello world', 'quoted', 'a b=c', ' 4')
+    assert parsed.kwargs == {'x': [1, 2], 'flag': True, 'empty': '', 'k': 'v=w'}
+
+    text = ' '.join(argv)
+    assert [text[s:e] for s, e in parsed.positional_spans] == [
+        '3', 'hello world', '"quoted"', 'a b=c', ' 4'
+    ]
+    assert [
+        (text[n.start:n.end], text[v.start:v.end]) for n, v in parsed.kwarg_spans
+    ] == [('x', '[1, 2]'), ('flag', 'true'), ('empty', ''), ('k', 'v=w')]
+
+    with pytest.raises(ValueError):
+        parse_argv([])
+
+
+@pytest.mark.asyncio
+async def test_run_argv():
+    app = get_test_app()
+    app.bag.events = []
+
+    @app.on_init()
+    async def init_always():
+        app.bag.events.append('init')
+
+    @app.on_init(resource='db')
+    async def connect():
+        app.bag.events.append('connect')
+
+    @app.on_exit(resource='db')
+    async def disconnect():
+        app.bag.events.append('disconnect')
+
+    @app.on_init(resource='cache')
+    async def warm_cache():
+        app.bag.events.append('warm')
+
+    @app.cmd.register()
+    @app.cmd(requires='db')
+    async def query(table: str, *, limit: int = 10):
+        app.bag.events.append((table, limit))
+
+    @app.cmd.register()
+    async def status():
+        app.bag.events.append('status')
+        return 3
+
+    assert app.command_engine['query'].requires == ('db',)
+    assert app.command_engine['status'].requires == ()
+
+    assert await app.run_argv(['query', 'users', 'limit=5']) == ExitCodes.OK
+    assert app.bag.events == ['init', 'connect', ('users', 5), 'disconnect']
+
+    app.bag.events = []
+    assert await app.run_argv(['status']) == 3
+    assert app.bag.events == ['init', 'status']
+
+    app.bag.events = []
+    assert await app.run_argv(['query']) == ExitCodes.ERR_COMMAND_INVALID_ARGUMENTS
+    assert await app.run_argv(['query', 'users', 'limt=5']) == (
+        ExitCodes.ERR_COMMAND_INVALID_ARGUMENTS
+    )
+    assert await app.run_argv(['qeury', 'users']) == ExitCodes.ERR_COMMAND_NONEXISTENT
+    assert await app.run_argv([]) == ExitCodes.ERR_COMMAND_NONEXISTENT
+    assert 'warm' not in app.bag.events
+
+    # Without a session, no completer or lexer is ever created.
+    assert '_session_opts' not in vars(app)
@@ -0,0 +1,124 @@
+"""Tests for cancelling commands, by interrupt or by timeout."""
+
+import asyncio
+import math
+import os
+import signal
+
+import pytest
+
+from almanac import (
+    CommandRegistrationError,
+    CommandTimeoutError,
+    ExitCodes,
+    FrozenAccessError,
+    make_standard_app,
+    NullIoContext
+)
+
+from .utils import get_test_app
+
+
+@pytest.mark.asyncio
+async def test_command_timeout():
+    app = get_test_app()
+    app.bag.timed_out = []
+
+    @app.hook.exception(CommandTimeoutError, allow_overwrite=True)
+    async def hook(exc: CommandTimeoutError):
+        app.bag.timed_out.append((exc.command_name, exc.timeout))
+
+    @app.cmd.register()
+    @app.cmd(timeout=0.01)
+    async def hang():
+        await asyncio.Event().wait()
+
+    @app.cmd.register()
+    @app.cmd(timeout=10)
+    async def quick():
+        return 3
+
+    assert hang.timeout == 0.01
+    assert await app.eval_line('hang') == ExitCodes.ERR_COMMAND_TIMEOUT
+    assert app.bag.timed_out == [('hang', 0.01)]
+    assert await app.eval_line('quick') == 3
+
+
+@pytest.mark.asyncio
+async def test_default_command_timeout():
+    app = make_standard_app(io_context_cls=NullIoContext, command_timeout=0.01)
+    assert app.command_timeout == 0.01
+
+    @app.cmd.register()
+    async def hang():
+        await asyncio.sleep(0.05)
+
+    @app.cmd.register()
+    @app.cmd(timeout=math.inf)
+    async def exempt():
+        await asyncio.sleep(0.05)
+        return 4
+
+    assert await app.eval_line('hang') == ExitCodes.ERR_COMMAND_TIMEOUT
+    assert await app.eval_line('exempt') == 4
+
+
+@pytest.mark.asyncio
+async def test_command_timeout_error_is_not_a_timeout():
+    app = get_test_app()
+
+    @app.cmd.register()
+    @app.cmd(timeout=10)
+    async def fail():
+        raise asyncio.TimeoutError()
+
+    assert await app.eval_line('fail') == ExitCodes.ERR_RUNTIME_EXC
+
+
+def test_invalid_timeouts():
+    app = get_test_app()
+
+    with pytest.raises(CommandRegistrationError):
+        @app.cmd.register()
+        @app.cmd(timeout=0)
+        async def cmd():
+            pass
+
+    with pytest.raises(ValueError):
+        make_standard_app(command_timeout=-1)
+
+    @app.cmd.register()
+    async def other():
+        pass
+
+    with pytest.raises(FrozenAccessError):
+        other.timeout = 1
+
+
+@pytest.mark.asyncio
+async def test_interrupt_cancels_command():
+    app = get_test_app()
+    app.bag.cancelled = False
+
+    @app.cmd.register()
+    async def hang():
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            app.bag.cancelled = True
+            raise
+
+    @app.cmd.register()
+    async def quick():
+        return 5
+
+    previous_handler = signal.getsignal(signal.SIGINT)
+    loop = asyncio.get_running_loop()
+    loop.call_later(0.01, os.kill, os.getpid(), signal.SIGINT)
+
+    assert await app.eval_line('hang', cancel_on_interrupt=True) == \
+        ExitCodes.ERR_COMMAND_CANCELLED
+    assert app.bag.cancelled
+    assert signal.getsignal(signal.SIGINT) is previous_handler
+
+    assert await app.eval_line('quick', cancel_on_interrupt=True) == 5
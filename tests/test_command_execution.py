@@ -2,6 +2,8 @@
 
 import pytest
 
+from typing import Optional, Union
+
 from almanac import (
     MissingArgumentsError,
     NoSuchArgumentError,
@@ -46,6 +48,60 @@ async def test_var_args_type_promotions():
     await app.eval_line('cmd_var_kw_args one=18 two=18 three=18')
 
 
+@pytest.mark.asyncio
+async def test_promoters_added_after_command_registration():
+    app = get_test_app()
+    app.bag.values = []
+
+    @app.cmd.register()
+    async def cmd(a: int, b: Optional[int] = None, *, c: float = 0.0):
+        app.bag.values.append((a, b, c))
+
+    assert app.command_engine.promotion_plan_for(app.command_engine['cmd']) == ()
+
+    app.add_promoter_for_type(int, lambda x: x + 1)
+    app.add_promoter_for_type(float, lambda x: x * 2)
+
+    plan = app.command_engine.promotion_plan_for(app.command_engine['cmd'])
+    assert [step.arg_name for step in plan] == ['a', 'b', 'c']
+
+    await app.eval_line('cmd 1 c=1.5')
+    await app.eval_line('cmd 1 2')
+    assert app.bag.values == [(2, None, 3.0), (2, 3, 0.0)]
+
+
+@pytest.mark.asyncio
+async def test_each_matching_promoter_receives_the_bound_value():
+    class A:
+        pass
+
+    class B:
+        pass
+
+    app = get_test_app()
+    app.bag.calls = []
+    app.bag.values = []
+
+    def promote_a(x):
+        app.bag.calls.append(('A', x))
+        return 'promA'
+
+    def promote_b(x):
+        app.bag.calls.append(('B', x))
+        return 'promB'
+
+    app.add_promoter_for_type(A, promote_a)
+    app.add_promoter_for_type(B, promote_b)
+
+    @app.cmd.register()
+    async def cmd(x: Union[A, B], *args: Union[A, B], **kwargs: Union[A, B]):
+        app.bag.values.append((x, args, kwargs))
+
+    await app.eval_line('cmd 5 6 y=7')
+    assert app.bag.calls == [('A', 5), ('B', 5), ('A', 6), ('B', 6), ('A', 7), ('B', 7)]
+    assert app.bag.values == [('promB', ('promB',), {'y': 'promB'})]
+
+
 @pytest.mark.asyncio
 async def test_missing_pos_args():
     app = get_test_app(propagate_runtime_exceptions=True)
@@ -117,6 +173,7 @@ async def test_extra_kw_args():
     with pytest.raises(NoSuchArgumentError) as ctx:
         await app.eval_line('some_command a=1 b="a string" x=False')
     assert ctx.value.names == ('a',)
+    assert ctx.value.command_name == 'some_command'
 
     with pytest.raises(NoSuchArgumentError) as ctx:
         await app.eval_line('some_command A=1 a=1 b="a string" x=False')
@@ -125,3 +182,21 @@ async def test_extra_kw_args():
     with pytest.raises(NoSuchArgumentError) as ctx:
         await app.eval_line('some_command A=1 b=2 c=3 x=True y=4 z=[1,2,3]')
     assert ctx.value.names == ('c', 'y', 'z',)
+
+
+@pytest.mark.asyncio
+async def test_mutated_arguments_do_not_leak_between_runs():
+    app = get_test_app()
+    app.bag.seen = []
+
+    @app.cmd.register()
+    async def grow(xs: list = [], *, ys: list = [], opts: dict = {}):
+        xs.append(8)
+        ys.append(8)
+        opts.setdefault('nested', {'n': []})['n'].append(8)
+        app.bag.seen.append((list(xs), list(ys), dict(opts)))
+
+    for _ in range(3):
+        await app.eval_line('grow [1] ys=[2] opts={"nested": {"n": [3]}}')
+
+    assert app.bag.seen == [([1, 8], [2, 8], {'nested': {'n': [3, 8]}})] * 3
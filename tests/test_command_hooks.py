@@ -1,10 +1,14 @@
 """Tests for application event hooking."""
 
+import asyncio
+
 import pytest
 
 from almanac import (
     current_app,
+    HookMode,
     InvalidCallbackTypeError,
+    NoSuchArgumentError,
     NoSuchCommandError,
     PagePath
 )
@@ -126,3 +130,107 @@ async def test_non_existent_command_hook_registration():
 
     assert app.bag.before_hook_did_fire is True
     assert app.bag.after_hook_did_fire is True  # type:ignore
+
+
+@pytest.mark.asyncio
+async def test_commands_without_hooks_skip_hook_dispatch():
+    app = get_test_app()
+
+    @app.cmd.register()
+    async def unhooked():
+        pass
+
+    @app.cmd.register()
+    async def hooked():
+        pass
+
+    @app.hook.after(hooked)
+    async def after_hooked():
+        pass
+
+    assert unhooked not in app.command_engine._before_hook_chains
+    assert unhooked not in app.command_engine._after_hook_chains
+    assert hooked not in app.command_engine._before_hook_chains
+    assert hooked in app.command_engine._after_hook_chains
+
+
+@pytest.mark.asyncio
+async def test_sequential_hooks_run_in_order():
+    app = get_test_app()
+    app.bag.events = []
+
+    @app.cmd.register()
+    async def my_command():
+        current_app().bag.events.append('command')
+
+    @app.hook.before(my_command, mode=HookMode.SEQUENTIAL)
+    async def slow_hook():
+        await asyncio.sleep(0.01)
+        current_app().bag.events.append('slow')
+
+    @app.hook.before(my_command)
+    async def concurrent_hook_one():
+        current_app().bag.events.append('one')
+
+    @app.hook.before(my_command)
+    async def concurrent_hook_two():
+        current_app().bag.events.append('two')
+
+    @app.hook.before(my_command, mode=HookMode.SEQUENTIAL)
+    async def last_hook():
+        current_app().bag.events.append('last')
+
+    await app.eval_line('my_command')
+    assert app.bag.events == ['slow', 'one', 'two', 'last', 'command']
+
+
+@pytest.mark.asyncio
+async def test_pipeline_hooks_transform_arguments():
+    app = get_test_app()
+    app.bag.seen = []
+
+    @app.cmd.register()
+    async def greet(name: str, *, times: int = 1):
+        current_app().bag.seen.append((name, times))
+
+    @app.hook.before(greet, mode=HookMode.PIPELINE)
+    async def normalize_name(name: str, *, times: int = 1):
+        return {'name': name.strip().title()}
+
+    @app.hook.before(greet, mode=HookMode.PIPELINE)
+    async def double_times(name: str, *, times: int = 1):
+        assert name == 'Alice'
+        return {'times': times * 2}
+
+    @app.hook.before(greet, mode=HookMode.PIPELINE)
+    async def no_changes(name: str, *, times: int = 1):
+        return None
+
+    @app.hook.after(greet)
+    async def after_greet(name: str, *, times: int = 1):
+        current_app().bag.seen.append(('after', name, times))
+
+    await app.eval_line('greet "  alice " times=2')
+    assert app.bag.seen == [('Alice', 4), ('after', 'Alice', 4)]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_hook_with_unknown_argument():
+    app = get_test_app()
+    app.bag.exc = None
+
+    @app.cmd.register()
+    async def my_command(x: int):
+        pass
+
+    @app.hook.before(my_command, mode=HookMode.PIPELINE)
+    async def bad_pipeline(x: int):
+        return {'y': 1}
+
+    @app.hook.exception(NoSuchArgumentError, allow_overwrite=True)
+    async def hook_no_such_argument(exc: NoSuchArgumentError):
+        current_app().bag.exc = exc
+
+    await app.eval_line('my_command 1')
+    assert isinstance(app.bag.exc, NoSuchArgumentError)
+    assert app.bag.exc.names == ('y',)
@@ -0,0 +1,142 @@
+"""Tests for the concurrency and rate limits of commands."""
+
+import asyncio
+import time
+
+import pytest
+
+from almanac import (
+    CommandLimitError,
+    CommandLimits,
+    CommandRegistrationError,
+    ExitCodes,
+    LimitPolicy,
+    RateLimit
+)
+
+from .utils import get_test_app
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_queues():
+    app = get_test_app()
+    app.bag.running = 0
+    app.bag.peak = 0
+    app.bag.order = []
+
+    @app.cmd.register()
+    @app.cmd(max_concurrency=2)
+    async def fetch(i: int):
+        app.bag.running += 1
+        app.bag.peak = max(app.bag.peak, app.bag.running)
+        await asyncio.sleep(0.01)
+        app.bag.running -= 1
+        app.bag.order.append(i)
+
+    assert fetch.limits == CommandLimits(max_concurrency=2)
+
+    exit_codes = await asyncio.gather(*(app.eval_line(f'fetch {i}') for i in range(6)))
+    assert exit_codes == [None] * 6
+    assert app.bag.peak == 2
+    assert app.bag.order == list(range(6))
+
+    info = app.command_engine.limiter_for('fetch').info()
+    assert (info.running, info.waiting, info.peak_running) == (0, 0, 2)
+    assert (info.admitted, info.queued, info.rejected) == (6, 4, 0)
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_rejects():
+    app = get_test_app()
+    release = asyncio.Event()
+
+    @app.cmd.register()
+    @app.cmd(max_concurrency=1, limit_policy=LimitPolicy.REJECT)
+    async def fetch():
+        await release.wait()
+
+    first = asyncio.ensure_future(app.eval_line('fetch'))
+    await asyncio.sleep(0)
+    assert await app.eval_line('fetch') == ExitCodes.ERR_COMMAND_REJECTED
+
+    release.set()
+    assert await first is None
+    assert await app.eval_line('fetch') is None
+
+    info = app.command_engine.limiter_for('fetch').info()
+    assert (info.admitted, info.rejected) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_queues():
+    app = get_test_app()
+    app.bag.times = []
+
+    @app.cmd.register()
+    @app.cmd(rate=RateLimit(per_second=100, burst=2))
+    async def ping():
+        app.bag.times.append(time.monotonic())
+
+    start = time.monotonic()
+    await asyncio.gather(*(app.eval_line('ping') for _ in range(6)))
+
+    # Two calls are admitted at once, and then one every 10ms.
+    assert app.bag.times[-1] - start >= 0.035
+    assert app.command_engine.limiter_for('ping').info().queued == 4
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_rejects():
+    app = get_test_app()
+    app.bag.limits = []
+
+    @app.hook.exception(CommandLimitError, allow_overwrite=True)
+    async def hook(exc: CommandLimitError):
+        app.bag.limits.append((exc.command_name, exc.limit))
+
+    @app.cmd.register()
+    @app.cmd(rate=1, limit_policy=LimitPolicy.REJECT)
+    async def ping():
+        pass
+
+    assert await app.eval_line('ping') is None
+    assert await app.eval_line('ping') == ExitCodes.ERR_COMMAND_REJECTED
+    assert app.bag.limits == [('ping', 'rate')]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_releases_its_place():
+    app = get_test_app()
+    release = asyncio.Event()
+
+    @app.cmd.register()
+    @app.cmd(max_concurrency=1)
+    async def fetch():
+        await release.wait()
+
+    first = asyncio.ensure_future(app.eval_line('fetch'))
+    waiter = asyncio.ensure_future(app.eval_line('fetch'))
+    await asyncio.sleep(0)
+
+    limiter = app.command_engine.limiter_for('fetch')
+    assert limiter.info().waiting == 1
+
+    waiter.cancel()
+    await asyncio.sleep(0)
+    assert limiter.info().waiting == 0
+
+    release.set()
+    await first
+    assert limiter.info().running == 0
+    assert await app.eval_line('fetch') is None
+
+
+def test_invalid_limits():
+    app = get_test_app()
+
+    for kwargs in ({'max_concurrency': 0}, {'rate': 0}, {'rate': RateLimit(1, burst=0)}):
+        with pytest.raises(CommandRegistrationError):
+            @app.cmd.register()
+            @app.cmd(**kwargs)
+            async def cmd():
+                pass
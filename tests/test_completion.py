@@ -0,0 +1,536 @@
+"""Tests for locating the token under the cursor and completing it."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from prompt_toolkit.completion import CompleteEvent, Completer, Completion
+from prompt_toolkit.document import Document
+
+from almanac import (
+    Application,
+    fast_parse_cmd_line,
+    incomplete_token_at_cursor,
+    TokenKind,
+    WordCompleter
+)
+
+from .utils import get_test_app
+
+
+def _token_at_cursor(text, cursor_position=None):
+    document = Document(text, cursor_position)
+    return incomplete_token_at_cursor(document, fast_parse_cmd_line(text))
+
+
+def test_parsed_tokens():
+    results = fast_parse_cmd_line('cmd 1 "a b" key=[1, 2]').results
+    assert [token.kind for token in results.tokens] == [
+        TokenKind.COMMAND,
+        TokenKind.POSITIONAL,
+        TokenKind.POSITIONAL,
+        TokenKind.KWARG_NAME,
+        TokenKind.KWARG_VALUE,
+    ]
+
+    assert results.token_at(0).kind == TokenKind.COMMAND
+    assert results.token_at(3).kind == TokenKind.COMMAND
+    assert results.token_at(8).kind == TokenKind.POSITIONAL
+    assert results.token_at(15).kind == TokenKind.KWARG_NAME
+    assert results.token_at(17).kind == TokenKind.KWARG_VALUE
+    assert results.token_index_at(4) == 1
+
+    results = fast_parse_cmd_line('cmd 1  x').results
+    assert results.token_at(6) is None
+
+
+@pytest.mark.parametrize('text, cursor_position, expected', [
+    ('cmd ', None, 'ambiguous '),
+    ('cmd ab', None, 'ambiguous ab'),
+    ('cmd 1.5', None, 'ambiguous 1.5'),
+    ('cmd "a b', None, 'positional "a b'),
+    ('cmd "a b" "c d', None, 'positional "c d'),
+    ('cmd "a b"', None, 'positional "a b"'),
+    ('cmd [1, 2]', None, 'ambiguous '),
+    ('cmd key=', None, 'kwarg key='),
+    ('cmd key="a b', None, 'kwarg key="a b'),
+    ('cmd key=val', None, 'kwarg key=val'),
+    ('cmd key=val other', 10, 'kwarg key=va'),
+    ('cmd key=val other', 6, 'ambiguous ke'),
+    ('cmd "a b" other', 8, 'positional "a b'),
+    ('cmd aaa bbb', 4, 'ambiguous '),
+])
+def test_incomplete_token_at_cursor(text, cursor_position, expected):
+    assert str(_token_at_cursor(text, cursor_position)) == expected
+
+
+def _completions(app, text, cursor_position=None):
+    document = Document(text, cursor_position)
+    completer = app._session_opts['completer']
+    return app.call_as_current_app_sync(
+        lambda: [
+            (c.text, c.start_position)
+            for c in completer.get_completions(document, CompleteEvent())
+        ]
+    )
+
+
+@pytest.mark.asyncio
+async def test_completions_in_middle_of_line():
+    app = get_test_app()
+
+    @app.cmd.register()
+    @app.arg.color(completers=WordCompleter(['red', 'green', 'blue']))
+    async def paint(color: str, *, shade: int = 0):
+        pass
+
+    assert _completions(app, 'pai red', 3) == [('paint', -3)]
+    assert _completions(app, 'paint gr shade=1', 8) == [('green', -2)]
+    assert _completions(app, 'paint color=b shade=1', 13) == [('blue', -1)]
+
+
+@pytest.mark.asyncio
+async def test_command_name_completions():
+    app = get_test_app()
+
+    for name in ['zeta', 'alpha', 'alps']:
+        async def command():
+            pass
+
+        app.cmd.register(app.cmd(name=name, aliases=[f'{name}-alias']))(command)
+
+    assert _completions(app, 'al') == [
+        ('alpha', -2), ('alpha-alias', -2), ('alps', -2), ('alps-alias', -2)
+    ]
+    assert _completions(app, 'alph') == [('alpha', -4), ('alpha-alias', -4)]
+    assert _completions(app, 'x') == []
+
+
+@pytest.mark.asyncio
+async def test_keyword_argument_name_completions():
+    app = get_test_app()
+
+    @app.cmd.register()
+    @app.arg.secret(hidden=True)
+    @app.arg.color_name(name='color')
+    async def paint(color_name: str, *, shade: int = 0, secret: bool = False):
+        pass
+
+    assert paint.completable_kw_args == (paint['color'], paint['shade'])
+
+    assert _completions(app, 'paint ') == [('color=', 0), ('shade=', 0)]
+    assert _completions(app, 'paint sh') == [('shade=', -2)]
+    assert _completions(app, 'paint color=red ') == [('shade=', 0)]
+    assert _completions(app, 'paint red ') == [('shade=', 0)]
+
+
+@pytest.mark.asyncio
+async def test_global_type_completers_update_completion_plans():
+    app = get_test_app()
+
+    class Color(str):
+        pass
+
+    @app.cmd.register()
+    async def paint(color: Color):
+        pass
+
+    assert app.command_engine.completion_plan_for(paint).type_completers == {}
+    assert _completions(app, 'paint color=r') == []
+
+    app.add_completers_for_type(Color, WordCompleter(['red', 'rose']))
+    assert _completions(app, 'paint color=r') == [('red', -1), ('rose', -1)]
+
+    app.add_completers_for_type(Color, WordCompleter(['ruby']))
+    assert _completions(app, 'paint color=r') == [('red', -1), ('rose', -1), ('ruby', -1)]
+    assert _completions(app, 'paint r') == [('red', -1), ('rose', -1), ('ruby', -1)]
+
+
+class _SlowCompleter(Completer):
+    """An asynchronous completer that waits before completing from its words."""
+
+    def __init__(self, words, delay=0.0):
+        self.words = words
+        self.delay = delay
+        self.started = 0
+        self.cancelled = 0
+
+    def get_completions(self, document, complete_event):
+        return []
+
+    async def get_completions_async(self, document, complete_event):
+        self.started += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+        for word in self.words:
+            yield Completion(word)
+
+
+async def _async_completions(app, text):
+    completer = app._session_opts['completer']
+    return [
+        (c.text, c.display_meta_text)
+        async for c in completer.get_completions_async(Document(text), CompleteEvent())
+    ]
+
+
+@pytest.mark.asyncio
+async def test_async_completers():
+    app = get_test_app(completion_debounce=0)
+
+    class Host(str):
+        pass
+
+    @app.cmd.register()
+    @app.arg.host(completers=_SlowCompleter(['db1']))
+    @app.arg.color(completers=WordCompleter(['red', 'green']))
+    async def connect(host: Host, color: str):
+        pass
+
+    app.add_completers_for_type(Host, _SlowCompleter(['db2']))
+
+    assert [text for text, _ in await _async_completions(app, 'conn')] == ['connect']
+    assert (await _async_completions(app, 'connect '))[2:] == [
+        ('db1', 'From per-argument completer.'),
+        ('db2', 'From global per-type completer.'),
+    ]
+    assert await _async_completions(app, 'connect color=') == [
+        ('green', 'From per-argument completer.'),
+        ('red', 'From per-argument completer.'),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_invalidate_cancels_in_flight_completion():
+    app = get_test_app(completion_debounce=0)
+    slow_completer = _SlowCompleter(['db1'], delay=10)
+
+    @app.cmd.register()
+    @app.arg.host(completers=slow_completer)
+    async def connect(host: str):
+        pass
+
+    completer = app._session_opts['completer']
+    task = asyncio.ensure_future(_async_completions(app, 'connect host='))
+    await asyncio.sleep(0.01)
+    assert slow_completer.started == 1
+
+    completer.invalidate()
+    assert await asyncio.wait_for(task, 1) == []
+    assert slow_completer.cancelled == 1
+
+
+@pytest.mark.asyncio
+async def test_completion_is_debounced():
+    app = get_test_app(completion_debounce=0.05)
+    slow_completer = _SlowCompleter(['db1'])
+
+    @app.cmd.register()
+    @app.arg.host(completers=slow_completer)
+    async def connect(host: str):
+        pass
+
+    completer = app._session_opts['completer']
+    for _ in range(3):
+        task = asyncio.ensure_future(_async_completions(app, 'connect host='))
+        await asyncio.sleep(0.01)
+        completer.invalidate()
+        assert await task == []
+
+    assert slow_completer.started == 0
+    assert await _async_completions(app, 'connect host=') == [
+        ('db1', 'From per-argument completer.')
+    ]
+    assert slow_completer.started == 1
+
+
+def test_negative_completion_debounce():
+    with pytest.raises(ValueError):
+        Application(completion_debounce=-1)
+
+
+def _word_completions(completer, text):
+    return [c.text for c in completer.get_completions(Document(text), CompleteEvent())]
+
+
+class _WordSource:
+    """A callable source of words, which counts how often it is called."""
+
+    def __init__(self, words):
+        self.words = words
+        self.calls = 0
+        self.fetched = threading.Event()
+        self.error = None
+
+    def __call__(self):
+        self.calls += 1
+        self.fetched.set()
+        if self.error is not None:
+            raise self.error
+
+        return list(self.words)
+
+
+def test_word_completer_without_ttl_fetches_every_time():
+    source = _WordSource(['alpha', 'beta'])
+    completer = WordCompleter(source)
+
+    assert _word_completions(completer, 'a') == ['alpha']
+    assert _word_completions(completer, 'b') == ['beta']
+    assert source.calls == 2
+
+
+def test_word_completer_ttl():
+    source = _WordSource(['alpha', 'beta'])
+    completer = WordCompleter(source, ttl=0.05)
+
+    assert _word_completions(completer, 'a') == ['alpha']
+    assert _word_completions(completer, 'b') == ['beta']
+    assert source.calls == 1
+
+    # Expired words are served while they are fetched again in the background.
+    source.words = ['alpha', 'apex']
+    source.fetched.clear()
+    time.sleep(0.06)
+    assert _word_completions(completer, 'a') == ['alpha']
+    assert source.fetched.wait(1)
+    for _ in range(100):
+        if _word_completions(completer, 'a') == ['alpha', 'apex']:
+            break
+        time.sleep(0.01)
+
+    assert _word_completions(completer, 'a') == ['alpha', 'apex']
+    assert source.calls == 2
+
+
+def test_word_completer_ttl_without_background_refresh():
+    source = _WordSource(['alpha'])
+    completer = WordCompleter(source, ttl=0.05, refresh_in_background=False)
+
+    assert _word_completions(completer, 'a') == ['alpha']
+    source.words = ['apex']
+    assert _word_completions(completer, 'a') == ['alpha']
+
+    time.sleep(0.06)
+    assert _word_completions(completer, 'a') == ['apex']
+    assert source.calls == 2
+
+
+def test_word_completer_invalidation():
+    source = _WordSource(['alpha'])
+    completer = WordCompleter(source, ttl=60)
+
+    assert _word_completions(completer, '') == ['alpha']
+    source.words = ['beta']
+    assert _word_completions(completer, '') == ['alpha']
+
+    completer.invalidate()
+    assert _word_completions(completer, '') == ['beta']
+    assert source.calls == 2
+
+
+def test_invalid_word_completer_ttl():
+    with pytest.raises(ValueError):
+        WordCompleter(['alpha'], ttl=1)
+
+    with pytest.raises(ValueError):
+        WordCompleter(lambda: ['alpha'], ttl=0)
+
+
+def test_word_completer_prefix_queries():
+    completer = WordCompleter(['beta', 'alpha', 'apex', 'alpha', 'b', 'Alpha'])
+
+    assert _word_completions(completer, '') == ['Alpha', 'alpha', 'apex', 'b', 'beta']
+    assert _word_completions(completer, 'a') == ['alpha', 'apex']
+    assert _word_completions(completer, 'al') == ['alpha']
+    assert _word_completions(completer, 'b') == ['b', 'beta']
+    assert _word_completions(completer, 'c') == []
+
+    dynamic_completer = WordCompleter(lambda: ['beta', 'apex', 'alpha', 'apex'])
+    assert _word_completions(dynamic_completer, 'a') == ['alpha', 'apex']
+
+
+def test_word_completer_max_completions():
+    words = [f'word{i:03d}' for i in range(100)]
+    completer = WordCompleter(words, max_completions=3)
+    assert completer.max_completions == 3
+
+    assert _word_completions(completer, 'word') == ['word000', 'word001', 'word002']
+    assert _word_completions(completer, 'word09') == ['word090', 'word091', 'word092']
+    assert _word_completions(completer, 'word099') == ['word099']
+
+    dynamic_completer = WordCompleter(lambda: words, max_completions=2)
+    assert _word_completions(dynamic_completer, 'word05') == ['word050', 'word051']
+
+    with pytest.raises(ValueError):
+        WordCompleter(words, max_completions=-1)
+
+
+class _CountingCompleter(Completer):
+    """A completer over an endless stream of words, which counts those it yields."""
+
+    def __init__(self):
+        self.num_yielded = 0
+
+    def get_completions(self, document, complete_event):
+        i = 0
+        while True:
+            self.num_yielded += 1
+            yield Completion(f'word{i}')
+            i += 1
+
+
+@pytest.mark.asyncio
+async def test_max_completions():
+    app = get_test_app(completion_debounce=0, max_completions=3)
+    assert app.max_completions == 3
+    counting_completer = _CountingCompleter()
+
+    @app.cmd.register()
+    @app.arg.word(completers=counting_completer)
+    async def say(word: str):
+        pass
+
+    completions = _completions(app, 'say word=')
+    assert completions == [('word0', 0), ('word1', 0), ('word2', 0), ('', 0)]
+    assert counting_completer.num_yielded == 4
+
+    completer = app._session_opts['completer']
+    completions = list(completer.get_completions(Document('say word='), CompleteEvent()))
+    assert completions[-1].display_text == 'more…'
+    assert completions[-1].display_meta_text == 'Only the first 3 completions are shown.'
+
+    counting_completer.num_yielded = 0
+    assert await _async_completions(app, 'say word=') == [
+        ('word0', 'From per-argument completer.'),
+        ('word1', 'From per-argument completer.'),
+        ('word2', 'From per-argument completer.'),
+        ('', 'Only the first 3 completions are shown.'),
+    ]
+    assert counting_completer.num_yielded == 4
+
+
+@pytest.mark.asyncio
+async def test_max_completions_not_reached():
+    app = get_test_app(completion_debounce=0, max_completions=2)
+
+    @app.cmd.register()
+    @app.arg.color(choices=['red', 'green'])
+    async def paint(color: str):
+        pass
+
+    assert _completions(app, 'paint color=') == [('green', 0), ('red', 0)]
+    assert [text for text, _ in await _async_completions(app, 'paint color=')] == [
+        'green', 'red'
+    ]
+
+
+def test_invalid_max_completions():
+    with pytest.raises(ValueError):
+        Application(max_completions=0)
+
+
+@pytest.mark.asyncio
+async def test_variadic_arguments_are_not_completed_by_name():
+    app = get_test_app()
+
+    @app.cmd.register()
+    async def deploy(*targets: str, seed: int = 0, **options: str):
+        pass
+
+    assert _completions(app, 'deploy ') == [('seed=', 0)]
+
+
+def test_word_completer_failed_refresh_waits_for_ttl():
+    source = _WordSource(['alpha'])
+    completer = WordCompleter(source, ttl=0.05)
+    assert _word_completions(completer, 'a') == ['alpha']
+
+    source.error = ConnectionError('inventory is down')
+    source.fetched.clear()
+    time.sleep(0.06)
+    assert _word_completions(completer, 'a') == ['alpha']
+    assert source.fetched.wait(1)
+    time.sleep(0.01)
+
+    # The stale words are served without retrying the source until another ttl.
+    for _ in range(10):
+        assert _word_completions(completer, 'a') == ['alpha']
+    assert source.calls == 2
+
+    source.fetched.clear()
+    time.sleep(0.06)
+    assert _word_completions(completer, 'a') == ['alpha']
+    assert source.fetched.wait(1)
+    assert source.calls == 3
+
+
+class _BlockingCompleter(Completer):
+    """A slow synchronous completer, which records the threads it runs in."""
+
+    def __init__(self, word):
+        self.word = word
+        self.thread_ids = []
+
+    def get_completions(self, document, complete_event):
+        self.thread_ids.append(threading.get_ident())
+        time.sleep(0.05)
+        yield Completion(self.word)
+
+
+@pytest.mark.asyncio
+async def test_slow_global_type_completers_do_not_block_the_event_loop():
+    app = get_test_app(completion_debounce=0)
+
+    class Host(str):
+        pass
+
+    @app.cmd.register()
+    async def connect(host: Host):
+        pass
+
+    first, second = _BlockingCompleter('db1'), _BlockingCompleter('db2')
+    app.add_completers_for_type(Host, first, second)
+
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    ticker = asyncio.ensure_future(tick())
+    try:
+        completions = await _async_completions(app, 'connect host=')
+    finally:
+        ticker.cancel()
+
+    assert completions == [
+        ('db1', 'From global per-type completer.'),
+        ('db2', 'From global per-type completer.'),
+    ]
+    assert threading.get_ident() not in first.thread_ids + second.thread_ids
+    assert ticks >= 10
+
+
+def test_wrapped_completers_are_classified_by_what_they_wrap():
+    from prompt_toolkit.completion import DynamicCompleter, merge_completers
+
+    from almanac.core.command_completer import _is_async_completer
+
+    sync_completer = _BlockingCompleter('db1')
+    async_completer = _SlowCompleter(['db2'])
+
+    assert not _is_async_completer(sync_completer)
+    assert _is_async_completer(async_completer)
+    assert not _is_async_completer(merge_completers([sync_completer, sync_completer]))
+    assert _is_async_completer(merge_completers([sync_completer, async_completer]))
+    assert not _is_async_completer(DynamicCompleter(lambda: sync_completer))
+    assert _is_async_completer(DynamicCompleter(lambda: async_completer))
@@ -0,0 +1,119 @@
+"""Tests for the import cost of the top-level package."""
+
+import importlib
+import inspect
+import subprocess
+import sys
+
+from typing import Dict, Set
+
+import almanac
+
+_HEAVY_DEPENDENCIES = ('munch', 'prompt_toolkit', 'pygments', 'pyparsing')
+
+
+def _import_times(
+    statement: str
+) -> Dict[str, int]:
+    """Map each module imported by a statement to its cumulative import time (us)."""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True
+    )
+
+    import_times: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if cumulative.strip().isdigit():
+            import_times[name.strip()] = int(cumulative)
+
+    return import_times
+
+
+def _top_level_packages(
+    import_times: Dict[str, int]
+) -> Set[str]:
+    return {name.split('.')[0] for name in import_times}
+
+
+def test_import_does_not_load_dependencies():
+    imported = _top_level_packages(_import_times('import almanac'))
+    assert 'almanac' in imported
+    for dependency in _HEAVY_DEPENDENCIES:
+        assert dependency not in imported
+
+
+def test_light_exports_do_not_load_dependencies():
+    imported = _top_level_packages(
+        _import_times('from almanac import AlmanacError, ExitCodes')
+    )
+    for dependency in _HEAVY_DEPENDENCIES:
+        assert dependency not in imported
+
+
+def test_application_does_not_load_dependencies():
+    import_times = _import_times('from almanac import Application')
+    assert 'almanac.core.application' in import_times
+
+    imported = _top_level_packages(import_times)
+    for dependency in _HEAVY_DEPENDENCIES:
+        assert dependency not in imported
+
+
+def test_prompt_session_dependencies_are_loaded_lazily():
+    import_times = _import_times(
+        'from almanac import Application; Application()._session_opts'
+    )
+    assert 'almanac.core.command_completer' in import_times
+    assert 'almanac.parsing.lexer' in import_times
+    assert 'pygments' in import_times
+
+
+def test_import_only_loads_the_top_level_package():
+    proc = subprocess.run(
+        [sys.executable, '-c', 'import almanac, sys; print(*sys.modules)'],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True
+    )
+    modules = proc.stdout.split()
+    assert 'almanac' in modules
+    assert not [name for name in modules if name.startswith('almanac.')]
+
+    imported = {name.split('.')[0] for name in modules}
+    for dependency in _HEAVY_DEPENDENCIES:
+        assert dependency not in imported
+
+
+def test_lazy_exports():
+    assert almanac.ExitCodes is importlib.import_module('almanac.constants').ExitCodes
+    assert 'ExitCodes' in dir(almanac)
+
+    try:
+        almanac.does_not_exist
+    except AttributeError:
+        pass
+    else:
+        assert False, 'Expected AttributeError'
+
+
+def test_exports_match_subpackages():
+    for subpackage_name, names in almanac._SUBPACKAGE_EXPORTS.items():
+        subpackage = importlib.import_module(f'almanac.{subpackage_name}')
+
+        # Classes and functions defined within the subpackage that it makes public.
+        defined_names = {
+            name for name, value in vars(subpackage).items()
+            if not name.startswith('_') and
+            (inspect.isclass(value) or inspect.isfunction(value)) and
+            value.__module__.startswith(subpackage.__name__)
+        }
+
+        assert defined_names <= set(names), subpackage_name
+        for name in names:
+            assert hasattr(subpackage, name), f'{subpackage_name}.{name}'
@@ -0,0 +1,216 @@
+"""Tests for running commands as background jobs."""
+
+import asyncio
+
+import pytest
+
+from almanac import (
+    BufferedIoContext,
+    ExitCodes,
+    JobStatus,
+    NoSuchJobError,
+    PartialParseError,
+    split_background_marker
+)
+
+from .utils import get_test_app
+
+
+def test_split_background_marker():
+    assert split_background_marker('cmd 1 &') == ('cmd 1', True)
+    assert split_background_marker('cmd 1&  ') == ('cmd 1', True)
+    assert split_background_marker('cmd "a & b"') == ('cmd "a & b"', False)
+    assert split_background_marker('cmd 1') == ('cmd 1', False)
+
+
+def test_buffered_io_context():
+    buffer = BufferedIoContext(max_messages=2)
+    buffer.info('one')
+    buffer.error('two', sep='')
+    buffer.raw('three')
+    assert len(buffer) == 2
+    assert [x.kind for x in buffer.messages] == ['error', 'raw']
+
+    replayed = BufferedIoContext()
+    buffer.replay(replayed)
+    assert replayed.messages == buffer.messages
+    assert replayed.messages[0].kwargs == {'sep': ''}
+
+
+@pytest.mark.asyncio
+async def test_background_job_does_not_block():
+    app = get_test_app()
+    release = asyncio.Event()
+
+    @app.cmd.register()
+    async def download(url: str):
+        app.io.raw(f'downloading {url}')
+        await release.wait()
+        app.io.raw(f'downloaded {url}')
+        return 7
+
+    assert await app.eval_line('download a &') == ExitCodes.OK
+    assert await app.eval_line('download b &') == ExitCodes.OK
+    assert [job.id for job in app.jobs] == [1, 2]
+
+    job = app.jobs[1]
+    assert job.command_line == 'download a'
+    assert job.status == JobStatus.RUNNING
+    assert job.exit_code is None
+
+    await asyncio.sleep(0)
+    assert [x.args for x in job.output.messages] == [('downloading a',)]
+
+    release.set()
+    assert await job.wait() == 7
+    assert job.status == JobStatus.DONE
+    assert [x.args for x in job.output.messages] == [
+        ('downloading a',), ('downloaded a',)
+    ]
+    assert [x.args for x in app.jobs[2].output.messages] == [
+        ('downloading b',), ('downloaded b',)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_script_lines_can_start_background_jobs():
+    app = get_test_app()
+    release = asyncio.Event()
+
+    @app.cmd.register()
+    async def download(url: str):
+        await release.wait()
+        return 7
+
+    script = ['download a &', 'download b&', 'download x= &']
+    assert not app.validate_script(script[:2])
+
+    result = await app.run_script(script, stop_on_error=False)
+    assert [x.line for x in result.line_results] == [
+        'download a', 'download b', 'download x='
+    ]
+    assert [x.exit_code for x in result.line_results] == [
+        ExitCodes.OK, ExitCodes.OK, ExitCodes.ERR_COMMAND_PARSING
+    ]
+    assert [job.command_line for job in app.jobs] == ['download a', 'download b']
+
+    release.set()
+    assert await app.jobs[2].wait() == 7
+
+
+@pytest.mark.asyncio
+async def test_unparseable_background_line_is_not_started():
+    app = get_test_app()
+
+    @app.cmd.register()
+    async def cmd(x: int):
+        pass
+
+    assert await app.eval_line('cmd x= &') == ExitCodes.ERR_COMMAND_PARSING
+    assert not app.jobs
+
+    with pytest.raises(PartialParseError):
+        app.start_job('cmd x=')
+
+
+@pytest.mark.asyncio
+async def test_background_job_errors():
+    app = get_test_app()
+
+    @app.cmd.register()
+    async def fail():
+        raise RuntimeError('oops')
+
+    job = app.start_job('fail')
+    assert await job.wait() == ExitCodes.ERR_RUNTIME_EXC
+    assert job.status == JobStatus.DONE
+    assert job.exception is None
+
+    job = app.start_job('nonexistent')
+    assert await job.wait() == ExitCodes.ERR_COMMAND_NONEXISTENT
+
+    with pytest.raises(NoSuchJobError):
+        app.jobs[3]
+
+
+@pytest.mark.asyncio
+async def test_background_job_propagated_exception():
+    app = get_test_app(propagate_runtime_exceptions=True)
+
+    @app.cmd.register()
+    async def fail():
+        raise RuntimeError('oops')
+
+    job = app.start_job('fail')
+    assert await job.wait() == ExitCodes.ERR_RUNTIME_EXC
+    assert isinstance(job.exception, RuntimeError)
+
+
+@pytest.mark.asyncio
+async def test_job_builtins():
+    app = get_test_app()
+    release = asyncio.Event()
+
+    @app.cmd.register()
+    async def slow():
+        await release.wait()
+        app.io.raw('slow done')
+        return 3
+
+    @app.cmd.register()
+    async def forever():
+        await asyncio.Event().wait()
+
+    await app.eval_line('slow &')
+    await app.eval_line('forever &')
+    forever_job = app.jobs[2]
+
+    assert await app.eval_line('jobs') == ExitCodes.OK
+    assert await app.eval_line('kill 2') == ExitCodes.OK
+    assert forever_job.status == JobStatus.CANCELLED
+    assert forever_job.exit_code == ExitCodes.ERR_COMMAND_CANCELLED
+    assert 2 not in app.jobs
+
+    assert await app.eval_line('kill 2') == ExitCodes.ERR_RUNTIME_EXC
+
+    asyncio.get_event_loop().call_soon(release.set)
+    assert await app.eval_line('fg') == 3
+    assert not app.jobs
+
+    assert await app.eval_line('fg') == ExitCodes.ERR_COMMAND_INVALID_ARGUMENTS
+
+
+@pytest.mark.asyncio
+async def test_fg_replays_output():
+    app = get_test_app()
+    outer = BufferedIoContext()
+
+    @app.cmd.register()
+    async def hello():
+        app.io.info('hello')
+
+    await app.eval_line('hello &')
+    with app.io_context(outer):
+        await app.eval_line('fg 1')
+
+    assert [(x.kind, x.args) for x in outer.messages] == [('info', ('hello',))]
+
+
+@pytest.mark.asyncio
+async def test_cancel_all_jobs():
+    app = get_test_app()
+
+    @app.cmd.register()
+    async def forever():
+        await asyncio.Event().wait()
+
+    jobs = [app.start_job('forever') for _ in range(3)]
+
+    # The last job is cancelled before it has started running.
+    await asyncio.sleep(0)
+    jobs.append(app.start_job('forever'))
+
+    await app.jobs.cancel_all()
+    assert all(job.status == JobStatus.CANCELLED for job in jobs)
+    assert not app.jobs.running
+    assert len(app.jobs) == 4
@@ -0,0 +1,83 @@
+"""Tests for the command line lexer."""
+
+from prompt_toolkit.document import Document
+
+from almanac import CommandLineLexer
+
+from .utils import get_test_app
+
+
+def _lex(lexer, text):
+    get_line = lexer.lex_document(Document(text))
+    return [get_line(i) for i in range(text.count('\n') + 1)]
+
+
+def _styled(line):
+    return [
+        (style.replace('class:pygments.', ''), text)
+        for style, text in line
+        if text.strip()
+    ]
+
+
+def test_lexer_fragments():
+    app = get_test_app()
+    lexer = CommandLineLexer(app)
+
+    @app.cmd.register()
+    async def cmd(*args, **kwargs):
+        pass
+
+    [line] = _lex(lexer, 'cmd 1 2.5 true "a b" [1, \'x\'] key=y')
+    assert ''.join(text for _, text in line) == 'cmd 1 2.5 true "a b" [1, \'x\'] key=y'
+    assert _styled(line) == [
+        ('name.realcommand', 'cmd'),
+        ('literal.number.integer', '1'),
+        ('literal.number.float', '2.5'),
+        ('keyword.boolean', 'true'),
+        ('literal.string.doublequote', '"a b"'),
+        ('text', '['),
+        ('literal.number.integer', '1'),
+        ('text', ','),
+        ('literal.string.singlequote', "'x'"),
+        ('text', ']'),
+        ('name.kwarg', 'key'),
+        ('operator', '='),
+        ('text', 'y'),
+    ]
+
+    [line] = _lex(lexer, 'cmd a=1 b="unterminated')
+    assert _styled(line) == [
+        ('name.realcommand', 'cmd'),
+        ('name.kwarg', 'a'),
+        ('operator', '='),
+        ('literal.number.integer', '1'),
+        ('name.kwarg', 'b'),
+        ('operator', '='),
+        ('literal.string.doublequote', '"unterminated'),
+    ]
+
+
+def test_lexer_multiple_lines():
+    app = get_test_app()
+    lexer = CommandLineLexer(app)
+
+    lines = _lex(lexer, 'nope 1\n  x=2')
+    assert [_styled(line) for line in lines] == [
+        [('name.nonexistentcommand', 'nope'), ('literal.number.integer', '1')],
+        [('name.kwarg', 'x'), ('operator', '='), ('literal.number.integer', '2')],
+    ]
+    assert lexer.lex_document(Document('nope 1\n  x=2'))(5) == []
+
+
+def test_lexer_cache_tracks_registered_commands():
+    app = get_test_app()
+    lexer = CommandLineLexer(app)
+
+    assert _styled(_lex(lexer, 'later')[0]) == [('name.nonexistentcommand', 'later')]
+
+    @app.cmd.register()
+    async def later():
+        pass
+
+    assert _styled(_lex(lexer, 'later')[0]) == [('name.realcommand', 'later')]
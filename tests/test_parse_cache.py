@@ -0,0 +1,135 @@
+"""Tests for the per-application parse cache."""
+
+import pytest
+
+from almanac import fast_parse_cmd_line, ParseCache, ParseState
+
+from .utils import get_test_app
+
+
+def _counting_parse_func():
+    calls = []
+
+    def parse_func(text):
+        calls.append(text)
+        return fast_parse_cmd_line(text)
+
+    return parse_func, calls
+
+
+def test_parse_cache_hits_and_misses():
+    parse_func, calls = _counting_parse_func()
+    parse_cache = ParseCache(parse_func, max_entries=4)
+
+    first = parse_cache.parse('cmd 1')
+    assert parse_cache.parse('cmd 1') is first
+    parse_cache.parse('cmd 2')
+
+    assert calls == ['cmd 1', 'cmd 2']
+
+    info = parse_cache.info()
+    assert info.hits == 1
+    assert info.misses == 2
+    assert info.evictions == 0
+    assert info.entries == 2
+    assert info.input_bytes == len('cmd 1') + len('cmd 2')
+
+
+def test_parse_cache_evicts_least_recently_used_entries():
+    parse_func, calls = _counting_parse_func()
+    parse_cache = ParseCache(parse_func, max_entries=2)
+
+    parse_cache.parse('a')
+    parse_cache.parse('b')
+    parse_cache.parse('a')
+    parse_cache.parse('c')
+
+    assert 'a' in parse_cache
+    assert 'b' not in parse_cache
+    assert 'c' in parse_cache
+    assert parse_cache.info().evictions == 1
+
+
+def test_parse_cache_input_bytes_bound():
+    parse_func, calls = _counting_parse_func()
+    parse_cache = ParseCache(parse_func, max_entries=100, max_input_bytes=10)
+
+    parse_cache.parse('cmd 1')
+    parse_cache.parse('cmd 2')
+    assert len(parse_cache) == 2
+
+    parse_cache.parse('cmd 3')
+    assert len(parse_cache) == 2
+    assert 'cmd 1' not in parse_cache
+    assert parse_cache.info().input_bytes == 10
+
+    # Lines larger than the whole cache are parsed, but never stored.
+    long_line = 'cmd ' + 'x' * 20
+    assert parse_cache.parse(long_line).state == ParseState.FULL
+    assert long_line not in parse_cache
+    assert len(parse_cache) == 2
+
+    # Non-ASCII lines are measured in encoded bytes.
+    parse_cache.parse('cmd £££')
+    assert parse_cache.info().input_bytes == len('cmd £££'.encode('utf-8'))
+
+
+def test_parse_cache_invalidation():
+    parse_func, calls = _counting_parse_func()
+    parse_cache = ParseCache(parse_func)
+
+    parse_cache.parse('cmd 1')
+    parse_cache.parse('cmd 2')
+
+    assert parse_cache.invalidate('cmd 1')
+    assert not parse_cache.invalidate('cmd 1')
+    assert parse_cache.info().input_bytes == len('cmd 2')
+
+    parse_cache.parse('cmd 1')
+    assert calls == ['cmd 1', 'cmd 2', 'cmd 1']
+
+    parse_cache.clear()
+    assert len(parse_cache) == 0
+    assert parse_cache.info().input_bytes == 0
+    assert parse_cache.info().misses == 3
+
+    parse_cache.reset_stats()
+    assert parse_cache.info().misses == 0
+
+
+def test_disabled_parse_cache():
+    parse_func, calls = _counting_parse_func()
+    parse_cache = ParseCache(parse_func, max_entries=0)
+
+    parse_cache.parse('cmd')
+    parse_cache.parse('cmd')
+    assert calls == ['cmd', 'cmd']
+    assert len(parse_cache) == 0
+
+
+def test_invalid_parse_cache_bounds():
+    with pytest.raises(ValueError):
+        ParseCache(fast_parse_cmd_line, max_entries=-1)
+
+    with pytest.raises(ValueError):
+        ParseCache(fast_parse_cmd_line, max_input_bytes=-1)
+
+
+@pytest.mark.asyncio
+async def test_parse_caches_are_per_application():
+    app_one = get_test_app()
+    app_two = get_test_app()
+
+    app_one.bag.calls = 0
+
+    @app_one.cmd.register()
+    async def cmd(x: int):
+        app_one.bag.calls += 1
+
+    await app_one.eval_line('cmd 1')
+    await app_one.eval_line('cmd 1')
+
+    assert app_one.bag.calls == 2
+    assert app_one.parse_cache.info().hits == 1
+    assert 'cmd 1' in app_one.parse_cache
+    assert 'cmd 1' not in app_two.parse_cache
@@ -0,0 +1,234 @@
+"""Tests for parity between the command line parser engines."""
+
+import itertools
+
+import pytest
+
+from almanac import (
+    fast_parse_cmd_line,
+    get_parse_func_for_engine,
+    IncrementalParser,
+    ParserEngine,
+    parse_cmd_line,
+    ParseState,
+    Span
+)
+
+from .utils import get_test_app
+
+
+PARITY_CORPUS = [
+    # Commands only.
+    '',
+    '   ',
+    'cmd',
+    '  cmd  ',
+    '1cmd',
+    '-cmd',
+    '_cmd-name_2',
+    'cmd\n',
+
+    # Positional values.
+    'cmd 1 2 3',
+    'cmd -1 1.5 1. -2.5e10 1.e5',
+    'cmd True true False false',
+    'cmd Truest',
+    'cmd trueish x',
+    'cmd 1abc',
+    'cmd 1.5.3',
+    'cmd a/b/c #tag @user ~home |pipe <> ?.',
+    'cmd £5 €5 %*+',
+    'cmd "double quoted" \'single quoted\'',
+    'cmd "escaped \\" quote" x',
+    'cmd "doubled "" quote"',
+    'cmd "unterminated',
+    'cmd \'unterminated',
+    'cmd "bad \\xZZ escape"',
+    'cmd "" \'\'',
+    'cmd [] [1] [1, 2, 3] [ 1 , "two" , three ]',
+    'cmd [1,]',
+    'cmd [1 2]',
+    'cmd [[1]]',
+    'cmd {a:1} {"b": [1, 2], c: {d: true}}',
+    'cmd {a:1 b:2}',
+    'cmd {a:1, a:2}',
+    'cmd {}',
+    'cmd {a:1,}',
+    'cmd {a:b:c}',
+    'cmd[1]',
+    'cmd.x',
+
+    # Keyword arguments.
+    'cmd a=1',
+    'cmd a = 1',
+    'cmd a=1 b="two" c=[3] d={e: 4}',
+    'cmd a=1b=2',
+    'cmd a=xb=2',
+    'cmd a=1 a=2',
+    'cmd a=',
+    'cmd a= ',
+    'cmd a=[',
+    'cmd a={',
+    'cmd a="',
+    'cmd -1=2',
+    'cmd x=Truest',
+    'cmd 1 2 a=1 b=2',
+
+    # Mixing positional and keyword arguments incorrectly.
+    'cmd a=1 2',
+    'cmd a=1 b',
+    'cmd 1 a=1 "str"',
+
+    # Whitespace and multi-line quirks.
+    'cmd\t1\t\tx',
+    'cmd\t"a\tb"',
+    'cmd 1\n2',
+    'cmd a=1\nb=2 3',
+    'cmd 1 >!< 2',
+    'cmd "x >!< y" =',
+]
+
+_FUZZ_PIECES = [
+    'x', '1', '1.5', '-', 'true', ' ', '=', '"', "'", '[', ']', '{', '}', ',', ':',
+]
+
+
+def _normalized(value):
+    if isinstance(value, (list, tuple)):
+        return [_normalized(x) for x in value]
+    elif isinstance(value, dict):
+        return {k: _normalized(v) for k, v in value.items()}
+
+    return type(value), value
+
+
+def _summarized(parse_status):
+    results = parse_status.results
+    if results is None:
+        normalized_results = None
+    else:
+        normalized_results = (
+            results.command,
+            _normalized(results.positionals),
+            _normalized(dict(results.kwargs)),
+            results.command_span,
+            results.positional_spans,
+            results.kwarg_spans,
+        )
+
+    return (
+        parse_status.state,
+        parse_status.unparsed_text,
+        parse_status.unparsed_start_pos,
+        normalized_results,
+    )
+
+
+def _assert_parity(text):
+    assert _summarized(fast_parse_cmd_line(text)) == _summarized(parse_cmd_line(text))
+
+
+@pytest.mark.parametrize('text', PARITY_CORPUS)
+def test_parity_corpus(text):
+    _assert_parity(text)
+
+
+def test_parity_generated_lines():
+    for num_pieces in range(4):
+        for pieces in itertools.product(_FUZZ_PIECES, repeat=num_pieces):
+            _assert_parity('cmd ' + ''.join(pieces))
+
+
+def test_fast_parse_results():
+    parse_status = fast_parse_cmd_line('cmd 1 [2, "3"] {a: [4]} x=5.0 y=true')
+    assert parse_status.state == ParseState.FULL
+
+    results = parse_status.results
+    assert results.command == 'cmd'
+    assert results.positionals == (1, [2, '3'], {'a': [4]})
+    assert results.kwargs == {'x': 5.0, 'y': True}
+
+
+def test_fast_partial_parse_results():
+    parse_status = fast_parse_cmd_line('cmd 1 a=2 "oops"  ')
+    assert parse_status.state == ParseState.PARTIAL
+    assert parse_status.unparsed_text == '"oops"'
+    assert parse_status.unparsed_start_pos == 10
+
+    results = parse_status.results
+    assert results.positionals == (1,)
+    assert results.kwargs == {'a': 2}
+
+
+@pytest.mark.parametrize('engine', list(ParserEngine))
+def test_parsed_command_line_spans(engine):
+    parse_func = get_parse_func_for_engine(engine)
+
+    text = 'cmd  1 "a b"\tkey=[1, 2] other={a: 1}'
+    results = parse_func(text).results
+    assert text[slice(*results.command_span)] == 'cmd'
+    assert [text[slice(*span)] for span in results.positional_spans] == ['1', '"a b"']
+    assert [
+        (text[slice(*name_span)], text[slice(*value_span)])
+        for name_span, value_span in results.kwarg_spans
+    ] == [('key', '[1, 2]'), ('other', '{a: 1}')]
+
+    results = parse_func('cmd a=1 a=2').results
+    assert results.kwargs == {'a': 2}
+    assert results.kwarg_spans == (
+        (Span(4, 5), Span(6, 7)),
+        (Span(8, 9), Span(10, 11)),
+    )
+
+
+def test_parsed_command_line_is_immutable():
+    results = fast_parse_cmd_line('cmd 1 a=2').results
+
+    with pytest.raises(AttributeError):
+        results.command = 'other'
+
+    with pytest.raises(TypeError):
+        results.kwargs['a'] = 3
+
+
+@pytest.mark.asyncio
+async def test_app_parser_engine_selection():
+    for engine in ParserEngine:
+        app = get_test_app(parser_engine=engine)
+        assert app.parser_engine == engine
+
+        app.bag.calls = []
+
+        @app.cmd.register()
+        async def record(a: int, *, b: str):
+            app.bag.calls.append((a, b))
+
+        await app.eval_line('record 1 b="x y"')
+        assert app.bag.calls == [(1, 'x y')]
+
+
+def _incremental_edits(line):
+    """Yield the successive states of typing a line, then editing its middle."""
+    for i in range(len(line) + 1):
+        yield line[:i]
+
+    mid = len(line) // 2
+    yield line[:mid] + 'x' + line[mid:]
+    yield line[:mid] + line[mid+1:]
+    yield line[:mid] + ' "a b" ' + line[mid:]
+    yield line
+
+
+def test_incremental_parser_matches_full_parses():
+    lines = [
+        'cmd 1 2.5e3 true "a b" [1, 2] {a: [1], b: {c: 2}} x=1.5e2 y="q""r" z=[',
+        'cmd a=1 b=2 a=3 b=x c={d: 1, e: 2} 7',
+        'cmd\t1\tkey=\'v\'  ',
+    ] + PARITY_CORPUS
+
+    for line in lines:
+        parser = IncrementalParser()
+        for text in _incremental_edits(line):
+            assert _summarized(parser.parse(text)) == _summarized(
+                fast_parse_cmd_line(text)
+            )
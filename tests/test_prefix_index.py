@@ -0,0 +1,41 @@
+"""Tests for the sorted prefix index."""
+
+from almanac import PrefixIndex
+
+
+def test_prefix_queries():
+    index = PrefixIndex(['bb', 'a', 'ab', 'abc', 'b', 'ab'])
+    assert len(index) == 5
+    assert list(index) == ['a', 'ab', 'abc', 'b', 'bb']
+
+    assert list(index.iter_prefix('')) == ['a', 'ab', 'abc', 'b', 'bb']
+    assert list(index.iter_prefix('ab')) == ['ab', 'abc']
+    assert list(index.iter_prefix('abcd')) == []
+    assert list(index.iter_prefix('c')) == []
+
+    assert 'ab' in index
+    assert 'abcd' not in index
+
+
+def test_added_strings_are_merged_in_order():
+    index = PrefixIndex(['m'])
+    for string in ['z', 'a', 'ma', 'a']:
+        index.add(string)
+
+    assert len(index) == 4
+    assert 'ma' in index
+    assert list(index.iter_prefix('m')) == ['m', 'ma']
+    assert list(index) == ['a', 'm', 'ma', 'z']
+
+
+def test_queries_iterate_over_a_snapshot():
+    index = PrefixIndex(['a1', 'a2'])
+
+    results = index.iter_prefix('a')
+    assert next(results) == 'a1'
+
+    index.add('a0')
+    index.add('a3')
+
+    assert list(results) == ['a2']
+    assert list(index.iter_prefix('a')) == ['a0', 'a1', 'a2', 'a3']
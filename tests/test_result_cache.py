@@ -0,0 +1,147 @@
+"""Tests for memoizing the results of commands."""
+
+import time
+
+import pytest
+
+from almanac import (
+    BufferedIoContext,
+    CachePolicy,
+    CommandRegistrationError,
+    ExitCodes,
+    FrozenAccessError,
+    result_cache_key
+)
+
+from .utils import get_test_app
+
+
+def test_result_cache_key():
+    assert result_cache_key('/', [('a', 1)]) != result_cache_key('/', [('a', True)])
+    assert result_cache_key('/', [('a', [1, {'b': 2}])]) == \
+        result_cache_key('/', [('a', [1, {'b': 2}])])
+    assert result_cache_key('/', [('a', 1)]) != result_cache_key('/x', [('a', 1)])
+    assert result_cache_key('/', [('a', bytearray())]) is None
+
+
+@pytest.mark.asyncio
+async def test_cached_command():
+    app = get_test_app()
+    app.bag.calls = 0
+
+    @app.cmd.register()
+    @app.cmd(cache=True)
+    async def status(host: str, *, verbose: bool = False):
+        app.bag.calls += 1
+        app.io.raw(f'{host} is up')
+        return 0
+
+    assert status.cache == CachePolicy()
+
+    outputs = []
+    for line in ('status a', 'status a', 'status "a"', 'status a verbose=true'):
+        output = BufferedIoContext()
+        with app.redirected_io(output):
+            assert await app.eval_line(line) == ExitCodes.OK
+
+        outputs.append([x.args for x in output.messages])
+
+    assert app.bag.calls == 2
+    assert outputs == [[('a is up',)]] * 4
+
+    info = app.command_engine.result_cache_for('status').info()
+    assert (info.hits, info.misses, info.entries) == (2, 2, 2)
+
+    assert await app.eval_line('cache clear') == ExitCodes.OK
+    await app.eval_line('status a')
+    assert app.bag.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_cache_eviction_and_expiry():
+    app = get_test_app()
+    app.bag.calls = 0
+
+    @app.cmd.register()
+    @app.cmd(cache=CachePolicy(max_entries=2))
+    async def lookup(key: int):
+        app.bag.calls += 1
+
+    @app.cmd.register()
+    @app.cmd(cache=CachePolicy(ttl=0.01))
+    async def fleeting():
+        app.bag.calls += 1
+
+    for key in (1, 2, 1, 3, 1, 2):
+        await app.eval_line(f'lookup {key}')
+
+    # 2 is evicted when 3 is added, as 1 was more recently used.
+    assert app.bag.calls == 4
+    assert app.command_engine.result_cache_for('lookup').info().evictions == 2
+
+    app.bag.calls = 0
+    await app.eval_line('fleeting')
+    await app.eval_line('fleeting')
+    time.sleep(0.02)
+    await app.eval_line('fleeting')
+    assert app.bag.calls == 2
+    assert app.command_engine.result_cache_for('fleeting').info().expirations == 1
+
+
+@pytest.mark.asyncio
+async def test_failures_are_not_cached():
+    app = get_test_app()
+    app.bag.calls = 0
+
+    @app.cmd.register()
+    @app.cmd(cache=True)
+    async def flaky():
+        app.bag.calls += 1
+        if app.bag.calls == 1:
+            raise RuntimeError('oops')
+
+        return 2 if app.bag.calls == 2 else 0
+
+    assert await app.eval_line('flaky') == ExitCodes.ERR_RUNTIME_EXC
+    assert await app.eval_line('flaky') == 2
+    assert await app.eval_line('flaky') == ExitCodes.OK
+    assert await app.eval_line('flaky') == ExitCodes.OK
+    assert app.bag.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_cache_is_per_page_path():
+    app = get_test_app()
+    app.bag.calls = 0
+
+    app.page_navigator.add_directory_page('/dir')
+
+    @app.cmd.register()
+    @app.cmd(cache=True)
+    async def here():
+        app.bag.calls += 1
+
+    await app.eval_line('here')
+    await app.eval_line('cd /dir')
+    await app.eval_line('here')
+    await app.eval_line('here')
+    assert app.bag.calls == 2
+
+
+def test_invalid_cache_policies():
+    app = get_test_app()
+
+    for policy in (CachePolicy(ttl=0), CachePolicy(max_entries=0)):
+        with pytest.raises(CommandRegistrationError):
+            @app.cmd.register()
+            @app.cmd(cache=policy)
+            async def cmd():
+                pass
+
+    @app.cmd.register()
+    async def other():
+        pass
+
+    assert other.cache is None
+    with pytest.raises(FrozenAccessError):
+        other.cache = CachePolicy()
@@ -0,0 +1,322 @@
+"""Tests for parsing, validating, and running scripts of command lines."""
+
+import asyncio
+import io
+import os
+import sys
+import threading
+
+import pytest
+
+from almanac import (
+    ExitCodes,
+    is_interactive_stream,
+    MissingArgumentsError,
+    NoSuchArgumentError,
+    NoSuchCommandError,
+    parse_lines,
+    ParseState,
+    PartialParseError,
+    TooManyPositionalArgumentsError,
+    TotalParseError
+)
+
+from .utils import get_test_app
+
+
+def test_parse_lines():
+    script = io.StringIO(
+        'cmd 1\n'
+        '\n'
+        '# a comment\n'
+        '   # an indented comment\n'
+        'cmd a=\r\n'
+        'other x=[1, 2]'
+    )
+
+    parsed_lines = list(parse_lines(script))
+    assert [x.line_number for x in parsed_lines] == [1, 5, 6]
+    assert [x.text for x in parsed_lines] == ['cmd 1', 'cmd a=', 'other x=[1, 2]']
+    assert [x.status.state for x in parsed_lines] == [
+        ParseState.FULL, ParseState.PARTIAL, ParseState.FULL
+    ]
+
+    continued_lines = parse_lines(['cmd 1', '', 'cmd 2'], start=7)
+    assert [x.line_number for x in continued_lines] == [7, 9]
+    assert parsed_lines[2].status.results.kwargs == {'x': [1, 2]}
+
+
+@pytest.mark.asyncio
+async def test_validate_script():
+    app = get_test_app()
+    app.bag.calls = 0
+
+    @app.cmd.register()
+    async def add(a: int, b: int, *, verbose: bool = False):
+        app.bag.calls += 1
+
+    script = [
+        'add 1 2',
+        'add 1 2 verbose=true',
+        'add 1',
+        'add 1 2 3',
+        'add 1 2 loud=true',
+        'sub 1 2',
+        'add 1 "oops',
+        '',
+        '!!!',
+        '# add',
+    ]
+
+    line_errors = app.validate_script(script)
+    assert [(x.line_number, x.line, type(x.error)) for x in line_errors] == [
+        (3, 'add 1', MissingArgumentsError),
+        (4, 'add 1 2 3', TooManyPositionalArgumentsError),
+        (5, 'add 1 2 loud=true', NoSuchArgumentError),
+        (6, 'sub 1 2', NoSuchCommandError),
+        (7, 'add 1 "oops', PartialParseError),
+        (9, '!!!', TotalParseError),
+    ]
+    assert str(line_errors[3]) == 'line 6: No such command with name sub.'
+
+    # Nothing is executed during validation.
+    assert app.bag.calls == 0
+    assert app.validate_script(script[:2]) == ()
+
+
+@pytest.mark.asyncio
+async def test_run_script(tmp_path):
+    app = get_test_app()
+    app.bag.totals = []
+
+    @app.cmd.register()
+    async def add(a: int, b: int):
+        app.bag.totals.append(a + b)
+
+    @app.cmd.register()
+    async def fail(code: int):
+        return code
+
+    script_path = tmp_path / 'script.txt'
+    script_path.write_text(
+        '# setup\n'
+        'add 1 2\n'
+        '\n'
+        'add 3 b=4\n'
+        'add 5\n'
+        'fail 7\n'
+        'nope\n'
+        'add 5 6\n',
+        encoding='utf-8'
+    )
+
+    result = await app.run_script(script_path)
+    assert app.bag.totals == [3, 7]
+    assert result.stopped_early
+    assert [(x.line_number, x.exit_code) for x in result.line_results] == [
+        (2, ExitCodes.OK),
+        (4, ExitCodes.OK),
+        (5, ExitCodes.ERR_COMMAND_INVALID_ARGUMENTS),
+    ]
+    assert result.exit_code == ExitCodes.ERR_COMMAND_INVALID_ARGUMENTS
+    assert not result
+    assert str(result) == '3 lines executed, 1 failed (stopped early)'
+
+    app.bag.totals = []
+    with open(script_path, encoding='utf-8') as f:
+        result = await app.run_script(f, stop_on_error=False, max_parse_ahead=1)
+    assert app.bag.totals == [3, 7, 11]
+    assert not result.stopped_early
+    assert [(x.line, x.exit_code) for x in result.failures] == [
+        ('add 5', ExitCodes.ERR_COMMAND_INVALID_ARGUMENTS),
+        ('fail 7', 7),
+        ('nope', ExitCodes.ERR_COMMAND_NONEXISTENT),
+    ]
+    assert result.exit_code_counts == {
+        ExitCodes.OK: 3,
+        ExitCodes.ERR_COMMAND_INVALID_ARGUMENTS: 1,
+        7: 1,
+        ExitCodes.ERR_COMMAND_NONEXISTENT: 1,
+    }
+
+    result = await app.run_script(['add 1 2', 'add "oops'], stop_on_error=False)
+    assert result.exit_code == ExitCodes.ERR_COMMAND_PARSING
+    assert result.exit_code_counts == {
+        ExitCodes.OK: 1, ExitCodes.ERR_COMMAND_PARSING: 1
+    }
+
+
+@pytest.mark.asyncio
+async def test_run_script_parses_a_bounded_number_of_lines_ahead():
+    app = get_test_app()
+    app.bag.num_lines_read = 0
+    app.bag.lines_read_ahead = []
+
+    @app.cmd.register()
+    async def step(i: int):
+        app.bag.lines_read_ahead.append(app.bag.num_lines_read - i)
+        await asyncio.sleep(0)
+
+    def lines():
+        for i in range(1, 51):
+            app.bag.num_lines_read += 1
+            yield f'step {i}'
+
+    result = await app.run_script(lines(), max_parse_ahead=4)
+    assert len(result.line_results) == 50
+    assert result
+    assert 0 < max(app.bag.lines_read_ahead) <= 5
+
+    with pytest.raises(ValueError):
+        await app.run_script([], max_parse_ahead=0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('read_in_thread', [False, True])
+async def test_run_script_stops_on_quit(read_in_thread):
+    app = get_test_app()
+    app.bag.calls = 0
+
+    @app.cmd.register()
+    async def work():
+        app.bag.calls += 1
+
+    result = await app.run_script(
+        ['work', 'quit', 'work'], read_in_thread=read_in_thread
+    )
+    assert app.bag.calls == 1
+    assert result.stopped_early
+    assert result
+
+
+@pytest.mark.asyncio
+async def test_run_script_is_not_stopped_early_by_its_last_line():
+    app = get_test_app()
+
+    @app.cmd.register()
+    async def fail():
+        return 1
+
+    result = await app.run_script(['fail', '', '# done'])
+    assert result.exit_code == 1
+    assert not result.stopped_early
+    assert str(result) == '1 lines executed, 1 failed'
+
+    result = await app.run_script(['quit'])
+    assert not result.stopped_early
+
+
+@pytest.mark.asyncio
+async def test_run_script_does_not_wait_for_lines_after_quitting():
+    app = get_test_app()
+    read_fd, write_fd = os.pipe()
+
+    # The pipe is left open, so a read after the first line would block. (The writer
+    # is closed first on exit, which ends that read.)
+    with open(read_fd) as pipe, open(write_fd, 'w') as writer:
+        writer.write('quit\n')
+        writer.flush()
+
+        result = await asyncio.wait_for(
+            app.run_script(pipe, read_in_thread=True), timeout=5
+        )
+        assert result.stopped_early
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('read_in_thread', [False, True])
+async def test_run_script_reraises_read_errors(read_in_thread):
+    app = get_test_app()
+    app.bag.calls = 0
+
+    @app.cmd.register()
+    async def work():
+        app.bag.calls += 1
+
+    def lines():
+        yield 'work'
+        yield 'work'
+        raise OSError('read failed')
+
+    with pytest.raises(OSError):
+        await app.run_script(lines(), read_in_thread=read_in_thread)
+    assert app.bag.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_prompt_evaluates_piped_input(monkeypatch):
+    app = get_test_app()
+    app.bag.events = []
+
+    @app.on_init()
+    async def init():
+        app.bag.events.append('init')
+
+    @app.on_exit()
+    async def exit():
+        app.bag.events.append('exit')
+
+    @app.cmd.register()
+    async def add(a: int, b: int):
+        app.bag.events.append(a + b)
+
+    monkeypatch.setattr(
+        'sys.stdin', io.StringIO('add 1 2\n# comment\nadd 1\nadd 3 4\nquit\nadd 5 6\n')
+    )
+    assert not is_interactive_stream(sys.stdin)
+
+    exit_code = await app.prompt()
+    assert exit_code == ExitCodes.ERR_COMMAND_INVALID_ARGUMENTS
+    assert app.bag.events == ['init', 3, 7, 'exit']
+
+    # No prompt session was needed, so its completer and lexer were never created.
+    assert '_session_opts' not in vars(app)
+
+
+@pytest.mark.asyncio
+async def test_prompt_executes_slowly_piped_lines_as_they_arrive(monkeypatch):
+    app = get_test_app()
+    line_executed = threading.Event()
+    waited_for_line = []
+
+    @app.cmd.register()
+    async def mark():
+        line_executed.set()
+
+    read_fd, write_fd = os.pipe()
+
+    def write_slowly():
+        with open(write_fd, 'w') as pipe:
+            pipe.write('mark\n')
+            pipe.flush()
+
+            # Blocking reads on the event loop would keep the first line from being
+            # executed until the pipe has more to read.
+            waited_for_line.append(line_executed.wait(timeout=5))
+            pipe.write('mark\n')
+
+    writer = threading.Thread(target=write_slowly)
+    with open(read_fd) as pipe:
+        monkeypatch.setattr('sys.stdin', pipe)
+        writer.start()
+        try:
+            exit_code = await app.prompt(interactive=False)
+        finally:
+            writer.join()
+
+    assert exit_code == ExitCodes.OK
+    assert waited_for_line == [True]
+
+
+def test_is_interactive_stream():
+    class FakeTerminal(io.StringIO):
+        def isatty(self):
+            return True
+
+    assert is_interactive_stream(FakeTerminal())
+    assert not is_interactive_stream(io.StringIO())
+    assert not is_interactive_stream(None)
+
+    closed_stream = io.StringIO()
+    closed_stream.close()
+    assert not is_interactive_stream(closed_stream)
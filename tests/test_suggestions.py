@@ -0,0 +1,81 @@
+"""Tests for "did you mean" suggestions of misspelled names."""
+
+import pytest
+
+from almanac import FuzzyMatcher, NoSuchCommandError, SuggestionIndex
+
+from .utils import get_test_app
+
+
+def test_suggestion_index_ranks_best_matches_first():
+    strings = ['deploy', 'delete', 'describe', 'destroy', 'quit']
+    index = SuggestionIndex(strings)
+
+    assert index.matches('delpoy') == ('deploy', 'destroy')
+    assert index.matches('destory') == ('destroy', 'deploy')
+    assert index.matches('destory', num_max_matches=1) == ('destroy',)
+    assert index.matches('xyz') == ()
+    assert index.matches('destory', num_max_matches=0) == ()
+
+    results = index.results('destory')
+    assert [r.string for r in results] == ['destroy', 'deploy']
+    assert results[0].ratio > results[1].ratio
+
+
+def test_suggestion_index_matches_fuzzy_matcher():
+    strings = ['list', 'lint', 'lost', 'last', 'listen', 'silt', 'slit', 'lsit']
+    index = SuggestionIndex()
+    for string in strings + ['list']:
+        index.add(string)
+
+    assert len(index) == len(strings)
+    assert list(index) == strings
+
+    for reference in ('lsit', 'list', 'lits', 'listing', 'l', 'tsil'):
+        for num_max_matches in (1, 3, 10):
+            assert index.matches(reference, num_max_matches=num_max_matches) == (
+                FuzzyMatcher(reference, strings, num_max_matches=num_max_matches).matches
+            )
+
+
+@pytest.mark.asyncio
+async def test_command_and_argument_suggestions():
+    app = get_test_app()
+
+    @app.cmd.register()
+    @app.cmd(aliases=['rm'])
+    @app.arg.recursive(name='recurse')
+    async def remove(path: str, *, recursive: bool = False, force: bool = False):
+        pass
+
+    @app.cmd.register()
+    async def rename(old: str, new: str):
+        pass
+
+    engine = app.command_engine
+    assert engine.get_suggestions('remvoe') == ('remove', 'rename')
+    assert engine.get_suggestions('remvoe', max_suggestions=1) == ('remove',)
+    assert engine.get_suggestions('something_else') == ()
+
+    assert engine.get_argument_suggestions('rm', 'recurse_') == ('recurse',)
+    assert engine.get_argument_suggestions('remove', 'froce') == ('force',)
+    assert engine.get_argument_suggestions('rename', 'froce') == ()
+
+    with pytest.raises(NoSuchCommandError):
+        engine.get_argument_suggestions('remvoe', 'force')
+
+
+@pytest.mark.asyncio
+async def test_argument_suggestions_exclude_hidden_arguments():
+    app = get_test_app()
+
+    @app.cmd.register()
+    @app.arg.secret(hidden=True)
+    async def deploy(*targets: str, secret: str = '', seed: int = 0, **options: str):
+        pass
+
+    engine = app.command_engine
+    assert engine.get_argument_suggestions('deploy', 'secrett') == ()
+    assert engine.get_argument_suggestions('deploy', 'sede') == ('seed',)
+    assert engine.get_argument_suggestions('deploy', 'target') == ()
+    assert engine.get_argument_suggestions('deploy', 'option') == ()
@@ -1,13 +1,21 @@
 """almanac testing utilities."""
 
-from almanac import Application, make_standard_app, NullIoContext
+from typing import Optional
+
+from almanac import Application, make_standard_app, NullIoContext, ParserEngine
 
 
 def get_test_app(
-    propagate_runtime_exceptions: bool = False
+    propagate_runtime_exceptions: bool = False,
+    parser_engine: ParserEngine = ParserEngine.FAST,
+    completion_debounce: float = 0.05,
+    max_completions: Optional[int] = 1000
 ) -> Application:
     app = make_standard_app(
         io_context_cls=NullIoContext,
-        propagate_runtime_exceptions=propagate_runtime_exceptions
+        parser_engine=parser_engine,
+        propagate_runtime_exceptions=propagate_runtime_exceptions,
+        completion_debounce=completion_debounce,
+        max_completions=max_completions
     )
     return app